@@ -6,6 +6,7 @@ Routes tasks to appropriate agents and coordinates execution
 from typing import Dict, List, Optional, Any
 from dataclasses import dataclass
 from enum import Enum
+import asyncio
 import json
 from datetime import datetime
 
@@ -43,14 +44,22 @@ class CoreOrchestrator:
     The brain of ROADY - routes tasks to appropriate agents
     """
     
-    def __init__(self, database_session, llm_router):
+    def __init__(self, database_session, llm_router, agent_registry=None, admission_controller=None):
         self.db = database_session
         self.llm_router = llm_router
-        self.agent_capabilities = self._load_agent_capabilities()
+        self.agent_registry = agent_registry
+        self.admission_controller = admission_controller
+        self._default_capabilities = self._load_agent_capabilities()
+    
+    @property
+    def agent_capabilities(self) -> Dict[str, Dict]:
+        """Current L1 director capabilities (registry snapshot when available)"""
+        if self.agent_registry is not None and self.agent_registry.is_loaded:
+            return self.agent_registry.get_director_capabilities()
+        return self._default_capabilities
         
     def _load_agent_capabilities(self) -> Dict[str, Dict]:
-        """Load agent capabilities from database"""
-        # This would load from your agents table
+        """Default capabilities used until the agent registry is loaded"""
         return {
             # L1 Directors
             "chief_creative_officer": {
@@ -205,6 +214,30 @@ class CoreOrchestrator:
             "result": result
         }
     
+    async def submit_task(
+        self,
+        task: Task,
+        plan_tier=None,
+        company_id: Optional[str] = None,
+        predicted_cost: float = 0.0,
+        remaining_budget: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """
+        Async entry point for API handlers: delegate_task behind admission control.
+        Raises AdmissionRejected (429/503 with Retry-After) when shedding load.
+        """
+        if self.admission_controller is None:
+            return await asyncio.to_thread(self.delegate_task, task)
+        
+        async with self.admission_controller.admit(
+            task.submitted_by_user_id,
+            plan_tier,
+            company_id=company_id,
+            predicted_cost=predicted_cost,
+            remaining_budget=remaining_budget
+        ):
+            return await asyncio.to_thread(self.delegate_task, task)
+    
     def _log_task(self, task: Task):
         """Log task to database"""
         # Insert into tasks table
@@ -3,7 +3,7 @@ ROADY LLM Router - Complete Implementation
 Handles LLM selection, fallback, budget optimization, and quality upgrades
 """
 
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, List, Optional, Any, Tuple, Iterator, Union
 from dataclasses import dataclass
 from enum import Enum
 from datetime import datetime
@@ -49,13 +49,31 @@ class LLMResponse:
     was_fallback: bool = False
     fallback_level: Optional[int] = None
 
+# Pricing per 1M tokens (input, output)
+MODEL_PRICING = {
+    ('anthropic', 'claude-opus-4-20250514'): (15.00, 75.00),
+    ('anthropic', 'claude-sonnet-4-20250514'): (3.00, 15.00),
+    ('anthropic', 'claude-haiku-4.5-20251001'): (0.25, 1.25),
+    ('openai', 'o1'): (15.00, 60.00),
+    ('openai', 'o1-mini'): (3.00, 12.00),
+    ('openai', 'gpt-4o'): (2.50, 10.00),
+    ('openai', 'gpt-4o-mini'): (0.15, 0.60),
+    ('google', 'gemini-1.5-pro'): (1.25, 5.00),
+    ('google', 'gemini-1.5-flash'): (0.075, 0.30),
+    ('ollama', 'llama3.1:70b'): (0.00, 0.00),  # Local = free
+}
+
+# Unknown models are estimated at Claude Sonnet prices (never assume free)
+DEFAULT_PRICING = (3.00, 15.00)
+
 class LLMRouter:
     """
     Intelligent LLM Router with fallback, budget optimization, and quality upgrades
     """
     
-    def __init__(self, database_session):
+    def __init__(self, database_session, agent_registry=None):
         self.db = database_session
+        self.agent_registry = agent_registry
         self.clients = {}
         self._initialize_clients()
         
@@ -120,9 +138,15 @@ class LLMRouter:
         )
     
     def _get_agent_config(self, agent_id: str) -> Dict:
-        """Get agent configuration from database"""
-        # Mock for now
+        """Get agent configuration from the in-memory agent registry"""
+        if self.agent_registry is not None:
+            config = self.agent_registry.get_llm_config(agent_id)
+            if config is not None:
+                return config
+        
+        # Default until the registry is loaded or for unknown agents
         return {
+            'agent_id': agent_id,
             'primary_llm_provider': 'anthropic',
             'primary_llm_model': 'claude-sonnet-4-20250514',
             'fallback_llm_provider': 'openai',
@@ -168,14 +192,20 @@ class LLMRouter:
         
         return task_llm_map.get(task_type) or self.get_llm_for_agent(agent_config['agent_id'])
     
-    def get_fallback_chain(self, agent_id: str) -> FallbackChain:
-        """Get complete fallback chain for agent"""
+    def get_fallback_chain(self, agent_id: str, budget_mode: bool = False) -> FallbackChain:
+        """
+        Get complete fallback chain for agent.
+        With budget_mode the primary is swapped for its cheaper alternative.
+        """
         agent_config = self._get_agent_config(agent_id)
         
-        primary = LLMConfig(
-            provider=LLMProvider(agent_config['primary_llm_provider']),
-            model=agent_config['primary_llm_model']
-        )
+        if budget_mode:
+            primary = self._get_budget_optimized_llm(agent_config)
+        else:
+            primary = LLMConfig(
+                provider=LLMProvider(agent_config['primary_llm_provider']),
+                model=agent_config['primary_llm_model']
+            )
         
         fallback_1 = None
         if agent_config.get('fallback_llm_provider'):
@@ -215,12 +245,13 @@ class LLMRouter:
         agent_id: str, 
         prompt: str, 
         task_id: str,
-        task_type: Optional[str] = None
+        task_type: Optional[str] = None,
+        budget_mode: bool = False
     ) -> LLMResponse:
         """
         Execute LLM request with automatic fallback on failure
         """
-        fallback_chain = self.get_fallback_chain(agent_id)
+        fallback_chain = self.get_fallback_chain(agent_id, budget_mode)
         
         # Try primary
         try:
@@ -270,6 +301,113 @@ class LLMRouter:
             # All fallbacks exhausted
             raise Exception(f"All LLMs failed for agent {agent_id}")
     
+    def stream_with_fallback(
+        self, 
+        agent_id: str, 
+        prompt: str, 
+        task_id: str,
+        task_type: Optional[str] = None,
+        budget_mode: bool = False
+    ) -> Iterator[Union[str, LLMResponse]]:
+        """
+        Stream an LLM request with automatic fallback.
+        Yields text deltas, then a final LLMResponse with usage and cost.
+        Fallback only happens before the first delta: once text has reached
+        the caller we can't switch models mid-reply.
+        """
+        fallback_chain = self.get_fallback_chain(agent_id, budget_mode)
+        chain = [
+            (0, fallback_chain.primary),
+            (1, fallback_chain.fallback_1),
+            (2, fallback_chain.fallback_2),
+            (3, fallback_chain.fallback_3),
+        ]
+        
+        first_error = None
+        for level, config in chain:
+            if config is None:
+                continue
+            
+            emitted = False
+            try:
+                for item in self._stream_llm(config, prompt, agent_id, task_id):
+                    if isinstance(item, LLMResponse):
+                        if level:
+                            item.was_fallback = True
+                            item.fallback_level = level
+                            self._log_fallback(agent_id, task_id, level, str(first_error))
+                    else:
+                        emitted = True
+                    yield item
+                return
+            except Exception as e:
+                if emitted:
+                    raise
+                print(f"⚠️ {'Primary LLM' if level == 0 else f'Fallback {level}'} stream failed: {e}")
+                first_error = first_error or e
+        
+        # All fallbacks exhausted
+        raise Exception(f"All LLMs failed for agent {agent_id}")
+    
+    def _stream_llm(
+        self, 
+        config: LLMConfig, 
+        prompt: str, 
+        agent_id: str, 
+        task_id: str
+    ) -> Iterator[Union[str, LLMResponse]]:
+        """Stream single LLM request: text deltas, then the LLMResponse"""
+        start_time = datetime.utcnow()
+        chunks = []
+        
+        if config.provider == LLMProvider.ANTHROPIC:
+            stream = self._stream_anthropic(config, prompt)
+        elif config.provider == LLMProvider.OPENAI:
+            stream = self._stream_openai(config, prompt)
+        elif config.provider == LLMProvider.GOOGLE:
+            stream = self._stream_google(config, prompt)
+        elif config.provider == LLMProvider.OLLAMA:
+            stream = self._stream_ollama(config, prompt)
+        else:
+            raise Exception(f"Provider {config.provider} not implemented")
+        
+        # Provider generators yield deltas and return token usage
+        usage = None
+        while True:
+            try:
+                delta = next(stream)
+            except StopIteration as stop:
+                usage = stop.value
+                break
+            if delta:
+                chunks.append(delta)
+                yield delta
+        
+        latency_ms = int((datetime.utcnow() - start_time).total_seconds() * 1000)
+        response = {'content': ''.join(chunks), **usage}
+        
+        cost_usd = self._calculate_cost(
+            config.provider, 
+            config.model, 
+            response['input_tokens'], 
+            response['output_tokens']
+        )
+        
+        self._log_usage(
+            agent_id, task_id, config, response, cost_usd, latency_ms
+        )
+        
+        yield LLMResponse(
+            content=response['content'],
+            provider=config.provider,
+            model=config.model,
+            input_tokens=response['input_tokens'],
+            output_tokens=response['output_tokens'],
+            total_tokens=response['input_tokens'] + response['output_tokens'],
+            cost_usd=cost_usd,
+            latency_ms=latency_ms
+        )
+    
     def _execute_llm(
         self, 
         config: LLMConfig, 
@@ -378,6 +516,87 @@ class LLMRouter:
             'output_tokens': result.get('eval_count', 0)
         }
     
+    def _stream_anthropic(self, config: LLMConfig, prompt: str) -> Iterator[str]:
+        """Stream Anthropic API"""
+        client = self.clients[LLMProvider.ANTHROPIC]
+        
+        with client.messages.stream(
+            model=config.model,
+            max_tokens=config.max_tokens,
+            temperature=config.temperature,
+            messages=[{"role": "user", "content": prompt}]
+        ) as stream:
+            for text in stream.text_stream:
+                yield text
+            message = stream.get_final_message()
+        
+        return {
+            'input_tokens': message.usage.input_tokens,
+            'output_tokens': message.usage.output_tokens
+        }
+    
+    def _stream_openai(self, config: LLMConfig, prompt: str) -> Iterator[str]:
+        """Stream OpenAI API"""
+        client = self.clients[LLMProvider.OPENAI]
+        
+        stream = client.chat.completions.create(
+            model=config.model,
+            messages=[{"role": "user", "content": prompt}],
+            max_tokens=config.max_tokens,
+            temperature=config.temperature,
+            stream=True,
+            stream_options={"include_usage": True}
+        )
+        
+        usage = None
+        for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+            if chunk.usage:
+                usage = chunk.usage
+        
+        return {
+            'input_tokens': usage.prompt_tokens if usage else 0,
+            'output_tokens': usage.completion_tokens if usage else 0
+        }
+    
+    def _stream_google(self, config: LLMConfig, prompt: str) -> Iterator[str]:
+        """Stream Google Gemini API"""
+        model = genai.GenerativeModel(config.model)
+        
+        usage = None
+        for chunk in model.generate_content(prompt, stream=True):
+            yield chunk.text
+            usage = chunk.usage_metadata or usage
+        
+        return {
+            'input_tokens': usage.prompt_token_count if usage else 0,
+            'output_tokens': usage.candidates_token_count if usage else 0
+        }
+    
+    def _stream_ollama(self, config: LLMConfig, prompt: str) -> Iterator[str]:
+        """Stream local Ollama"""
+        import requests
+        import json
+        
+        response = requests.post('http://localhost:11434/api/generate', json={
+            'model': config.model,
+            'prompt': prompt,
+            'stream': True
+        }, stream=True)
+        
+        result = {}
+        for line in response.iter_lines():
+            if not line:
+                continue
+            result = json.loads(line)
+            yield result.get('response', '')
+        
+        return {
+            'input_tokens': result.get('prompt_eval_count', 0),
+            'output_tokens': result.get('eval_count', 0)
+        }
+    
     def _calculate_cost(
         self, 
         provider: LLMProvider, 
@@ -386,31 +605,39 @@ class LLMRouter:
         output_tokens: int
     ) -> float:
         """Calculate cost in USD"""
-        # Pricing per 1M tokens
-        pricing = {
-            ('anthropic', 'claude-opus-4-20250514'): (15.00, 75.00),
-            ('anthropic', 'claude-sonnet-4-20250514'): (3.00, 15.00),
-            ('anthropic', 'claude-haiku-4.5-20251001'): (0.25, 1.25),
-            ('openai', 'o1'): (15.00, 60.00),
-            ('openai', 'o1-mini'): (3.00, 12.00),
-            ('openai', 'gpt-4o'): (2.50, 10.00),
-            ('openai', 'gpt-4o-mini'): (0.15, 0.60),
-            ('google', 'gemini-1.5-pro'): (1.25, 5.00),
-            ('google', 'gemini-1.5-flash'): (0.075, 0.30),
-            ('ollama', 'llama3.1:70b'): (0.00, 0.00),  # Local = free
-        }
-        
         key = (provider.value, model)
-        if key not in pricing:
+        if key not in MODEL_PRICING:
             return 0.0
         
-        input_price, output_price = pricing[key]
+        input_price, output_price = MODEL_PRICING[key]
         
         input_cost = (input_tokens / 1_000_000) * input_price
         output_cost = (output_tokens / 1_000_000) * output_price
         
         return round(input_cost + output_cost, 4)
     
+    def estimate_cost(
+        self,
+        agent_id: str,
+        input_tokens: int,
+        output_tokens: int,
+        budget_mode: bool = False
+    ) -> float:
+        """Pre-flight cost of a call on the agent's primary (or budget) model, no I/O"""
+        agent_config = self._get_agent_config(agent_id)
+        
+        if budget_mode:
+            config = self._get_budget_optimized_llm(agent_config)
+        else:
+            config = LLMConfig(
+                provider=LLMProvider(agent_config['primary_llm_provider']),
+                model=agent_config['primary_llm_model']
+            )
+        
+        key = (config.provider.value, config.model)
+        input_price, output_price = MODEL_PRICING.get(key, DEFAULT_PRICING)
+        return (input_tokens * input_price + output_tokens * output_price) / 1_000_000
+    
     def _log_usage(
         self, 
         agent_id: str, 
@@ -0,0 +1,336 @@
+"""
+ROADY Admission Control - Fair-Share Scheduling for Agent Work
+Per-tenant quotas from PLAN_FEATURES, weighted fair queuing, budget pre-checks and load shedding
+"""
+
+from typing import Dict, List, Optional, Any
+from dataclasses import dataclass, field
+from contextlib import asynccontextmanager
+from datetime import datetime
+import asyncio
+import heapq
+import itertools
+import math
+import time
+
+from fastapi import HTTPException
+
+from roady_billing import PlanTier, PLAN_FEATURES
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# CONFIGURATION
+# ═══════════════════════════════════════════════════════════════════════════
+
+class AdmissionConfig:
+    # Total LLM calls allowed in flight per worker, across all tenants
+    GLOBAL_CAPACITY = 32
+    # Total waiting requests per worker before shedding with 503
+    GLOBAL_QUEUE_LIMIT = 500
+    # Max time a request may wait for a slot before shedding with 503
+    MAX_QUEUE_WAIT_SECONDS = 20.0
+    # Initial guess for average LLM call duration (refined with an EWMA)
+    INITIAL_SERVICE_TIME_SECONDS = 5.0
+    SERVICE_TIME_EWMA_ALPHA = 0.2
+
+
+@dataclass(frozen=True)
+class TenantQuota:
+    max_concurrent: int
+    max_queued: int
+    weight: float
+
+    @classmethod
+    def for_tier(cls, tier: Optional[PlanTier]) -> "TenantQuota":
+        features = PLAN_FEATURES.get(tier) or PLAN_FEATURES[PlanTier.STARTER]
+        return cls(
+            max_concurrent=features.agent_concurrency,
+            max_queued=features.agent_queue_depth,
+            weight=features.agent_fair_share_weight
+        )
+
+
+class AdmissionRejected(HTTPException):
+    """Raised when a request is shed; carries a Retry-After hint"""
+
+    def __init__(self, status_code: int, reason: str, retry_after: float, message: str):
+        retry_after = max(1, int(math.ceil(retry_after)))
+        super().__init__(
+            status_code=status_code,
+            detail={
+                "error": reason,
+                "message": message,
+                "retry_after": retry_after
+            },
+            headers={"Retry-After": str(retry_after)}
+        )
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# ADMISSION CONTROLLER
+# ═══════════════════════════════════════════════════════════════════════════
+
+@dataclass(order=True)
+class _Waiter:
+    start_tag: float
+    seq: int
+    tenant: str = field(compare=False)
+    future: asyncio.Future = field(compare=False)
+
+
+@dataclass
+class _TenantState:
+    quota: TenantQuota
+    running: int = 0
+    queued: int = 0
+    reserved_cost: float = 0.0
+    last_finish_tag: float = 0.0
+
+
+class AdmissionController:
+    """
+    Admission controller in front of the orchestrator and meeting endpoints.
+
+    Tenants (company, or user when there is no company) get a concurrency
+    quota and a queue depth from their plan tier. Waiting requests are
+    dispatched by start-time fair queuing weighted by plan, so a tenant
+    flooding the queue only delays its own requests. Before anything is
+    queued, the predicted cost is checked against the tenant's remaining
+    budget minus what is already reserved by its in-flight requests.
+    """
+
+    def __init__(
+        self,
+        capacity: int = AdmissionConfig.GLOBAL_CAPACITY,
+        global_queue_limit: int = AdmissionConfig.GLOBAL_QUEUE_LIMIT,
+        max_queue_wait: float = AdmissionConfig.MAX_QUEUE_WAIT_SECONDS
+    ):
+        self.capacity = capacity
+        self.global_queue_limit = global_queue_limit
+        self.max_queue_wait = max_queue_wait
+
+        self._in_flight = 0
+        self._queued = 0
+        self._virtual_time = 0.0
+        self._heap: List[_Waiter] = []
+        self._seq = itertools.count()
+        self._tenants: Dict[str, _TenantState] = {}
+        self._service_time = AdmissionConfig.INITIAL_SERVICE_TIME_SECONDS
+
+        self.stats = {"admitted": 0, "queued": 0, "shed_429": 0, "shed_503": 0, "budget_rejected": 0}
+
+    @staticmethod
+    def tenant_key(user_id: str, company_id: Optional[str] = None) -> str:
+        return f"company:{company_id}" if company_id else f"user:{user_id}"
+
+    @asynccontextmanager
+    async def admit(
+        self,
+        user_id: str,
+        tier: Optional[PlanTier] = PlanTier.STARTER,
+        company_id: Optional[str] = None,
+        predicted_cost: float = 0.0,
+        remaining_budget: Optional[float] = None,
+        cost_units: float = 1.0
+    ):
+        """
+        Hold an execution slot for the duration of the block.
+
+        Usage:
+            async with admission_controller.admit(user_id, tier, predicted_cost=0.02,
+                                                  remaining_budget=status['remaining']):
+                result = await run_agent(...)
+
+        Raises AdmissionRejected (429 or 503) when the request is shed.
+        """
+        tenant = self.tenant_key(user_id, company_id)
+        state = self._tenant_state(tenant, tier)
+
+        self._check_budget(state, predicted_cost, remaining_budget)
+        state.reserved_cost += predicted_cost
+
+        try:
+            await self._acquire(tenant, state, cost_units)
+        except BaseException:
+            state.reserved_cost -= predicted_cost
+            raise
+
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            alpha = AdmissionConfig.SERVICE_TIME_EWMA_ALPHA
+            self._service_time = (1 - alpha) * self._service_time + alpha * elapsed
+
+            state.reserved_cost -= predicted_cost
+            state.running -= 1
+            self._in_flight -= 1
+            self._dispatch()
+
+    def _tenant_state(self, tenant: str, tier: Optional[PlanTier]) -> _TenantState:
+        quota = TenantQuota.for_tier(tier)
+        state = self._tenants.get(tenant)
+        if state is None:
+            state = _TenantState(quota=quota, last_finish_tag=self._virtual_time)
+            self._tenants[tenant] = state
+        else:
+            # Plan changes apply on the next request
+            state.quota = quota
+        return state
+
+    def _check_budget(self, state: _TenantState, predicted_cost: float, remaining_budget: Optional[float]):
+        if remaining_budget is None:
+            return
+        available = remaining_budget - state.reserved_cost
+        if predicted_cost > available:
+            self.stats["budget_rejected"] += 1
+            raise AdmissionRejected(
+                status_code=429,
+                reason="budget_exhausted",
+                retry_after=self._seconds_until_month_reset(),
+                message=f"Predicted cost ${predicted_cost:.4f} exceeds remaining budget ${max(available, 0):.4f}"
+            )
+
+    async def _acquire(self, tenant: str, state: _TenantState, cost_units: float):
+        # Fast path: free capacity, tenant under quota, nobody ahead of us
+        if (
+            not self._heap
+            and self._in_flight < self.capacity
+            and state.running < state.quota.max_concurrent
+        ):
+            self._start(state)
+            return
+
+        if state.queued >= state.quota.max_queued:
+            self.stats["shed_429"] += 1
+            raise AdmissionRejected(
+                status_code=429,
+                reason="tenant_queue_full",
+                retry_after=self._estimate_wait(state.queued + 1, state.quota.max_concurrent),
+                message="Too many concurrent agent requests for this account"
+            )
+
+        if self._queued >= self.global_queue_limit:
+            self.stats["shed_503"] += 1
+            raise AdmissionRejected(
+                status_code=503,
+                reason="overloaded",
+                retry_after=self._estimate_wait(self._queued, self.capacity),
+                message="Agent capacity is saturated, please retry shortly"
+            )
+
+        # Start-time fair queuing: a tenant's tags advance by cost/weight per
+        # request, so heavy tenants fall behind light ones in the heap
+        start_tag = max(self._virtual_time, state.last_finish_tag)
+        state.last_finish_tag = start_tag + cost_units / max(state.quota.weight, 0.01)
+
+        waiter = _Waiter(start_tag, next(self._seq), tenant, asyncio.get_running_loop().create_future())
+        heapq.heappush(self._heap, waiter)
+        state.queued += 1
+        self._queued += 1
+        self.stats["queued"] += 1
+        self._dispatch()
+
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter.future), timeout=self.max_queue_wait)
+        except asyncio.TimeoutError:
+            if not waiter.future.done():
+                waiter.future.cancel()
+                self._abandon(state, waiter)
+                self.stats["shed_503"] += 1
+                raise AdmissionRejected(
+                    status_code=503,
+                    reason="queue_timeout",
+                    retry_after=self._estimate_wait(state.queued + 1, state.quota.max_concurrent),
+                    message="Timed out waiting for agent capacity"
+                )
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled():
+                # Slot was granted as we were cancelled: hand it back
+                state.running -= 1
+                self._in_flight -= 1
+                self._dispatch()
+            else:
+                waiter.future.cancel()
+                self._abandon(state, waiter)
+            raise
+
+    def _start(self, state: _TenantState):
+        state.running += 1
+        self._in_flight += 1
+        self.stats["admitted"] += 1
+
+    def _abandon(self, state: _TenantState, waiter: _Waiter):
+        # Drop the waiter from the heap right away, so an emptied queue puts
+        # later requests back on the fast path in _acquire
+        state.queued -= 1
+        self._queued -= 1
+        try:
+            self._heap.remove(waiter)
+        except ValueError:
+            return
+        heapq.heapify(self._heap)
+
+    def _dispatch(self):
+        """Grant free slots to waiters in start-tag order, respecting quotas"""
+        deferred: List[_Waiter] = []
+
+        while self._heap and self._in_flight < self.capacity:
+            waiter = heapq.heappop(self._heap)
+            if waiter.future.done():
+                continue
+
+            state = self._tenants[waiter.tenant]
+            if state.running >= state.quota.max_concurrent:
+                deferred.append(waiter)
+                continue
+
+            state.queued -= 1
+            self._queued -= 1
+            self._virtual_time = max(self._virtual_time, waiter.start_tag)
+            self._start(state)
+            waiter.future.set_result(True)
+
+        for waiter in deferred:
+            heapq.heappush(self._heap, waiter)
+
+        # Forget idle tenants so the table doesn't grow without bound
+        if len(self._tenants) > 4 * self.capacity:
+            self._tenants = {
+                k: v for k, v in self._tenants.items()
+                if v.running or v.queued or v.reserved_cost
+            }
+
+    def _estimate_wait(self, queued_ahead: int, slots: int) -> float:
+        return self._service_time * queued_ahead / max(slots, 1)
+
+    @staticmethod
+    def _seconds_until_month_reset() -> float:
+        now = datetime.utcnow()
+        if now.month == 12:
+            reset = datetime(now.year + 1, 1, 1)
+        else:
+            reset = datetime(now.year, now.month + 1, 1)
+        return (reset - now).total_seconds()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "in_flight": self._in_flight,
+            "waiting": self._queued,
+            "capacity": self.capacity,
+            "tenants": len(self._tenants),
+            "avg_service_time_s": round(self._service_time, 3)
+        }
+
+
+def predict_cost(prompt_tokens: float, expected_output_tokens: float = 500, price_per_1m: float = 9.0) -> float:
+    """Rough pre-flight cost estimate (blended Claude Sonnet pricing by default)"""
+    return ((prompt_tokens + expected_output_tokens) / 1_000_000) * price_per_1m
+
+
+# Process-wide controller shared by the orchestrator and meeting endpoints
+admission_controller = AdmissionController()
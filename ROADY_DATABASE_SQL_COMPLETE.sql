@@ -6,7 +6,7 @@
 -- Created: 2024-11-28
 -- 
 -- This script creates the complete ROADY database with:
---   ✓ 9 core tables
+--   ✓ 11 core tables
 --   ✓ All indexes
 --   ✓ All foreign key constraints
 --   ✓ Sample data
@@ -116,6 +116,7 @@ CREATE TABLE agents (
     activated_at TIMESTAMP,
     activated_by_user_id VARCHAR(100),
     reports_to VARCHAR(100),
+    capability_keywords JSONB,
     
     -- LLM Configuration
     primary_llm_provider VARCHAR(50) NOT NULL,
@@ -150,6 +151,7 @@ CREATE TABLE agents (
 COMMENT ON TABLE agents IS 'Agent configurations (168 agents: 3 L0 + 18 L1 + 148 L2)';
 COMMENT ON COLUMN agents.level IS '0=system, 1=director, 2=specialist';
 COMMENT ON COLUMN agents.reports_to IS 'Self-referential: L2 reports to L1, L1 reports to L0';
+COMMENT ON COLUMN agents.capability_keywords IS 'Routing keywords loaded into the in-memory agent registry';
 
 -- ═══════════════════════════════════════════════════════════════════════════
 -- TABLE 5: AGENT_INTEGRATIONS
@@ -300,6 +302,74 @@ CREATE TABLE budget_alerts (
 COMMENT ON TABLE budget_alerts IS 'Budget threshold alerts (70%, 85%, 95%, 100%)';
 COMMENT ON COLUMN budget_alerts.target_id IS 'provider_id, agent_id, or department name depending on alert_type';
 
+-- ═══════════════════════════════════════════════════════════════════════════
+-- TABLE 10: MEETINGS
+-- ═══════════════════════════════════════════════════════════════════════════
+
+CREATE TABLE meetings (
+    meeting_id VARCHAR(100) PRIMARY KEY,
+    meeting_name VARCHAR(200) NOT NULL,
+    mode VARCHAR(20) NOT NULL DEFAULT 'round-robin' CHECK (mode IN ('round-robin', 'free', 'moderated', 'hierarchical')),
+    status VARCHAR(20) NOT NULL DEFAULT 'active' CHECK (status IN ('active', 'paused', 'ended')),
+    owner_user_id VARCHAR(100),
+    company_id VARCHAR(100),
+    project_id VARCHAR(100),
+    task_id VARCHAR(100),
+    participants JSONB NOT NULL DEFAULT '[]',
+    settings JSONB NOT NULL DEFAULT '{}',
+    tokens_limit INTEGER NOT NULL DEFAULT 20000,
+    tokens_used INTEGER NOT NULL DEFAULT 0,
+    cost_limit DECIMAL(10,2) NOT NULL DEFAULT 5.00,
+    cost_so_far DECIMAL(10,4) NOT NULL DEFAULT 0,
+    reserved_tokens INTEGER NOT NULL DEFAULT 0,
+    reserved_cost DECIMAL(10,4) NOT NULL DEFAULT 0,
+    current_speaker_index INTEGER NOT NULL DEFAULT -1,
+    last_seq BIGINT NOT NULL DEFAULT 0,
+    running_summary JSONB NOT NULL DEFAULT '[]',
+    summarized_through_seq BIGINT NOT NULL DEFAULT 0,
+    summary TEXT,
+    action_items JSONB,
+    archive_index JSONB,
+    started_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    ended_at TIMESTAMP,
+    archived_at TIMESTAMP,
+    updated_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    
+    FOREIGN KEY (owner_user_id) REFERENCES users(user_id) ON DELETE SET NULL,
+    FOREIGN KEY (task_id) REFERENCES tasks(task_id) ON DELETE SET NULL
+);
+
+COMMENT ON TABLE meetings IS 'Meeting header row: small and mutable, messages live in meeting_messages';
+COMMENT ON COLUMN meetings.last_seq IS 'Sequence of the last appended message, bumped in the same UPDATE as the counters';
+COMMENT ON COLUMN meetings.reserved_tokens IS 'Pre-flight estimates of in-flight agent calls, released when each call is reconciled';
+COMMENT ON COLUMN meetings.running_summary IS 'Rolling summary sections ({through_seq, level, text}), oldest first';
+COMMENT ON COLUMN meetings.archive_index IS 'Cold transcript location and chunk index ({path, chunks: [{first_seq, last_seq, offset, length}]}); NULL while messages are hot';
+COMMENT ON COLUMN meetings.settings IS 'Optimization flags (context_pruning_enabled, auto_summarization_enabled, ...)';
+
+-- ═══════════════════════════════════════════════════════════════════════════
+-- TABLE 11: MEETING_MESSAGES
+-- ═══════════════════════════════════════════════════════════════════════════
+
+CREATE TABLE meeting_messages (
+    meeting_id VARCHAR(100) NOT NULL,
+    seq BIGINT NOT NULL,
+    message_id VARCHAR(100) NOT NULL UNIQUE,
+    sender_id VARCHAR(100) NOT NULL,
+    sender_type VARCHAR(20) NOT NULL CHECK (sender_type IN ('user', 'agent', 'system')),
+    sender_name VARCHAR(200) NOT NULL,
+    content TEXT NOT NULL,
+    tokens INTEGER NOT NULL DEFAULT 0,
+    cost_usd DECIMAL(10,6) NOT NULL DEFAULT 0,
+    superseded BOOLEAN NOT NULL DEFAULT FALSE,
+    created_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    
+    PRIMARY KEY (meeting_id, seq),
+    FOREIGN KEY (meeting_id) REFERENCES meetings(meeting_id) ON DELETE CASCADE
+);
+
+COMMENT ON TABLE meeting_messages IS 'Append-only meeting transcript, ordered by per-meeting seq';
+COMMENT ON COLUMN meeting_messages.superseded IS 'Folded into a history summary by compression (kept for the transcript)';
+
 -- ═══════════════════════════════════════════════════════════════════════════
 -- INDEXES
 -- ═══════════════════════════════════════════════════════════════════════════
@@ -315,6 +385,7 @@ CREATE INDEX idx_agents_provider ON agents(primary_llm_provider);
 CREATE INDEX idx_agents_department ON agents(department);
 CREATE INDEX idx_agents_level ON agents(level);
 CREATE INDEX idx_agents_reports_to ON agents(reports_to);
+CREATE INDEX idx_agents_updated_at ON agents(updated_at);
 
 -- Agent Integrations indexes
 CREATE INDEX idx_integrations_agent ON agent_integrations(agent_id);
@@ -340,6 +411,12 @@ CREATE INDEX idx_usage_model ON agent_usage_logs(llm_model);
 CREATE INDEX idx_alerts_user ON budget_alerts(user_id);
 CREATE INDEX idx_alerts_acknowledged ON budget_alerts(acknowledged);
 
+-- Meetings indexes
+CREATE INDEX idx_meetings_status ON meetings(status);
+CREATE INDEX idx_meetings_owner ON meetings(owner_user_id);
+CREATE INDEX idx_meetings_started ON meetings(started_at);
+CREATE INDEX idx_meetings_archive_pending ON meetings(ended_at) WHERE status = 'ended' AND archived_at IS NULL;
+
 -- Workflows indexes
 CREATE INDEX idx_workflows_user ON workflows(created_by_user_id);
 CREATE INDEX idx_workflows_active ON workflows(is_active);
@@ -445,6 +522,15 @@ BEGIN
 END;
 $$ LANGUAGE plpgsql;
 
+-- Function: Notify agent registry listeners of agent changes
+CREATE OR REPLACE FUNCTION notify_agents_changed()
+RETURNS TRIGGER AS $$
+BEGIN
+    PERFORM pg_notify('agents_changed', COALESCE(NEW.agent_id, OLD.agent_id));
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
 -- Function: Calculate task cost from usage logs
 CREATE OR REPLACE FUNCTION calculate_task_cost(p_task_id VARCHAR)
 RETURNS DECIMAL AS $$
@@ -471,6 +557,9 @@ CREATE TRIGGER trigger_users_updated_at BEFORE UPDATE ON users
 CREATE TRIGGER trigger_agents_updated_at BEFORE UPDATE ON agents
     FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
 
+CREATE TRIGGER trigger_agents_notify AFTER INSERT OR UPDATE OR DELETE ON agents
+    FOR EACH ROW EXECUTE FUNCTION notify_agents_changed();
+
 CREATE TRIGGER trigger_llm_providers_updated_at BEFORE UPDATE ON llm_providers
     FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
 
@@ -480,6 +569,9 @@ CREATE TRIGGER trigger_agent_integrations_updated_at BEFORE UPDATE ON agent_inte
 CREATE TRIGGER trigger_workflows_updated_at BEFORE UPDATE ON workflows
     FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
 
+CREATE TRIGGER trigger_meetings_updated_at BEFORE UPDATE ON meetings
+    FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
+
 -- ═══════════════════════════════════════════════════════════════════════════
 -- SAMPLE DATA
 -- ═══════════════════════════════════════════════════════════════════════════
@@ -570,10 +662,10 @@ INSERT INTO agent_usage_logs (log_id, agent_id, task_id, user_id, llm_provider,
 DO $$
 BEGIN
     RAISE NOTICE '✅ ROADY Database created successfully!';
-    RAISE NOTICE '📊 Tables: 9';
+    RAISE NOTICE '📊 Tables: 11';
     RAISE NOTICE '🔍 Indexes: 25+';
     RAISE NOTICE '👁️ Views: 4';
-    RAISE NOTICE '⚡ Triggers: 5';
+    RAISE NOTICE '⚡ Triggers: 7';
     RAISE NOTICE '📝 Sample data: Loaded';
     RAISE NOTICE '';
     RAISE NOTICE 'Next steps:';
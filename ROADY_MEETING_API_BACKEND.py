@@ -6,13 +6,28 @@ FastAPI + WebSocket Implementation
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException, Depends
 from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy.orm import Session
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Callable, Awaitable, NamedTuple
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import AsyncExitStack, asynccontextmanager
 from datetime import datetime
 from pydantic import BaseModel
+from collections import deque
+from functools import lru_cache
 import asyncio
 import json
+import math
+import os
+import re
+import threading
 import uuid
 
+from roady_admission_control import admission_controller, predict_cost
+from roady_meeting_event_bus import MeetingEventBus, InProcessEventBus, create_event_bus
+from roady_ws_protocol import (
+    CompactEvent, FrameEncoder, MAX_BATCH_EVENTS,
+    batch_window_seconds, negotiate_protocol, send_frame
+)
+
 # ═══════════════════════════════════════════════════════════════════════════
 # MODELS & SCHEMAS
 # ═══════════════════════════════════════════════════════════════════════════
@@ -25,10 +40,13 @@ class CreateMeetingRequest(BaseModel):
     cost_limit: float = 5.00
     project_id: Optional[str] = None
     task_id: Optional[str] = None
+    owner_user_id: Optional[str] = None
+    company_id: Optional[str] = None
 
 class SendMessageRequest(BaseModel):
     content: str
     target_agent_id: Optional[str] = None
+    stream: bool = True  # False = wait for all agent responses before returning
 
 class AddParticipantRequest(BaseModel):
     agent_id: str
@@ -40,39 +58,289 @@ class OptimizeRequest(BaseModel):
 # WEBSOCKET CONNECTION MANAGER
 # ═══════════════════════════════════════════════════════════════════════════
 
+class ClientConnection:
+    """
+    One WebSocket with its own bounded outbound queue and writer task.
+    
+    Legacy clients queue JSON text frames; clients that negotiated a
+    compact protocol queue shared CompactEvents, encoded at write time.
+    """
+    
+    def __init__(
+        self,
+        websocket: WebSocket,
+        meeting_id: str,
+        max_queue: int,
+        protocol: Optional[str] = None,
+        batch_window: float = 0.0
+    ):
+        self.websocket = websocket
+        self.meeting_id = meeting_id
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        self.writer: Optional[asyncio.Task] = None
+        self.degrades = 0
+        self.closed = False
+        # While resuming, live events are parked here until replay is queued
+        self.pending: Optional[List[tuple]] = None
+        self.protocol = protocol
+        self.encoder = FrameEncoder(protocol) if protocol else None
+        self.batch_window = batch_window
+    
+    def prepare(self, frame: str):
+        """Queue item for a bus frame in this client's protocol"""
+        return CompactEvent.from_frame(frame) if self.protocol else frame
+    
+    def offer(self, item) -> bool:
+        """Enqueue a frame (or compact event) without waiting; False if the queue is full"""
+        try:
+            self.queue.put_nowait(item)
+            return True
+        except asyncio.QueueFull:
+            return False
+    
+    def reset_to(self, message: dict):
+        """Drop everything pending and replace it with a single event"""
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.queue.put_nowait(
+            CompactEvent.from_message(message) if self.protocol
+            else json.dumps(message, default=str)
+        )
+
+
 class ConnectionManager:
-    """Manage WebSocket connections for real-time meeting updates"""
+    """
+    Manage WebSocket connections for real-time meeting updates.
+    
+    Broadcasts go through the meeting event bus, which delivers them to
+    every uvicorn worker; each worker only fans out to its own sockets.
+    Events carry a per-meeting `seq` so a reconnecting client can resume
+    with `last_seq` instead of missing what happened while it was away.
     
-    def __init__(self):
-        # meeting_id -> list of websocket connections
-        self.active_connections: Dict[str, List[WebSocket]] = {}
+    Clients may negotiate a compact wire protocol (see roady_ws_protocol):
+    each bus event is converted once per worker and queued events are
+    coalesced into one frame per write, optionally waiting `batch_ms`.
     
-    async def connect(self, websocket: WebSocket, meeting_id: str):
-        await websocket.accept()
-        if meeting_id not in self.active_connections:
-            self.active_connections[meeting_id] = []
-        self.active_connections[meeting_id].append(websocket)
+    Each client gets a bounded queue drained by its own writer task, so
+    broadcast never waits on a socket. A client whose queue fills up is
+    degraded to a meeting snapshot; if it keeps falling behind it is
+    disconnected. Sockets that fail on send are removed automatically.
+    """
+    
+    # Frames buffered per client before it counts as a slow consumer
+    MAX_QUEUE_SIZE = 256
+    # Snapshot resyncs allowed before a slow consumer is dropped
+    MAX_DEGRADES = 2
+    # Close code for dropped slow consumers (client should reconnect)
+    SLOW_CONSUMER_CLOSE_CODE = 1013
+    
+    def __init__(
+        self,
+        bus: Optional[MeetingEventBus] = None,
+        snapshot_provider: Optional[Callable[[str], Optional[dict]]] = None
+    ):
+        # meeting_id -> {websocket: ClientConnection}
+        self.active_connections: Dict[str, Dict[WebSocket, ClientConnection]] = {}
+        self.snapshot_provider = snapshot_provider
+        self.stats = {"frames_sent": 0, "frames_dropped": 0, "degraded": 0, "evicted": 0}
+        self.bus = bus or InProcessEventBus()
+        self.bus.bind(self.deliver)
+    
+    def use_bus(self, bus: MeetingEventBus):
+        """Swap the event bus (at startup, before any connection)"""
+        self.bus = bus
+        self.bus.bind(self.deliver)
+    
+    async def connect(
+        self,
+        websocket: WebSocket,
+        meeting_id: str,
+        last_seq: Optional[int] = None,
+        batch_ms: Optional[int] = None
+    ):
+        protocol = negotiate_protocol(websocket)
+        await websocket.accept(subprotocol=protocol)
+        client = ClientConnection(
+            websocket, meeting_id, self.MAX_QUEUE_SIZE,
+            protocol=protocol,
+            batch_window=batch_window_seconds(batch_ms) if protocol else 0.0
+        )
+        if last_seq is not None:
+            client.pending = []
+        
+        first_local = meeting_id not in self.active_connections
+        self.active_connections.setdefault(meeting_id, {})[websocket] = client
+        client.writer = asyncio.create_task(self._write_loop(client))
+        
+        if first_local:
+            await self.bus.subscribe(meeting_id)
+        
+        if last_seq is not None:
+            await self._resume(client, last_seq)
+    
+    async def _resume(self, client: ClientConnection, last_seq: int):
+        """Queue missed events (or a snapshot if they're gone), then release live ones"""
+        missed = await self.bus.replay(client.meeting_id, last_seq)
+        
+        if missed is None:
+            snapshot = self.snapshot_provider(client.meeting_id) if self.snapshot_provider else None
+            client.reset_to({"type": "meeting_snapshot", "meeting": snapshot})
+            resumed_at = last_seq
+        else:
+            for seq, frame in missed:
+                if not client.offer(client.prepare(frame)):
+                    self._handle_slow_consumer(client)
+                    break
+            resumed_at = missed[-1][0] if missed else last_seq
+        
+        pending, client.pending = client.pending or [], None
+        for seq, frame in pending:
+            if seq > resumed_at and not client.offer(client.prepare(frame)):
+                self._handle_slow_consumer(client)
+                break
     
     def disconnect(self, websocket: WebSocket, meeting_id: str):
-        if meeting_id in self.active_connections:
-            self.active_connections[meeting_id].remove(websocket)
+        clients = self.active_connections.get(meeting_id)
+        if not clients:
+            return
+        client = clients.pop(websocket, None)
+        if not clients:
+            del self.active_connections[meeting_id]
+            asyncio.create_task(self.bus.unsubscribe(meeting_id))
+        if client and not client.closed:
+            client.closed = True
+            if client.writer and client.writer is not asyncio.current_task():
+                client.writer.cancel()
     
     async def broadcast(self, meeting_id: str, message: dict):
-        """Broadcast message to all connections in a meeting"""
-        if meeting_id in self.active_connections:
-            for connection in self.active_connections[meeting_id]:
-                try:
-                    await connection.send_json(message)
-                except:
-                    pass
-
-manager = ConnectionManager()
+        """Broadcast message to all connections in a meeting, on every worker"""
+        await self.bus.publish(meeting_id, message)
+    
+    def deliver(self, meeting_id: str, seq: int, frame: str):
+        """Fan a serialized bus event out to this worker's sockets (never blocks on a socket)"""
+        clients = self.active_connections.get(meeting_id)
+        if not clients:
+            return
+        
+        # Same frame (or compact event, converted once) is enqueued for every client
+        compact = None
+        for client in list(clients.values()):
+            if client.pending is not None:
+                client.pending.append((seq, frame))
+                continue
+            item = frame
+            if client.protocol:
+                if compact is None:
+                    compact = CompactEvent.from_frame(frame)
+                item = compact
+            if not client.offer(item):
+                self._handle_slow_consumer(client)
+    
+    def send_to(self, websocket: WebSocket, meeting_id: str, message: dict, legacy_frame: Optional[str] = None):
+        """Queue an event for a single client (`legacy_frame` overrides its legacy JSON form)"""
+        client = self.active_connections.get(meeting_id, {}).get(websocket)
+        if not client:
+            return
+        if client.protocol:
+            item = CompactEvent.from_message(message)
+        else:
+            item = legacy_frame if legacy_frame is not None else json.dumps(message, default=str)
+        if not client.offer(item):
+            self._handle_slow_consumer(client)
+    
+    def _handle_slow_consumer(self, client: ClientConnection):
+        self.stats["frames_dropped"] += 1
+        client.degrades += 1
+        
+        snapshot = self.snapshot_provider(client.meeting_id) if self.snapshot_provider else None
+        if client.degrades > self.MAX_DEGRADES or snapshot is None:
+            self.stats["evicted"] += 1
+            self.disconnect(client.websocket, client.meeting_id)
+            asyncio.create_task(self._close(client.websocket, self.SLOW_CONSUMER_CLOSE_CODE))
+            return
+        
+        # Skip the backlog: the client catches up from a full snapshot
+        self.stats["degraded"] += 1
+        client.reset_to({"type": "meeting_snapshot", "meeting": snapshot})
+    
+    async def _write_loop(self, client: ClientConnection):
+        try:
+            while True:
+                item = await client.queue.get()
+                if client.encoder is None:
+                    await client.websocket.send_text(item)
+                else:
+                    await send_frame(client.websocket, client.encoder.encode(await self._batch(client, item)))
+                self.stats["frames_sent"] += 1
+                if client.queue.empty():
+                    # Fully caught up: forgive earlier lag
+                    client.degrades = 0
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            print(f"⚠️ Dropping dead socket in meeting {client.meeting_id}: {e}")
+            self.disconnect(client.websocket, client.meeting_id)
+    
+    @staticmethod
+    async def _batch(client: ClientConnection, first: CompactEvent) -> List[CompactEvent]:
+        """Coalesce whatever is queued (after the batching window, if any) into one frame"""
+        if client.batch_window:
+            await asyncio.sleep(client.batch_window)
+        events = [first]
+        while len(events) < MAX_BATCH_EVENTS and not client.queue.empty():
+            events.append(client.queue.get_nowait())
+        return events
+    
+    @staticmethod
+    async def _close(websocket: WebSocket, code: int):
+        try:
+            await websocket.close(code=code)
+        except Exception:
+            pass
+
+manager = ConnectionManager(snapshot_provider=lambda meeting_id: build_meeting_snapshot(meeting_id))
 
 # ═══════════════════════════════════════════════════════════════════════════
 # APP INITIALIZATION
 # ═══════════════════════════════════════════════════════════════════════════
 
-app = FastAPI(title="ROADY Meeting Rooms API")
+# Redis URL for the cross-worker event bus; unset = single-process bus
+MEETING_EVENT_BUS_URL = os.getenv("MEETING_EVENT_BUS_URL")
+# Agents table for the agent registry; unset = built-in agent configs only
+DATABASE_URL = os.getenv("DATABASE_URL")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start the meeting event bus and the agent registry with the app"""
+    from roady_agent_registry import agent_registry
+    
+    manager.use_bus(create_event_bus(MEETING_EVENT_BUS_URL))
+    await manager.bus.start()
+    
+    registry_db = None
+    if DATABASE_URL:
+        from roady_models import Database
+        # Read from the watcher thread only: one pooled connection (plus LISTEN)
+        registry_db = Database(DATABASE_URL, pool_size=1, max_overflow=0)
+        await asyncio.to_thread(agent_registry.start, registry_db, DATABASE_URL)
+    else:
+        print("⚠️ DATABASE_URL not set, agent registry not loaded (using built-in agent configs)")
+    
+    yield
+    
+    # Streamed turns outlive their request: cancel them while the bus still publishes
+    for task in list(_streaming_turns):
+        task.cancel()
+    await asyncio.gather(*_streaming_turns, return_exceptions=True)
+    
+    await asyncio.to_thread(agent_registry.stop_watcher)
+    if registry_db:
+        registry_db.engine.dispose()
+    await manager.bus.stop()
+
+
+app = FastAPI(title="ROADY Meeting Rooms API", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -106,7 +374,9 @@ async def create_meeting(request: CreateMeetingRequest):
         "participants": [],
         "messages": [],
         "project_id": request.project_id,
-        "task_id": request.task_id
+        "task_id": request.task_id,
+        "owner_user_id": request.owner_user_id,
+        "company_id": request.company_id
     }
     
     # Add agents as participants
@@ -120,8 +390,8 @@ async def create_meeting(request: CreateMeetingRequest):
                 "status": "active"
             })
     
-    # Save to database
-    save_meeting(meeting)  # Your function to save meeting
+    # Save header to database (messages are appended to the log as they arrive)
+    create_meeting_record(meeting)
     
     return {"meeting_id": meeting_id, "meeting": meeting}
 
@@ -138,6 +408,27 @@ async def get_meeting(meeting_id: str):
     return meeting
 
 
+@app.get("/api/meetings/{meeting_id}/messages")
+async def list_meeting_messages(meeting_id: str, before_seq: Optional[int] = None, limit: int = 50):
+    """Page through the transcript, newest first; pass `next_before_seq` to get older messages"""
+    
+    limit = max(1, min(limit, 200))
+    archive_index = get_meeting_archive_index(meeting_id)
+    if archive_index:
+        # Ended meeting moved to cold storage: read only the chunks this page needs
+        loop = asyncio.get_running_loop()
+        messages = await loop.run_in_executor(
+            None, lambda: get_meeting_archive().read_messages(archive_index, before_seq=before_seq, limit=limit)
+        )
+    else:
+        messages = get_meeting_messages(meeting_id, before_seq=before_seq, limit=limit)
+    
+    return {
+        "messages": messages,
+        "next_before_seq": messages[0]["seq"] if len(messages) == limit else None
+    }
+
+
 @app.get("/api/meetings")
 async def list_meetings(status: Optional[str] = None, limit: int = 50):
     """List all meetings"""
@@ -170,24 +461,34 @@ async def pause_meeting(meeting_id: str):
 async def end_meeting(meeting_id: str):
     """End a meeting and generate summary"""
     
+    # Let an in-flight running summary land first so the tail stays short
+    await wait_for_running_summary(meeting_id)
+    
     meeting = get_meeting_from_db(meeting_id)
     if not meeting:
         raise HTTPException(status_code=404, detail="Meeting not found")
     
-    # Update status
-    update_meeting_status(meeting_id, "ended")
-    meeting["ended_at"] = datetime.utcnow().isoformat()
-    
-    # Generate AI summary
-    summary = await generate_meeting_summary(meeting)
-    meeting["summary"] = summary
-    
-    # Extract action items
-    action_items = await extract_action_items(meeting)
-    meeting["action_items"] = action_items
-    
-    # Save final meeting
-    save_meeting(meeting)
+    # Running summary covers everything up to summarized_through_seq;
+    # only the tail after it is sent verbatim
+    sections = meeting.get("running_summary") or []
+    tail = load_transcript(meeting_id, after_seq=meeting.get("summarized_through_seq", 0))
+    prompt_tokens = sum(count_tokens(s["text"]) for s in sections) + sum(m["tokens"] for m in tail)
+    
+    # Generate AI summary and action items in one call
+    async with admit_meeting_work(meeting, prompt_tokens):
+        summary, action_items = await generate_meeting_wrapup(sections, tail)
+    
+    # Close the meeting (header only)
+    update_meeting_header(
+        meeting_id,
+        status="ended",
+        ended_at=datetime.utcnow(),
+        summary=summary,
+        action_items=action_items
+    )
+    _meeting_semaphores.pop(meeting_id, None)
+    _meeting_contexts.pop(meeting_id, None)
+    _summarizers.pop(meeting_id, None)
     
     # Broadcast to all participants
     await manager.broadcast(meeting_id, {
@@ -195,6 +496,7 @@ async def end_meeting(meeting_id: str):
         "summary": summary,
         "action_items": action_items
     })
+    manager.bus.forget(meeting_id)
     
     return {
         "status": "ended",
@@ -219,19 +521,69 @@ async def send_message(meeting_id: str, request: SendMessageRequest):
     if meeting["status"] != "active":
         raise HTTPException(status_code=400, detail="Meeting is not active")
     
+    # Admission control: sheds with 429/503 before anything is recorded.
+    # The slot is held until the agent turn finishes, even when streaming.
+    turn = AsyncExitStack()
+    await turn.enter_async_context(
+        admit_meeting_work(meeting, count_tokens(request.content) + CONTEXT_MAX_TOKENS)
+    )
+    
+    if not request.stream:
+        async with turn:
+            user_message = await record_user_message(meeting_id, meeting, request.content)
+            result = await run_agent_turn(meeting_id, meeting, request, stream=False)
+            return {"user_message": user_message, **result}
+    
+    try:
+        user_message = await record_user_message(meeting_id, meeting, request.content)
+    except BaseException:
+        await turn.aclose()
+        raise
+    
+    # Return as soon as generation starts; agent replies stream over the WebSocket
+    # as message_start / message_delta / message_complete events
+    task = asyncio.create_task(run_streaming_turn(turn, meeting_id, meeting, request))
+    _streaming_turns.add(task)
+    task.add_done_callback(_streaming_turns.discard)
+    
+    return {
+        "user_message": user_message,
+        "status": "generating",
+        "tokens_used": meeting["tokens_used"],
+        "cost_so_far": meeting["cost_so_far"]
+    }
+
+
+async def run_streaming_turn(turn: AsyncExitStack, meeting_id: str, meeting: dict, request: SendMessageRequest):
+    """Background agent turn for streamed messages (releases the admission slot)"""
+    async with turn:
+        try:
+            await run_agent_turn(meeting_id, meeting, request, stream=True)
+        except Exception as e:
+            print(f"⚠️ Streaming turn failed in meeting {meeting_id}: {e}")
+            await manager.broadcast(meeting_id, {
+                "type": "turn_failed",
+                "message": "Agents could not respond. Please try again."
+            })
+
+
+async def record_user_message(meeting_id: str, meeting: dict, content: str) -> dict:
+    """Append the user message to the meeting and broadcast it"""
+    
     # Create user message
     user_message = {
         "id": str(uuid.uuid4()),
         "sender_id": "user",
         "sender_type": "user",
         "sender_name": "You",
-        "content": request.content,
+        "content": content,
         "timestamp": datetime.utcnow().isoformat(),
-        "tokens": count_tokens(request.content),
+        "tokens": count_tokens(content),
         "cost": 0.0
     }
     
-    # Save user message
+    # Append user message to the log
+    user_message["seq"] = append_meeting_message(meeting_id, user_message)["seq"]
     meeting["messages"].append(user_message)
     
     # Broadcast user message
@@ -242,31 +594,26 @@ async def send_message(meeting_id: str, request: SendMessageRequest):
         "costSoFar": meeting["cost_so_far"]
     })
     
+    return user_message
+
+
+async def run_agent_turn(meeting_id: str, meeting: dict, request: SendMessageRequest, stream: bool) -> dict:
+    """Collect agent responses for the latest user message and update counters"""
+    
+    publish = TurnPublisher(meeting_id, meeting, stream)
+    
     # Get agent responses based on meeting mode
+    responses = []
     if meeting["mode"] == "round-robin":
-        responses = await handle_round_robin_responses(meeting, request.content)
+        responses = await handle_round_robin_responses(meeting, request.content, publish)
     elif meeting["mode"] == "free":
-        responses = await handle_free_discussion_responses(meeting, request.content)
+        responses = await handle_free_discussion_responses(meeting, request.content, publish)
     elif meeting["mode"] == "moderated":
         responses = await handle_moderated_responses(
-            meeting, request.content, request.target_agent_id
+            meeting, request.content, request.target_agent_id, publish
         )
     elif meeting["mode"] == "hierarchical":
-        responses = await handle_hierarchical_responses(meeting, request.content)
-    
-    # Add agent responses to meeting
-    for response in responses:
-        meeting["messages"].append(response)
-        meeting["tokens_used"] += response["tokens"]
-        meeting["cost_so_far"] += response["cost"]
-        
-        # Broadcast each agent response
-        await manager.broadcast(meeting_id, {
-            "type": "new_message",
-            "message": response,
-            "tokensUsed": meeting["tokens_used"],
-            "costSoFar": meeting["cost_so_far"]
-        })
+        responses = await handle_hierarchical_responses(meeting, request.content, publish)
     
     # Check limits
     if meeting["tokens_used"] >= meeting["tokens_limit"]:
@@ -281,62 +628,155 @@ async def send_message(meeting_id: str, request: SendMessageRequest):
             "message": "Cost limit reached. Meeting will end soon."
         })
     
-    # Save updated meeting
-    save_meeting(meeting)
+    maybe_schedule_summarization(meeting)
+    
+    if publish.context_tokens_saved:
+        print(f"✂️ Context pruning saved {publish.context_tokens_saved:.0f} tokens in meeting {meeting_id}")
     
     return {
-        "user_message": user_message,
         "agent_responses": responses,
         "tokens_used": meeting["tokens_used"],
-        "cost_so_far": meeting["cost_so_far"]
+        "cost_so_far": meeting["cost_so_far"],
+        "context_tokens_saved": publish.context_tokens_saved
     }
 
 
-async def handle_round_robin_responses(meeting: dict, user_message: str) -> List[dict]:
-    """Each agent responds in turn"""
+class TurnPublisher:
+    """Records each agent response in the meeting and broadcasts it as it lands"""
+    
+    def __init__(self, meeting_id: str, meeting: dict, stream: bool):
+        self.meeting_id = meeting_id
+        self.meeting = meeting
+        # Meeting to stream deltas to (None = whole messages only)
+        self.stream_to = meeting_id if stream else None
+        # Prompt tokens saved by context pruning this turn
+        self.context_tokens_saved = 0
+    
+    async def __call__(self, response: dict, reservation: Optional["BudgetReservation"] = None):
+        meeting = self.meeting
+        
+        # Append to the log and reconcile the reservation; counters come
+        # back from the same atomic update
+        totals = append_meeting_message(
+            self.meeting_id, response, tokens=response["tokens"], cost=response["cost"],
+            release_tokens=reservation.tokens if reservation else 0,
+            release_cost=reservation.cost if reservation else 0.0
+        )
+        response["seq"] = totals["seq"]
+        meeting["messages"].append(response)
+        meeting["tokens_used"] = totals["tokens_used"]
+        meeting["cost_so_far"] = totals["cost_so_far"]
+        
+        event = {
+            "type": "message_complete" if self.stream_to else "new_message",
+            "message": response,
+            "tokensUsed": meeting["tokens_used"],
+            "costSoFar": meeting["cost_so_far"]
+        }
+        if self.stream_to:
+            event["messageId"] = response["id"]
+            event["tokens"] = response["tokens"]
+            event["cost"] = response["cost"]
+        
+        await manager.broadcast(self.meeting_id, event)
+
+
+async def fan_out_responses(
+    meeting: dict,
+    requests: List[tuple],
+    publish: TurnPublisher
+) -> List[dict]:
+    """
+    Run independent agent calls concurrently (capped per meeting) and
+    publish each response as it completes. `requests` holds
+    (agent_id, user_message) pairs; every call sees the same history
+    snapshot, as if the agents answered simultaneously.
+    """
+    semaphore = get_meeting_semaphore(meeting["id"])
+    window = get_context_window(meeting)
+    context = window.render()
+    
+    async def call(agent_id: str, user_message: str) -> tuple:
+        reservation = None
+        try:
+            agent_context = context
+            if meeting.get("context_pruning_enabled"):
+                agent_context, pruned_tokens = build_pruned_context(meeting, agent_id, user_message)
+                publish.context_tokens_saved += window.total_tokens - pruned_tokens
+            
+            # Reserve the estimated cost before calling (raises MeetingBudgetExceeded)
+            reservation = reserve_agent_call(meeting, agent_id, agent_context, user_message)
+            async with semaphore:
+                response = await get_agent_response(
+                    agent_id, user_message, agent_context,
+                    stream_to=publish.stream_to, budget_mode=reservation.budget_mode
+                )
+        except BaseException as e:
+            if reservation is not None:
+                release_meeting_budget(meeting["id"], reservation.tokens, reservation.cost)
+            if isinstance(e, Exception) and not isinstance(e, MeetingBudgetExceeded):
+                raise AgentCallFailed(agent_id, e) from e
+            raise
+        return response, reservation
+    
     responses = []
+    for next_response in asyncio.as_completed([call(a, m) for a, m in requests]):
+        try:
+            response, reservation = await next_response
+        except MeetingBudgetExceeded as e:
+            await manager.broadcast(meeting["id"], {
+                "type": "budget_refused",
+                "agentId": e.agent_id,
+                "message": str(e)
+            })
+            continue
+        except AgentCallFailed as e:
+            # The reservation is already released; tell the room who didn't answer
+            print(f"⚠️ Agent {e.agent_id} failed in meeting {meeting['id']}: {e}")
+            await manager.broadcast(meeting["id"], {
+                "type": "agent_failed",
+                "agentId": e.agent_id,
+                "message": f"{e.agent_id} could not respond, no budget was charged"
+            })
+            continue
+        await publish(response, reservation)
+        responses.append(response)
     
-    # Get next agent in rotation
-    current_speaker_index = meeting.get("current_speaker_index", -1)
-    next_index = (current_speaker_index + 1) % len(meeting["participants"])
+    return responses
+
+
+async def handle_round_robin_responses(meeting: dict, user_message: str, publish) -> List[dict]:
+    """Each agent responds in turn"""
+    
+    # Get next agent in rotation (advanced atomically in the header)
+    next_index = advance_speaker_index(meeting["id"], len(meeting["participants"]))
     meeting["current_speaker_index"] = next_index
     
     agent = meeting["participants"][next_index]
-    response = await get_agent_response(
-        agent["id"],
-        user_message,
-        meeting["messages"]
-    )
-    
-    responses.append(response)
-    return responses
+    return await fan_out_responses(meeting, [(agent["id"], user_message)], publish)
 
 
-async def handle_free_discussion_responses(meeting: dict, user_message: str) -> List[dict]:
+async def handle_free_discussion_responses(meeting: dict, user_message: str, publish) -> List[dict]:
     """AI determines which agents should respond"""
     
-    # Use LLM to determine relevance
+    # Rank participants locally (no LLM call to pick speakers)
     relevant_agents = await determine_relevant_agents(
         user_message,
-        meeting["participants"]
+        meeting["participants"],
+        recent_messages=meeting["messages"]
     )
     
-    responses = []
-    for agent in relevant_agents:
-        response = await get_agent_response(
-            agent["id"],
-            user_message,
-            meeting["messages"]
-        )
-        responses.append(response)
-    
-    return responses
+    # Relevant agents answer concurrently
+    return await fan_out_responses(
+        meeting, [(agent["id"], user_message) for agent in relevant_agents], publish
+    )
 
 
 async def handle_moderated_responses(
     meeting: dict, 
     user_message: str, 
-    target_agent_id: Optional[str]
+    target_agent_id: Optional[str],
+    publish
 ) -> List[dict]:
     """User specifies which agent should respond"""
     
@@ -351,16 +791,10 @@ async def handle_moderated_responses(
     if not agent:
         return []
     
-    response = await get_agent_response(
-        agent["id"],
-        user_message,
-        meeting["messages"]
-    )
-    
-    return [response]
+    return await fan_out_responses(meeting, [(agent["id"], user_message)], publish)
 
 
-async def handle_hierarchical_responses(meeting: dict, user_message: str) -> List[dict]:
+async def handle_hierarchical_responses(meeting: dict, user_message: str, publish) -> List[dict]:
     """L1 directors coordinate, L2 specialists execute"""
     
     # Get L1 directors first
@@ -368,24 +802,18 @@ async def handle_hierarchical_responses(meeting: dict, user_message: str) -> Lis
     l2_agents = [a for a in meeting["participants"] if not is_l1_agent(a["id"])]
     
     responses = []
+    l2_message = user_message
     
-    # L1 provides direction
+    # L1 provides direction (L2 agents depend on it, so this one runs first)
     if l1_agents:
-        director_response = await get_agent_response(
-            l1_agents[0]["id"],
-            user_message,
-            meeting["messages"]
-        )
-        responses.append(director_response)
-    
-    # L2 agents execute based on L1 direction
-    for agent in l2_agents[:2]:  # Limit to 2 L2 responses
-        response = await get_agent_response(
-            agent["id"],
-            user_message + "\n\nDirector's guidance: " + director_response["content"],
-            meeting["messages"]
-        )
-        responses.append(response)
+        responses = await fan_out_responses(meeting, [(l1_agents[0]["id"], user_message)], publish)
+        if responses:
+            l2_message = user_message + "\n\nDirector's guidance: " + responses[0]["content"]
+    
+    # L2 agents execute based on L1 direction, concurrently
+    responses += await fan_out_responses(
+        meeting, [(agent["id"], l2_message) for agent in l2_agents[:2]], publish  # Limit to 2 L2 responses
+    )
     
     return responses
 
@@ -393,27 +821,57 @@ async def handle_hierarchical_responses(meeting: dict, user_message: str) -> Lis
 async def get_agent_response(
     agent_id: str, 
     user_message: str, 
-    conversation_history: List[dict]
+    context: str,
+    stream_to: Optional[str] = None,
+    budget_mode: bool = False
 ) -> dict:
-    """Get response from an agent using their configured LLM"""
+    """
+    Get response from an agent using their configured LLM.
+    `context` is the rendered conversation window (see ContextWindow).
+    With `stream_to`, text is broadcast to that meeting as it is generated.
+    With `budget_mode`, the agent's cheaper model alternative is used.
+    """
     
     agent = get_agent(agent_id)
+    message_id = str(uuid.uuid4())
     
-    # Build context from conversation history
-    context = build_context(conversation_history, agent_id)
+    prompt = build_agent_prompt(context, user_message, agent.agent_name)
     
-    # Call LLM (use your LLM router)
-    from llm_router import LLMRouter
-    router = LLMRouter(database_session=None)
+    # Call LLM off the event loop
+    if stream_to:
+        await manager.broadcast(stream_to, {
+            "type": "message_start",
+            "messageId": message_id,
+            "senderId": agent_id,
+            "senderName": agent.agent_name
+        })
+        
+        async def on_delta(text: str):
+            await manager.broadcast(stream_to, {
+                "type": "message_delta",
+                "messageId": message_id,
+                "delta": text
+            })
+        
+        response = await run_llm_stream(
+            agent_id=agent_id,
+            prompt=prompt,
+            task_id="meeting_message",
+            on_delta=on_delta,
+            budget_mode=budget_mode
+        )
+    else:
+        response = await run_llm(
+            agent_id=agent_id,
+            prompt=prompt,
+            task_id="meeting_message",
+            budget_mode=budget_mode
+        )
     
-    response = router.execute_with_fallback(
-        agent_id=agent_id,
-        prompt=f"{context}\n\nUser: {user_message}\n\n{agent.agent_name}:",
-        task_id="meeting_message"
-    )
+    output_token_stats.record(agent_id, response.output_tokens)
     
     return {
-        "id": str(uuid.uuid4()),
+        "id": message_id,
         "sender_id": agent_id,
         "sender_type": "agent",
         "sender_name": agent.agent_name,
@@ -453,8 +911,10 @@ async def add_participant(meeting_id: str, request: AddParticipantRequest):
         "department": agent.department,
         "status": "active"
     }
+    if not add_meeting_participant(meeting_id, participant, max_participants=8):
+        # Lost a race with another add
+        raise HTTPException(status_code=409, detail="Meeting is full or agent already joined")
     meeting["participants"].append(participant)
-    save_meeting(meeting)
     
     # Broadcast to all participants
     await manager.broadcast(meeting_id, {
@@ -474,10 +934,7 @@ async def remove_participant(meeting_id: str, agent_id: str):
         raise HTTPException(status_code=404, detail="Meeting not found")
     
     # Remove participant
-    meeting["participants"] = [
-        p for p in meeting["participants"] if p["id"] != agent_id
-    ]
-    save_meeting(meeting)
+    remove_meeting_participant(meeting_id, agent_id)
     
     # Broadcast to all participants
     await manager.broadcast(meeting_id, {
@@ -500,7 +957,8 @@ async def optimize_tokens(meeting_id: str, request: OptimizeRequest):
         raise HTTPException(status_code=404, detail="Meeting not found")
     
     if request.type == "compression":
-        result = await compress_history(meeting)
+        async with admit_meeting_work(meeting, sum(m["tokens"] for m in meeting["messages"][-20:])):
+            result = await compress_history(meeting)
     elif request.type == "pruning":
         result = await prune_context(meeting)
     elif request.type == "summarization":
@@ -508,8 +966,6 @@ async def optimize_tokens(meeting_id: str, request: OptimizeRequest):
     else:
         raise HTTPException(status_code=400, detail="Invalid optimization type")
     
-    save_meeting(meeting)
-    
     # Broadcast optimization applied
     await manager.broadcast(meeting_id, {
         "type": "optimization_applied",
@@ -539,9 +995,7 @@ async def compress_history(meeting: dict) -> dict:
     """
     
     # Call LLM for summary
-    from llm_router import LLMRouter
-    router = LLMRouter(database_session=None)
-    response = router.execute_with_fallback(
+    response = await run_llm(
         agent_id="core_orchestrator",
         prompt=summary_prompt,
         task_id="compress_history"
@@ -563,8 +1017,14 @@ async def compress_history(meeting: dict) -> dict:
     original_tokens = sum(m["tokens"] for m in messages_to_compress)
     saved_tokens = original_tokens - response.total_tokens
     
+    # Append the summary to the log and retire the older half it replaces
+    compressed = meeting["messages"][-20:-10]
+    summary_message["seq"] = append_meeting_message(meeting["id"], summary_message)["seq"]
+    supersede_meeting_messages(meeting["id"], [m["seq"] for m in compressed if "seq" in m])
+    
     # Keep only last 10 messages + summary
-    meeting["messages"] = meeting["messages"][:-20] + [summary_message] + meeting["messages"][-10:]
+    meeting["messages"] = meeting["messages"][:-20] + meeting["messages"][-10:] + [summary_message]
+    _meeting_contexts.pop(meeting["id"], None)
     
     return {
         "status": "compressed",
@@ -578,10 +1038,14 @@ async def prune_context(meeting: dict) -> dict:
     """Enable context pruning for future messages"""
     
     meeting["context_pruning_enabled"] = True
+    update_meeting_settings(meeting["id"], {"context_pruning_enabled": True})
     
     return {
         "status": "enabled",
-        "message": "Context pruning enabled. Agents will only receive relevant context."
+        "message": (
+            "Context pruning enabled. Agents will only receive the most relevant "
+            f"messages, up to {PRUNED_CONTEXT_MAX_TOKENS} tokens."
+        )
     }
 
 
@@ -589,33 +1053,161 @@ async def enable_summarization(meeting: dict) -> dict:
     """Enable automatic message summarization"""
     
     meeting["auto_summarization_enabled"] = True
-    meeting["summarization_threshold"] = 500  # tokens
+    meeting["summarization_threshold"] = SUMMARY_EVERY_TOKENS  # tokens
+    update_meeting_settings(meeting["id"], {
+        "auto_summarization_enabled": True,
+        "summarization_threshold": SUMMARY_EVERY_TOKENS
+    })
+    maybe_schedule_summarization(meeting)
     
     return {
         "status": "enabled",
-        "message": "Auto-summarization enabled for messages >500 tokens"
+        "message": (
+            f"Running summary updated every {SUMMARY_EVERY_MESSAGES} messages "
+            f"or {SUMMARY_EVERY_TOKENS} tokens"
+        )
+    }
+
+# ═══════════════════════════════════════════════════════════════════════════
+# RUNNING SUMMARY
+# ═══════════════════════════════════════════════════════════════════════════
+
+def maybe_schedule_summarization(meeting: dict):
+    """Update the running summary in the background once enough new conversation piled up"""
+    
+    if not meeting.get("auto_summarization_enabled"):
+        return
+    
+    task = _summarizers.get(meeting["id"])
+    if task and not task.done():
+        return
+    
+    # Walk back over the unsummarized tail only
+    through_seq = meeting.get("summarized_through_seq", 0)
+    pending_messages = 0
+    pending_tokens = 0
+    for msg in reversed(meeting["messages"]):
+        if msg.get("seq", 0) <= through_seq:
+            break
+        pending_messages += 1
+        pending_tokens += msg["tokens"]
+    
+    threshold = meeting.get("summarization_threshold") or SUMMARY_EVERY_TOKENS
+    if pending_messages < SUMMARY_EVERY_MESSAGES and pending_tokens < threshold:
+        return
+    
+    _summarizers[meeting["id"]] = asyncio.create_task(update_running_summary(meeting))
+
+
+async def update_running_summary(meeting: dict):
+    """
+    Summarize the next chunk of unsummarized messages into a new section.
+    Old sections are folded into higher-level ones so the summary stays
+    bounded however long the meeting runs.
+    """
+    meeting_id = meeting["id"]
+    sections = list(meeting.get("running_summary") or [])
+    through_seq = meeting.get("summarized_through_seq", 0)
+    
+    chunk = get_meeting_messages(meeting_id, after_seq=through_seq, limit=SUMMARY_MAX_CHUNK_MESSAGES)
+    if not chunk:
+        return
+    
+    prompt = f"""
+    Summarize this part of an ongoing meeting in one short paragraph.
+    Keep decisions, open questions and action items (with owners).
+    
+    {format_messages_for_summary(chunk)}
+    """
+    
+    try:
+        async with admit_meeting_work(meeting, sum(m["tokens"] for m in chunk)):
+            response = await run_meeting_llm(meeting, prompt, task_id="meeting_running_summary")
+            sections.append({"through_seq": chunk[-1]["seq"], "level": 0, "text": response.content})
+            
+            if len(sections) > SUMMARY_MAX_SECTIONS:
+                sections = await fold_summary_sections(meeting, sections)
+    except Exception as e:
+        # Shed, over the meeting budget or failed: the next turn will try again
+        print(f"⚠️ Running summary skipped for meeting {meeting_id}: {e}")
+        return
+    
+    # Compare-and-set: another worker may have summarized this range already
+    if save_running_summary(meeting_id, sections, chunk[-1]["seq"], expected_through_seq=through_seq):
+        meeting["running_summary"] = sections
+        meeting["summarized_through_seq"] = chunk[-1]["seq"]
+
+
+async def fold_summary_sections(meeting: dict, sections: List[dict]) -> List[dict]:
+    """
+    Condense the oldest run of same-level sections into one section a
+    level up (falling back to the oldest sections), so levels grow
+    logarithmically with meeting length
+    """
+    
+    start = 0
+    for i in range(len(sections) - SUMMARY_FOLD_SECTIONS + 1):
+        run = sections[i:i + SUMMARY_FOLD_SECTIONS]
+        if all(section["level"] == run[0]["level"] for section in run):
+            start = i
+            break
+    oldest = sections[start:start + SUMMARY_FOLD_SECTIONS]
+    
+    prompt = f"""
+    Condense these consecutive meeting summary sections into one paragraph,
+    keeping decisions and action items:
+    
+    {format_summary_sections(oldest)}
+    """
+    
+    response = await run_meeting_llm(meeting, prompt, task_id="meeting_summary_fold")
+    
+    folded = {
+        "through_seq": oldest[-1]["through_seq"],
+        "level": max(s["level"] for s in oldest) + 1,
+        "text": response.content
     }
+    return sections[:start] + [folded] + sections[start + SUMMARY_FOLD_SECTIONS:]
+
+
+async def wait_for_running_summary(meeting_id: str):
+    """Wait for this worker's in-flight summary update, if any"""
+    task = _summarizers.pop(meeting_id, None)
+    if task and not task.done():
+        await task
 
 # ═══════════════════════════════════════════════════════════════════════════
 # WEBSOCKET ENDPOINT
 # ═══════════════════════════════════════════════════════════════════════════
 
 @app.websocket("/meetings/{meeting_id}/ws")
-async def websocket_endpoint(websocket: WebSocket, meeting_id: str):
-    """WebSocket connection for real-time meeting updates"""
+async def websocket_endpoint(
+    websocket: WebSocket,
+    meeting_id: str,
+    last_seq: Optional[int] = None,
+    batch_ms: Optional[int] = None
+):
+    """
+    WebSocket connection for real-time meeting updates.
+    Reconnecting clients pass the `seq` of the last event they saw as `last_seq`.
+    Clients offering a compact subprotocol may set `batch_ms` to coalesce
+    events into fewer frames (see roady_ws_protocol).
+    """
     
-    await manager.connect(websocket, meeting_id)
+    await manager.connect(websocket, meeting_id, last_seq, batch_ms)
     
     try:
         while True:
             # Keep connection alive
             data = await websocket.receive_text()
             
-            # Handle ping/pong
+            # Handle ping/pong (through the writer so sends never interleave)
             if data == "ping":
-                await websocket.send_text("pong")
+                manager.send_to(websocket, meeting_id, {"type": "pong"}, legacy_frame="pong")
     
     except WebSocketDisconnect:
+        pass
+    finally:
         manager.disconnect(websocket, meeting_id)
 
 
@@ -623,37 +1215,575 @@ async def websocket_endpoint(websocket: WebSocket, meeting_id: str):
 # HELPER FUNCTIONS
 # ═══════════════════════════════════════════════════════════════════════════
 
+@lru_cache(maxsize=1)
+def _token_encoding():
+    import tiktoken
+    return tiktoken.get_encoding("cl100k_base")
+
+
 def count_tokens(text: str) -> int:
-    """Estimate token count (rough estimate)"""
-    # More accurate: use tiktoken library
-    return len(text.split()) * 1.3  # Rough estimate
+    """Count tokens with tiktoken (cl100k_base; close enough across providers for budgeting)"""
+    return len(_token_encoding().encode(text, disallowed_special=()))
+
 
+def build_agent_prompt(context: str, user_message: str, agent_name: str) -> str:
+    return f"{context}\n\nUser: {user_message}\n\n{agent_name}:"
 
-def build_context(messages: List[dict], agent_id: str, max_tokens: int = 3000) -> str:
-    """Build context from conversation history"""
+
+CONTEXT_MAX_TOKENS = 3000
+
+# Messages loaded with the meeting header (older ones are paged on demand)
+MEETING_RECENT_MESSAGES = 100
+
+# Where ROADY_MEETING_ARCHIVE moves transcripts of ended meetings
+MEETING_ARCHIVE_DIR = os.getenv("MEETING_ARCHIVE_DIR", "/var/lib/roady/meeting-archive")
+
+# Context pruning: per-agent budget and scoring (see score_context_messages)
+PRUNED_CONTEXT_MAX_TOKENS = 1500
+PRUNE_KEEP_RECENT = 2
+PRUNE_RECENCY_HALF_LIFE = 10  # messages
+PRUNE_WEIGHTS = {
+    "similarity": 1.0,
+    "mention": 0.8,
+    "department": 0.3,
+    "own": 0.2,
+    "recency": 0.5
+}
+
+# Free-discussion speaker ranking (see determine_relevant_agents)
+RANK_TOP_K = 2
+RANK_MIN_SCORE = 0.2
+RANK_RELATIVE_CUTOFF = 0.5  # second pick must score at least half the best
+RANK_RECENT_WINDOW = 6  # messages
+RANK_RECENT_SPEAKER_BONUS = 0.1
+RANK_WEIGHTS = {"keyword": 1.0, "department": 0.6, "name": 0.4}
+
+# Running summary: new section every N messages or N tokens, at most
+# N messages per section, oldest sections folded once there are too many
+SUMMARY_EVERY_MESSAGES = 20
+SUMMARY_EVERY_TOKENS = 2000
+SUMMARY_MAX_CHUNK_MESSAGES = 60
+SUMMARY_MAX_SECTIONS = 8
+SUMMARY_FOLD_SECTIONS = 4
+
+
+class OutputTokenStats:
+    """Recent output token counts per agent, for pre-flight estimates"""
     
-    # Get recent relevant messages
-    context_messages = []
-    total_tokens = 0
+    def __init__(self, window: int = 50, quantile: float = 0.9, default: int = 500, min_samples: int = 5):
+        self.window = window
+        self.quantile = quantile
+        self.default = default
+        self.min_samples = min_samples
+        self._samples: Dict[str, deque] = {}
     
-    for msg in reversed(messages):
-        if total_tokens + msg["tokens"] > max_tokens:
-            break
-        context_messages.insert(0, msg)
-        total_tokens += msg["tokens"]
+    def record(self, agent_id: str, output_tokens: int):
+        samples = self._samples.get(agent_id)
+        if samples is None:
+            samples = self._samples[agent_id] = deque(maxlen=self.window)
+        samples.append(output_tokens)
+    
+    def estimate(self, agent_id: str) -> int:
+        """High quantile of the agent's recent outputs (default until there's history)"""
+        samples = self._samples.get(agent_id)
+        if not samples or len(samples) < self.min_samples:
+            return self.default
+        ordered = sorted(samples)
+        return ordered[int(self.quantile * (len(ordered) - 1))]
+
+
+output_token_stats = OutputTokenStats()
+
+
+class BudgetReservation(NamedTuple):
+    tokens: int
+    cost: float
+    budget_mode: bool
+
+
+class MeetingBudgetExceeded(Exception):
+    """An agent call would push the meeting past its token or cost limit"""
+    
+    def __init__(self, agent_id: str, message: str):
+        super().__init__(message)
+        self.agent_id = agent_id
+
+
+class AgentCallFailed(Exception):
+    """An agent call failed after (or while) reserving budget; the reservation is released"""
+    
+    def __init__(self, agent_id: str, error: Exception):
+        super().__init__(f"{type(error).__name__}: {error}")
+        self.agent_id = agent_id
+
+
+def reserve_agent_call(meeting: dict, agent_id: str, context: str, user_message: str) -> BudgetReservation:
+    """
+    Reserve an agent call against the meeting budget before making it:
+    exact prompt tokens plus a high-quantile estimate of the agent's
+    output. If the primary model doesn't fit, try the cheaper alternative;
+    if neither fits, refuse.
+    """
+    participant = next((p for p in meeting["participants"] if p["id"] == agent_id), {})
+    prompt = build_agent_prompt(context, user_message, participant.get("name", agent_id))
+    return reserve_llm_call(
+        meeting, agent_id, prompt, output_token_stats.estimate(agent_id), participant.get("name", agent_id)
+    )
+
+
+def reserve_llm_call(meeting: dict, agent_id: str, prompt: str, output_tokens: int, label: str) -> BudgetReservation:
+    """Reserve `prompt` plus `output_tokens` on the meeting budget, on the cheaper model if needed"""
+    input_tokens = count_tokens(prompt)
+    tokens = input_tokens + output_tokens
+    
+    router = get_llm_router()
+    for budget_mode in (False, True):
+        cost = router.estimate_cost(agent_id, input_tokens, output_tokens, budget_mode=budget_mode)
+        if reserve_meeting_budget(meeting["id"], tokens, cost):
+            return BudgetReservation(tokens, cost, budget_mode)
+    
+    raise MeetingBudgetExceeded(
+        agent_id,
+        f"Not enough meeting budget left for {label} (needs ~{tokens} tokens / ${cost:.4f})"
+    )
+
+
+def admit_meeting_work(meeting: dict, prompt_tokens: float):
+    """Admission slot for LLM work billed to the meeting owner"""
+    owner_id = meeting.get("owner_user_id") or f"meeting:{meeting['id']}"
+    return admission_controller.admit(
+        owner_id,
+        get_plan_tier(owner_id),
+        company_id=meeting.get("company_id"),
+        predicted_cost=predict_cost(prompt_tokens),
+        remaining_budget=get_remaining_budget(owner_id)
+    )
+
+
+# Max concurrent LLM calls per meeting turn fan-out
+MEETING_CONCURRENCY_LIMIT = 4
+
+# Sync LLM SDK calls run here so they never block the event loop
+llm_executor = ThreadPoolExecutor(max_workers=32, thread_name_prefix="meeting-llm")
+
+# Streamed deltas are coalesced into one frame every N ms or N chunks
+STREAM_FLUSH_INTERVAL_MS = 50
+STREAM_FLUSH_CHUNKS = 16
+
+_meeting_semaphores: Dict[str, asyncio.Semaphore] = {}
+_meeting_contexts: Dict[str, "ContextWindow"] = {}
+_summarizers: Dict[str, asyncio.Task] = {}
+_speaker_indexes: Dict[tuple, "SpeakerIndex"] = {}
+_streaming_turns: set = set()
+_llm_router = None
+_meeting_archive = None
+
+
+def get_meeting_semaphore(meeting_id: str) -> asyncio.Semaphore:
+    """Per-meeting cap on concurrent agent calls"""
+    if meeting_id not in _meeting_semaphores:
+        _meeting_semaphores[meeting_id] = asyncio.Semaphore(MEETING_CONCURRENCY_LIMIT)
+    return _meeting_semaphores[meeting_id]
+
+
+def get_llm_router():
+    """Shared LLM router (clients are initialized once per process)"""
+    global _llm_router
+    if _llm_router is None:
+        from llm_router import LLMRouter
+        from roady_agent_registry import agent_registry
+        _llm_router = LLMRouter(database_session=None, agent_registry=agent_registry)
+    return _llm_router
+
+
+def get_meeting_archive():
+    """Cold transcript storage for archived meetings (see roady_meeting_archive)"""
+    global _meeting_archive
+    if _meeting_archive is None:
+        from roady_meeting_archive import MeetingArchive
+        _meeting_archive = MeetingArchive(MEETING_ARCHIVE_DIR)
+    return _meeting_archive
+
+
+async def run_llm(agent_id: str, prompt: str, task_id: str, budget_mode: bool = False):
+    """Run the synchronous execute_with_fallback in the LLM thread pool"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        llm_executor,
+        lambda: get_llm_router().execute_with_fallback(
+            agent_id=agent_id,
+            prompt=prompt,
+            task_id=task_id,
+            budget_mode=budget_mode
+        )
+    )
+
+
+async def run_meeting_llm(meeting: dict, prompt: str, task_id: str):
+    """
+    Orchestrator call made for the meeting itself (running summary, folds):
+    reserved against the meeting budget like an agent turn, then its usage
+    is added to the meeting counters and broadcast
+    """
+    agent_id = "core_orchestrator"
+    reservation = reserve_llm_call(
+        meeting, agent_id, prompt, output_token_stats.estimate(task_id), "the meeting summary"
+    )
+    try:
+        response = await run_llm(agent_id, prompt, task_id, budget_mode=reservation.budget_mode)
+    except BaseException:
+        release_meeting_budget(meeting["id"], reservation.tokens, reservation.cost)
+        raise
+    
+    output_token_stats.record(task_id, response.output_tokens)
+    totals = record_meeting_usage(
+        meeting["id"], response.total_tokens, response.cost_usd,
+        release_tokens=reservation.tokens, release_cost=reservation.cost
+    )
+    meeting["tokens_used"] = totals["tokens_used"]
+    meeting["cost_so_far"] = totals["cost_so_far"]
+    
+    await manager.broadcast(meeting["id"], {
+        "type": "usage_updated",
+        "taskId": task_id,
+        "tokens": response.total_tokens,
+        "cost": response.cost_usd,
+        "tokensUsed": meeting["tokens_used"],
+        "costSoFar": meeting["cost_so_far"]
+    })
+    return response
+
+
+async def run_llm_stream(
+    agent_id: str,
+    prompt: str,
+    task_id: str,
+    on_delta: Callable[[str], Awaitable[None]],
+    flush_interval_ms: int = STREAM_FLUSH_INTERVAL_MS,
+    flush_chunks: int = STREAM_FLUSH_CHUNKS,
+    budget_mode: bool = False
+):
+    """
+    Run stream_with_fallback in the LLM thread pool, coalescing deltas so
+    on_delta fires at most once per flush interval or per N chunks.
+    Returns the final LLMResponse.
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+    # Set when the awaiting turn goes away: the thread stops pulling the provider stream
+    abandoned = threading.Event()
+    
+    def produce():
+        stream = get_llm_router().stream_with_fallback(
+            agent_id=agent_id, prompt=prompt, task_id=task_id, budget_mode=budget_mode
+        )
+        try:
+            for item in stream:
+                if abandoned.is_set():
+                    break
+                loop.call_soon_threadsafe(queue.put_nowait, item)
+        except Exception as e:
+            if not abandoned.is_set():
+                loop.call_soon_threadsafe(queue.put_nowait, e)
+        finally:
+            stream.close()
+    
+    producer = loop.run_in_executor(llm_executor, produce)
+    
+    buffer: List[str] = []
+    deadline = None
+    
+    async def flush():
+        nonlocal deadline
+        if buffer:
+            text = "".join(buffer)
+            buffer.clear()
+            await on_delta(text)
+        deadline = None
+    
+    try:
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - loop.time())
+            try:
+                item = await asyncio.wait_for(queue.get(), timeout)
+            except asyncio.TimeoutError:
+                await flush()
+                continue
+            
+            if isinstance(item, Exception):
+                await flush()
+                await producer
+                raise item
+            
+            if isinstance(item, str):
+                buffer.append(item)
+                if deadline is None:
+                    deadline = loop.time() + flush_interval_ms / 1000
+                if len(buffer) >= flush_chunks:
+                    await flush()
+                continue
+            
+            # Final LLMResponse
+            await flush()
+            await producer
+            return item
+    finally:
+        abandoned.set()
+
+
+class ContextWindow:
+    """
+    Rolling prompt context for one meeting.
+    
+    Holds the most recent messages that fit in `max_tokens`, each rendered
+    once with its token count cached, plus a running total. New messages
+    are appended and old ones evicted from the front, so a turn costs the
+    same no matter how long the meeting is. The joined context is cached
+    until the window changes and shared by every agent in a turn.
+    """
+    
+    def __init__(self, max_tokens: int = CONTEXT_MAX_TOKENS):
+        self.max_tokens = max_tokens
+        self.entries: deque = deque()  # (message_id, rendered, tokens)
+        self.total_tokens = 0
+        self.last_message_id: Optional[str] = None
+        self._rendered: Optional[str] = None
+    
+    def append(self, msg: dict):
+        self.entries.append((msg.get("id"), render_context_message(msg), msg["tokens"]))
+        self.total_tokens += msg["tokens"]
+        self.last_message_id = msg.get("id")
+        self._rendered = None
+        
+        while self.entries and self.total_tokens > self.max_tokens:
+            self.total_tokens -= self.entries.popleft()[2]
+    
+    def sync(self, messages: List[dict]):
+        """Append messages added since the last sync (walks back only over new ones)"""
+        if not messages or messages[-1].get("id") == self.last_message_id:
+            return
+        
+        new_messages = []
+        new_tokens = 0
+        for msg in reversed(messages):
+            if self.last_message_id is not None and msg.get("id") == self.last_message_id:
+                break
+            new_messages.append(msg)
+            new_tokens += msg["tokens"]
+            if new_tokens > self.max_tokens:
+                # Everything currently held would be evicted anyway
+                self.clear()
+                break
+        else:
+            # History was rewritten (or first sync): rebuild from the tail
+            self.clear()
+        
+        for msg in reversed(new_messages):
+            self.append(msg)
     
-    # Format as conversation
-    context = ""
-    for msg in context_messages:
-        context += f"{msg['sender_name']}: {msg['content']}\n\n"
+    def clear(self):
+        self.entries.clear()
+        self.total_tokens = 0
+        self.last_message_id = None
+        self._rendered = None
     
-    return context
+    def render(self) -> str:
+        """Conversation context, formatted as `Name: content` blocks"""
+        if self._rendered is None:
+            self._rendered = "".join(entry[1] for entry in self.entries)
+        return self._rendered
 
 
-async def determine_relevant_agents(message: str, participants: List[dict]) -> List[dict]:
-    """Use AI to determine which agents should respond"""
+def render_context_message(msg: dict) -> str:
+    return f"{msg['sender_name']}: {msg['content']}\n\n"
+
+
+def get_context_window(meeting: dict) -> ContextWindow:
+    """Per-meeting context window, brought up to date with the message list"""
+    window = _meeting_contexts.get(meeting["id"])
+    if window is None:
+        window = _meeting_contexts[meeting["id"]] = ContextWindow()
+    window.sync(meeting["messages"])
+    return window
+
+
+_STOPWORDS = frozenset(
+    "the and for that this with you your are was were have has had not but can will "
+    "what when where which who how our out all any its it's they them then than there "
+    "about into from just also should would could been being let's lets please".split()
+)
+
+
+@lru_cache(maxsize=8192)
+def message_terms(text: str) -> frozenset:
+    """Content words of a message (cached: past messages are scored every turn)"""
+    return frozenset(
+        word for word in re.findall(r"[a-z0-9]+", text.lower())
+        if len(word) > 2 and word not in _STOPWORDS
+    )
+
+
+def score_context_messages(
+    messages: List[dict],
+    query: str,
+    agent_id: str,
+    agent_name: str,
+    department: Optional[str]
+) -> List[float]:
+    """
+    Relevance of each past message to an agent about to answer `query`:
+    lexical similarity to the query, mentions of the agent, the agent's
+    department, the agent's own messages, plus a recency decay.
+    """
+    weights = PRUNE_WEIGHTS
+    query_terms = message_terms(query)
+    handle = "@" + agent_name.lower().replace(" ", "_")
+    name = agent_name.lower()
+    dept_terms = message_terms(department.replace("_", " ")) if department else frozenset()
+    
+    scores = []
+    last = len(messages) - 1
+    for i, msg in enumerate(messages):
+        terms = message_terms(msg["content"])
+        content = msg["content"].lower()
+        
+        score = 0.0
+        if query_terms and terms:
+            score += weights["similarity"] * len(query_terms & terms) / math.sqrt(len(query_terms) * len(terms))
+        if handle in content or name in content:
+            score += weights["mention"]
+        if dept_terms and dept_terms & terms:
+            score += weights["department"]
+        if msg.get("sender_id") == agent_id:
+            score += weights["own"]
+        score += weights["recency"] * 0.5 ** ((last - i) / PRUNE_RECENCY_HALF_LIFE)
+        
+        scores.append(score)
+    
+    return scores
+
+
+def build_pruned_context(
+    meeting: dict,
+    agent_id: str,
+    user_message: str,
+    max_tokens: int = PRUNED_CONTEXT_MAX_TOKENS
+) -> tuple:
+    """
+    Context with only the highest-scoring messages for this agent that fit
+    in `max_tokens`, in conversation order. Returns (context, tokens).
+    """
+    messages = meeting["messages"][-MEETING_RECENT_MESSAGES:]
+    if not messages:
+        return "", 0
+    
+    participant = next((p for p in meeting["participants"] if p["id"] == agent_id), {})
+    scores = score_context_messages(
+        messages,
+        user_message,
+        agent_id,
+        participant.get("name", agent_id),
+        participant.get("department")
+    )
+    
+    # The last few messages always stay so the agent can follow the thread
+    for i in range(max(0, len(messages) - PRUNE_KEEP_RECENT), len(messages)):
+        scores[i] = math.inf
+    
+    selected = []
+    total_tokens = 0
+    for i in sorted(range(len(messages)), key=scores.__getitem__, reverse=True):
+        if total_tokens + messages[i]["tokens"] > max_tokens:
+            continue
+        selected.append(i)
+        total_tokens += messages[i]["tokens"]
+    
+    selected.sort()
+    return "".join(render_context_message(messages[i]) for i in selected), total_tokens
+
+
+_RANK_GENERIC_TERMS = frozenset(["chief", "officer", "director", "manager", "lead", "head", "agent", "specialist"])
+
+
+def _stem(word: str) -> str:
+    for suffix in ("ing", "ed", "s"):
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            return word[:-len(suffix)]
+    return word
+
+
+def ranking_terms(text: str) -> frozenset:
+    """Stemmed content words used to match messages against agent capabilities"""
+    return frozenset(_stem(term) for term in message_terms(text)) - _RANK_GENERIC_TERMS
+
+
+class SpeakerIndex:
+    """
+    Precomputed capability vectors for one participant list, stored as an
+    inverted index (term -> [(participant index, weight)]) so scoring a
+    message touches only the terms it contains. Vectors are L2-normalized
+    and messages are binary, so scores are cosine similarities in [0, 1].
+    """
+    
+    def __init__(self, participants: List[dict], registry=None):
+        self.size = len(participants)
+        self.postings: Dict[str, List[tuple]] = {}
+        
+        for i, participant in enumerate(participants):
+            record = registry.get(participant["id"]) if registry is not None and registry.is_loaded else None
+            weights: Dict[str, float] = {}
+            
+            def add(text: str, weight: float):
+                for term in ranking_terms(text):
+                    weights[term] = max(weights.get(term, 0.0), weight)
+            
+            for keyword in (record.keywords if record else ()):
+                add(keyword, RANK_WEIGHTS["keyword"])
+            add(((record.department if record else participant.get("department")) or "").replace("_", " "),
+                RANK_WEIGHTS["department"])
+            add(participant.get("name", ""), RANK_WEIGHTS["name"])
+            
+            norm = math.sqrt(sum(w * w for w in weights.values())) or 1.0
+            for term, weight in weights.items():
+                self.postings.setdefault(term, []).append((i, weight / norm))
+    
+    def score(self, terms: frozenset) -> List[float]:
+        scores = [0.0] * self.size
+        if not terms:
+            return scores
+        for term in terms:
+            for i, weight in self.postings.get(term, ()):
+                scores[i] += weight
+        norm = math.sqrt(len(terms))
+        return [score / norm for score in scores]
+
+
+def get_speaker_index(participants: List[dict]) -> SpeakerIndex:
+    """Speaker index for a participant list, rebuilt when the list or the agent registry changes"""
+    from roady_agent_registry import agent_registry
+    
+    key = (agent_registry.version, tuple((p["id"], p.get("name"), p.get("department")) for p in participants))
+    index = _speaker_indexes.get(key)
+    if index is None:
+        if len(_speaker_indexes) >= 256:
+            _speaker_indexes.clear()
+        index = _speaker_indexes[key] = SpeakerIndex(participants, agent_registry)
+    return index
+
+
+async def determine_relevant_agents(
+    message: str,
+    participants: List[dict],
+    recent_messages: Optional[List[dict]] = None,
+    top_k: int = RANK_TOP_K,
+    min_score: float = RANK_MIN_SCORE
+) -> List[dict]:
+    """
+    Pick which agents should respond: @mentions first, otherwise the top-k
+    participants by capability match (plus a bonus for agents active in
+    the recent conversation) that clear the score thresholds.
+    """
     
-    # Simple heuristic for now - can be enhanced with LLM
     relevant = []
     
     # Check for @mentions
@@ -661,13 +1791,42 @@ async def determine_relevant_agents(message: str, participants: List[dict]) -> L
         if f"@{agent['name'].lower().replace(' ', '_')}" in message.lower():
             relevant.append(agent)
     
-    # If no mentions, let 1-2 most relevant agents respond
-    if not relevant:
-        # Use LLM or heuristics to determine relevance
-        # For now, just return first 2
-        relevant = participants[:2]
+    if relevant or not participants:
+        return relevant
+    
+    scores = get_speaker_index(participants).score(ranking_terms(message))
+    
+    recent_speakers = {m.get("sender_id") for m in (recent_messages or [])[-RANK_RECENT_WINDOW:]}
+    for i, participant in enumerate(participants):
+        if participant["id"] in recent_speakers:
+            scores[i] += RANK_RECENT_SPEAKER_BONUS
     
-    return relevant
+    order = sorted(range(len(participants)), key=lambda i: (-scores[i], i))
+    best = scores[order[0]]
+    
+    # Nobody clearly relevant: one voice (the most engaged agent), not a chorus
+    if best < min_score:
+        return [participants[order[0]]]
+    
+    cutoff = max(min_score, best * RANK_RELATIVE_CUTOFF)
+    return [participants[i] for i in order[:top_k] if scores[i] >= cutoff]
+
+
+def build_meeting_snapshot(meeting_id: str, recent_messages: int = 20) -> Optional[dict]:
+    """Meeting state sent to clients that fell behind the live event stream"""
+    meeting = get_meeting_from_db(meeting_id)
+    if not meeting:
+        return None
+    
+    return {
+        "id": meeting["id"],
+        "status": meeting["status"],
+        "mode": meeting["mode"],
+        "participants": meeting["participants"],
+        "messages": meeting["messages"][-recent_messages:],
+        "tokensUsed": meeting["tokens_used"],
+        "costSoFar": meeting["cost_so_far"]
+    }
 
 
 def calculate_cost_from_tokens(tokens: int) -> float:
@@ -677,70 +1836,49 @@ def calculate_cost_from_tokens(tokens: int) -> float:
     return (tokens / 1_000_000) * avg_price_per_1m
 
 
-async def generate_meeting_summary(meeting: dict) -> str:
-    """Generate AI summary of the meeting"""
-    
-    # Format all messages
-    transcript = format_messages_for_summary(meeting["messages"])
+async def generate_meeting_wrapup(sections: List[dict], tail: List[dict]) -> tuple:
+    """Final summary and action items from the running summary plus the recent tail"""
     
     prompt = f"""
-    Generate a comprehensive summary of this meeting:
+    Write the final summary of this meeting and extract its action items.
     
-    {transcript}
+    Summary of the meeting so far:
+    {format_summary_sections(sections) or "(none)"}
     
-    Include:
-    1. Meeting overview
-    2. Key topics discussed
-    3. Decisions made
-    4. Action items identified
-    5. Next steps
+    Most recent conversation:
+    {format_messages_for_summary(tail) or "(none)"}
     
-    Format as a professional meeting summary.
+    Return JSON:
+    {{
+        "summary": "professional meeting summary: overview, key topics, decisions, next steps",
+        "action_items": [
+            {{"description": "...", "assigned_to": "agent or person", "priority": "low|medium|high", "due_date": null}}
+        ]
+    }}
     """
     
-    from llm_router import LLMRouter
-    router = LLMRouter(database_session=None)
-    response = router.execute_with_fallback(
+    response = await run_llm(
         agent_id="core_orchestrator",
         prompt=prompt,
         task_id="meeting_summary"
     )
     
-    return response.content
+    try:
+        result = json.loads(response.content)
+        return result.get("summary", ""), result.get("action_items", [])
+    except (json.JSONDecodeError, AttributeError):
+        return response.content, []
 
 
-async def extract_action_items(meeting: dict) -> List[dict]:
-    """Extract action items from meeting"""
-    
-    transcript = format_messages_for_summary(meeting["messages"])
-    
-    prompt = f"""
-    Extract all action items from this meeting transcript:
-    
-    {transcript}
-    
-    For each action item, provide:
-    - Description
-    - Assigned to (agent or person)
-    - Priority
-    - Due date (if mentioned)
-    
-    Return as JSON list.
-    """
-    
-    from llm_router import LLMRouter
-    router = LLMRouter(database_session=None)
-    response = router.execute_with_fallback(
-        agent_id="core_orchestrator",
-        prompt=prompt,
-        task_id="extract_actions"
-    )
-    
-    try:
-        import json
-        return json.loads(response.content)
-    except:
-        return []
+def load_transcript(meeting_id: str, after_seq: int = 0, page_size: int = 500) -> List[dict]:
+    """Live transcript after `after_seq`, read page by page from the message log"""
+    messages = []
+    while True:
+        page = get_meeting_messages(meeting_id, after_seq=after_seq, limit=page_size)
+        messages.extend(page)
+        if len(page) < page_size:
+            return messages
+        after_seq = page[-1]["seq"]
 
 
 def format_messages_for_summary(messages: List[dict]) -> str:
@@ -751,17 +1889,103 @@ def format_messages_for_summary(messages: List[dict]) -> str:
     return formatted
 
 
+def format_summary_sections(sections: List[dict]) -> str:
+    """Running summary sections, oldest first"""
+    return "\n\n".join(section["text"] for section in sections)
+
+
 # Placeholder functions - implement with your database
 def get_agent(agent_id: str):
     """Get agent from database"""
     pass
 
-def get_meeting_from_db(meeting_id: str):
-    """Get meeting from database"""
+def get_meeting_from_db(meeting_id: str, recent_messages: int = MEETING_RECENT_MESSAGES):
+    """
+    Get meeting header (settings flattened into the dict) plus its most
+    recent messages (MeetingRepository.get_by_id + get_messages)
+    """
     pass
 
-def save_meeting(meeting: dict):
-    """Save meeting to database"""
+def create_meeting_record(meeting: dict):
+    """Insert the meeting header row (MeetingRepository.create)"""
+    pass
+
+def append_meeting_message(
+    meeting_id: str,
+    message: dict,
+    tokens: int = 0,
+    cost: float = 0.0,
+    release_tokens: int = 0,
+    release_cost: float = 0.0
+) -> dict:
+    """
+    Append a message to the log, bump the counters and release the call's
+    budget reservation atomically (MeetingRepository.append_message).
+    Returns {seq, tokens_used, cost_so_far}.
+    """
+    pass
+
+def reserve_meeting_budget(meeting_id: str, tokens: int, cost: float) -> bool:
+    """Conditionally reserve budget within the meeting limits (MeetingRepository.reserve_budget)"""
+    pass
+
+def release_meeting_budget(meeting_id: str, tokens: int, cost: float):
+    """Release a reservation whose call failed (MeetingRepository.release_budget)"""
+    pass
+
+def record_meeting_usage(
+    meeting_id: str,
+    tokens: int,
+    cost: float,
+    release_tokens: int = 0,
+    release_cost: float = 0.0
+) -> dict:
+    """
+    Add a message-less call's usage to the counters and release its
+    reservation atomically (MeetingRepository.record_usage).
+    Returns {tokens_used, cost_so_far}.
+    """
+    pass
+
+def get_meeting_messages(
+    meeting_id: str,
+    before_seq: Optional[int] = None,
+    limit: int = 50,
+    after_seq: Optional[int] = None
+) -> List[dict]:
+    """Page of live messages before `before_seq` / after `after_seq`, oldest first (MeetingRepository.get_messages)"""
+    pass
+
+def get_meeting_archive_index(meeting_id: str) -> Optional[dict]:
+    """Chunk index of an archived transcript, None while hot (MeetingRepository.get_archive_index)"""
+    pass
+
+def save_running_summary(meeting_id: str, sections: List[dict], through_seq: int, expected_through_seq: int) -> bool:
+    """Compare-and-set the running summary (MeetingRepository.save_running_summary)"""
+    pass
+
+def supersede_meeting_messages(meeting_id: str, seqs: List[int]):
+    """Mark messages folded into a summary (MeetingRepository.supersede_messages)"""
+    pass
+
+def advance_speaker_index(meeting_id: str, participant_count: int) -> int:
+    """Atomically advance the round-robin pointer (MeetingRepository.advance_speaker)"""
+    pass
+
+def add_meeting_participant(meeting_id: str, participant: dict, max_participants: int = 8) -> bool:
+    """Atomically add a participant (MeetingRepository.add_participant)"""
+    pass
+
+def remove_meeting_participant(meeting_id: str, agent_id: str):
+    """Atomically remove a participant (MeetingRepository.remove_participant)"""
+    pass
+
+def update_meeting_settings(meeting_id: str, settings: dict):
+    """Merge optimization flags into the header (MeetingRepository.update_settings)"""
+    pass
+
+def update_meeting_header(meeting_id: str, **fields):
+    """Update header fields such as status or summary (MeetingRepository.update_header)"""
     pass
 
 def update_meeting_status(meeting_id: str, status: str):
@@ -776,7 +2000,16 @@ def is_l1_agent(agent_id: str) -> bool:
     """Check if agent is L1 director"""
     pass
 
+def get_plan_tier(user_id: str):
+    """Get the owner's subscription PlanTier"""
+    pass
+
+def get_remaining_budget(user_id: str) -> Optional[float]:
+    """Get the owner's remaining monthly budget (None = unlimited)"""
+    pass
+
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # permessage-deflate compresses both legacy and compact frames
+    uvicorn.run(app, host="0.0.0.0", port=8000, ws="websockets", ws_per_message_deflate=True)
@@ -0,0 +1,232 @@
+"""
+ROADY Meeting Event Bus - Cross-Worker Fan-Out for Meeting Broadcasts
+Redis Streams backend for production, in-process backend for tests and single-worker dev
+"""
+
+from typing import Callable, Dict, List, Optional, Set, Tuple
+from collections import deque
+import asyncio
+import json
+
+# Callback into the local ConnectionManager: (meeting_id, seq, frame)
+DeliverFn = Callable[[str, int, str], None]
+
+
+def frame_with_seq(payload: str, seq: int) -> str:
+    """Splice the sequence number into a serialized JSON object without re-parsing it"""
+    return f'{payload[:-1]},"seq":{seq}}}' if payload != "{}" else f'{{"seq":{seq}}}'
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# BASE
+# ═══════════════════════════════════════════════════════════════════════════
+
+class MeetingEventBus:
+    """
+    Publish once, deliver on every worker.
+
+    `publish` assigns the event a per-meeting sequence number and hands it
+    to every worker subscribed to the meeting (the publishing worker
+    included). Each worker then fans the frame out to its own sockets only.
+    `replay` returns events after a sequence number so reconnecting clients
+    can resume; None means the gap is older than the retained history.
+    """
+
+    # Events kept per meeting for resume
+    HISTORY_SIZE = 1000
+
+    def __init__(self):
+        self._deliver: Optional[DeliverFn] = None
+
+    def bind(self, deliver: DeliverFn):
+        self._deliver = deliver
+
+    async def start(self):
+        pass
+
+    async def stop(self):
+        pass
+
+    async def publish(self, meeting_id: str, message: dict) -> int:
+        raise NotImplementedError
+
+    async def subscribe(self, meeting_id: str):
+        raise NotImplementedError
+
+    async def unsubscribe(self, meeting_id: str):
+        raise NotImplementedError
+
+    async def replay(self, meeting_id: str, after_seq: int) -> Optional[List[Tuple[int, str]]]:
+        raise NotImplementedError
+
+    def forget(self, meeting_id: str):
+        """Drop local state for an ended meeting"""
+        pass
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# IN-PROCESS BACKEND
+# ═══════════════════════════════════════════════════════════════════════════
+
+class InProcessEventBus(MeetingEventBus):
+    """Single-process bus (tests, dev with one uvicorn worker)"""
+
+    def __init__(self):
+        super().__init__()
+        self._seq: Dict[str, int] = {}
+        self._history: Dict[str, deque] = {}
+        self._subscribed: Set[str] = set()
+
+    async def publish(self, meeting_id: str, message: dict) -> int:
+        seq = self._seq.get(meeting_id, 0) + 1
+        self._seq[meeting_id] = seq
+
+        frame = frame_with_seq(json.dumps(message, default=str), seq)
+        history = self._history.get(meeting_id)
+        if history is None:
+            history = self._history[meeting_id] = deque(maxlen=self.HISTORY_SIZE)
+        history.append((seq, frame))
+
+        if meeting_id in self._subscribed and self._deliver:
+            self._deliver(meeting_id, seq, frame)
+        return seq
+
+    async def subscribe(self, meeting_id: str):
+        self._subscribed.add(meeting_id)
+
+    async def unsubscribe(self, meeting_id: str):
+        self._subscribed.discard(meeting_id)
+
+    async def replay(self, meeting_id: str, after_seq: int) -> Optional[List[Tuple[int, str]]]:
+        history = self._history.get(meeting_id)
+        if not history:
+            return [] if after_seq >= self._seq.get(meeting_id, 0) else None
+        if after_seq < history[0][0] - 1:
+            return None
+        return [(seq, frame) for seq, frame in history if seq > after_seq]
+
+    def forget(self, meeting_id: str):
+        """Drop history for an ended meeting"""
+        self._seq.pop(meeting_id, None)
+        self._history.pop(meeting_id, None)
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# REDIS STREAMS BACKEND
+# ═══════════════════════════════════════════════════════════════════════════
+
+class RedisStreamEventBus(MeetingEventBus):
+    """
+    One Redis stream per meeting. The stream entry ID is `<seq>-0`, so the
+    sequence number doubles as the resume cursor for XRANGE/XREAD.
+    """
+
+    # INCR the meeting sequence and append the frame atomically
+    PUBLISH_SCRIPT = """
+    local seq = redis.call('INCR', KEYS[1])
+    redis.call('EXPIRE', KEYS[1], ARGV[3])
+    redis.call('XADD', KEYS[2], 'MAXLEN', '~', ARGV[2], seq .. '-0', 'f', ARGV[1])
+    redis.call('EXPIRE', KEYS[2], ARGV[3])
+    return seq
+    """
+
+    # Meeting streams expire a day after their last event
+    STREAM_TTL_SECONDS = 86400
+    # How long one XREAD blocks before picking up new subscriptions
+    READ_BLOCK_MS = 250
+
+    def __init__(self, redis_url: str):
+        super().__init__()
+        from redis import asyncio as aioredis
+        self.redis = aioredis.from_url(redis_url, decode_responses=False)
+        self._publish = self.redis.register_script(self.PUBLISH_SCRIPT)
+        self._cursors: Dict[str, bytes] = {}
+        self._reader: Optional[asyncio.Task] = None
+
+    @staticmethod
+    def _seq_key(meeting_id: str) -> str:
+        return f"meeting:{meeting_id}:seq"
+
+    @staticmethod
+    def _stream_key(meeting_id: str) -> str:
+        return f"meeting:{meeting_id}:events"
+
+    async def start(self):
+        if self._reader is None:
+            self._reader = asyncio.create_task(self._read_loop())
+
+    async def stop(self):
+        if self._reader:
+            self._reader.cancel()
+            self._reader = None
+        await self.redis.close()
+
+    async def publish(self, meeting_id: str, message: dict) -> int:
+        payload = json.dumps(message, default=str)
+        return int(await self._publish(
+            keys=[self._seq_key(meeting_id), self._stream_key(meeting_id)],
+            args=[payload, self.HISTORY_SIZE, self.STREAM_TTL_SECONDS]
+        ))
+
+    async def subscribe(self, meeting_id: str):
+        if meeting_id in self._cursors:
+            return
+        # Start from the current head: earlier events come from replay()
+        current = await self.redis.get(self._seq_key(meeting_id))
+        self._cursors[meeting_id] = f"{int(current or 0)}-0".encode()
+
+    async def unsubscribe(self, meeting_id: str):
+        self._cursors.pop(meeting_id, None)
+
+    async def replay(self, meeting_id: str, after_seq: int) -> Optional[List[Tuple[int, str]]]:
+        entries = await self.redis.xrange(
+            self._stream_key(meeting_id), min=f"({after_seq}-0", max="+"
+        )
+        if entries and self._entry_seq(entries[0][0]) > after_seq + 1:
+            return None  # Trimmed past the client's position
+        if not entries:
+            current = int(await self.redis.get(self._seq_key(meeting_id)) or 0)
+            if current > after_seq:
+                return None
+        return [self._decode(entry_id, fields) for entry_id, fields in entries]
+
+    async def _read_loop(self):
+        while True:
+            if not self._cursors:
+                await asyncio.sleep(self.READ_BLOCK_MS / 1000)
+                continue
+
+            streams = {self._stream_key(m): cursor for m, cursor in self._cursors.items()}
+            try:
+                results = await self.redis.xread(streams, block=self.READ_BLOCK_MS)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"⚠️ Meeting event bus read failed: {e}")
+                await asyncio.sleep(1)
+                continue
+
+            for stream_key, entries in results or []:
+                meeting_id = stream_key.decode().split(":", 2)[1]
+                if meeting_id not in self._cursors:
+                    continue
+                for entry_id, fields in entries:
+                    self._cursors[meeting_id] = entry_id
+                    seq, frame = self._decode(entry_id, fields)
+                    if self._deliver:
+                        self._deliver(meeting_id, seq, frame)
+
+    @staticmethod
+    def _entry_seq(entry_id: bytes) -> int:
+        return int(entry_id.split(b"-", 1)[0])
+
+    def _decode(self, entry_id: bytes, fields: dict) -> Tuple[int, str]:
+        seq = self._entry_seq(entry_id)
+        return seq, frame_with_seq(fields[b"f"].decode(), seq)
+
+
+def create_event_bus(redis_url: Optional[str] = None) -> MeetingEventBus:
+    """Redis Streams bus when a URL is configured, in-process bus otherwise"""
+    if redis_url:
+        return RedisStreamEventBus(redis_url)
+    return InProcessEventBus()
@@ -0,0 +1,624 @@
+"""
+ROADY Meeting Rooms - WebSocket Load Test
+Local load generator for meeting sockets: stub LLM, in-memory store, comparable JSON reports
+
+Usage:
+    python ROADY_MEETING_LOAD_TEST.py run --clients 2000 --meetings 20 --rate 10 --duration 60 \\
+        --report reports/loadtest.json [--compare reports/previous.json]
+
+`run` starts the meeting backend in a subprocess (`serve`) on 127.0.0.1 with
+the LLM router replaced by a stub and the database placeholders by an
+in-memory store, so nothing leaves the machine. It then opens the
+WebSocket clients, posts user messages at the target rate and measures:
+
+- fan-out latency: POST sent -> user message received, per client
+- memory per connection: server RSS growth while the clients connect
+- dropped frames: `seq` gaps, snapshot resyncs and slow-consumer closes
+"""
+
+from typing import Dict, List, Optional
+from dataclasses import dataclass, asdict
+from datetime import datetime
+import argparse
+import asyncio
+import copy
+import itertools
+import json
+import os
+import subprocess
+import sys
+import time
+import uuid
+
+# ═══════════════════════════════════════════════════════════════════════════
+# STUB LLM (server side)
+# ═══════════════════════════════════════════════════════════════════════════
+
+@dataclass
+class StubLLMResponse:
+    content: str
+    model: str
+    input_tokens: int
+    output_tokens: int
+    total_tokens: int
+    cost_usd: float
+    latency_ms: int
+    was_fallback: bool = False
+
+
+class StubLLMRouter:
+    """
+    Stands in for LLMRouter: fixed latency, canned text, no network.
+    Called from the backend's LLM thread pool, so sleeping here is fine.
+    """
+
+    REPLY = "Noted. We'll follow up on schedule, budget and site safety before the next milestone."
+
+    def __init__(self, latency_ms: int = 800, chunks: int = 8):
+        self.latency_ms = latency_ms
+        self.chunks = max(1, chunks)
+
+    def _response(self, prompt: str) -> StubLLMResponse:
+        input_tokens = len(prompt) // 4
+        output_tokens = len(self.REPLY) // 4
+        return StubLLMResponse(
+            content=self.REPLY,
+            model="stub",
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+            total_tokens=input_tokens + output_tokens,
+            cost_usd=self.estimate_cost("", input_tokens, output_tokens),
+            latency_ms=self.latency_ms
+        )
+
+    def execute_with_fallback(self, agent_id: str, prompt: str, task_id: str, **kwargs) -> StubLLMResponse:
+        time.sleep(self.latency_ms / 1000)
+        return self._response(prompt)
+
+    def stream_with_fallback(self, agent_id: str, prompt: str, task_id: str, **kwargs):
+        words = self.REPLY.split(" ")
+        step = max(1, len(words) // self.chunks)
+        for start in range(0, len(words), step):
+            time.sleep(self.latency_ms / 1000 / self.chunks)
+            yield " ".join(words[start:start + step]) + " "
+        yield self._response(prompt)
+
+    def estimate_cost(self, agent_id: str, input_tokens: int, output_tokens: int, budget_mode: bool = False) -> float:
+        return (input_tokens * 3.0 + output_tokens * 15.0) / 1_000_000
+
+
+def stub_count_tokens(text: str) -> int:
+    """Stands in for the backend's tiktoken counter (which downloads its BPE file on first use)"""
+    return len(text) // 4
+
+
+@dataclass
+class StubAgent:
+    agent_id: str
+    agent_name: str
+    department: str
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# IN-MEMORY MEETING STORE (server side)
+# ═══════════════════════════════════════════════════════════════════════════
+
+class InMemoryMeetingStore:
+    """Implements the backend's database placeholders on plain dicts"""
+
+    def __init__(self):
+        self.headers: Dict[str, dict] = {}
+        self.logs: Dict[str, List[dict]] = {}
+
+    def install(self, backend):
+        backend.create_meeting_record = self.create
+        backend.get_meeting_from_db = self.get
+        backend.get_meetings_from_db = self.list
+        backend.append_meeting_message = self.append
+        backend.get_meeting_messages = self.page
+        backend.supersede_meeting_messages = self.supersede
+        backend.save_running_summary = self.save_running_summary
+        backend.reserve_meeting_budget = self.reserve
+        backend.release_meeting_budget = self.release
+        backend.advance_speaker_index = self.advance_speaker
+        backend.add_meeting_participant = self.add_participant
+        backend.remove_meeting_participant = self.remove_participant
+        backend.update_meeting_settings = lambda meeting_id, settings: self.headers[meeting_id].update(settings)
+        backend.update_meeting_header = lambda meeting_id, **fields: self.headers[meeting_id].update(fields)
+        backend.update_meeting_status = lambda meeting_id, status: self.headers[meeting_id].update(status=status)
+
+    def create(self, meeting: dict):
+        header = {key: value for key, value in meeting.items() if key != "messages"}
+        header.update(last_seq=0, current_speaker_index=-1, reserved_tokens=0, reserved_cost=0.0)
+        self.headers[meeting["id"]] = header
+        self.logs[meeting["id"]] = []
+
+    def get(self, meeting_id: str, recent_messages: int = 100) -> Optional[dict]:
+        header = self.headers.get(meeting_id)
+        if header is None:
+            return None
+        meeting = copy.deepcopy(header)
+        meeting["messages"] = self.page(meeting_id, limit=recent_messages)
+        return meeting
+
+    def list(self, status: Optional[str] = None, limit: int = 50) -> List[dict]:
+        headers = [h for h in self.headers.values() if status is None or h["status"] == status]
+        return copy.deepcopy(headers[:limit])
+
+    def append(self, meeting_id, message, tokens=0, cost=0.0, release_tokens=0, release_cost=0.0) -> dict:
+        header = self.headers[meeting_id]
+        header["last_seq"] += 1
+        header["tokens_used"] += tokens
+        header["cost_so_far"] += cost
+        header["reserved_tokens"] = max(0, header["reserved_tokens"] - release_tokens)
+        header["reserved_cost"] = max(0.0, header["reserved_cost"] - release_cost)
+        self.logs[meeting_id].append(dict(message, seq=header["last_seq"]))
+        return {"seq": header["last_seq"], "tokens_used": header["tokens_used"], "cost_so_far": header["cost_so_far"]}
+
+    def page(self, meeting_id, before_seq=None, limit=50, after_seq=None) -> List[dict]:
+        live = [
+            dict(m) for m in self.logs.get(meeting_id, [])
+            if not m.get("superseded") and (before_seq is None or m["seq"] < before_seq)
+        ]
+        if after_seq is not None:
+            return [m for m in live if m["seq"] > after_seq][:limit]
+        return live[-limit:]
+
+    def supersede(self, meeting_id: str, seqs: List[int]):
+        seqs = set(seqs)
+        for message in self.logs[meeting_id]:
+            if message["seq"] in seqs:
+                message["superseded"] = True
+
+    def save_running_summary(self, meeting_id, sections, through_seq, expected_through_seq) -> bool:
+        header = self.headers[meeting_id]
+        if header.get("summarized_through_seq", 0) != expected_through_seq:
+            return False
+        header.update(running_summary=sections, summarized_through_seq=through_seq)
+        return True
+
+    def reserve(self, meeting_id: str, tokens: int, cost: float) -> bool:
+        header = self.headers[meeting_id]
+        if (header["tokens_used"] + header["reserved_tokens"] + tokens > header["tokens_limit"]
+                or header["cost_so_far"] + header["reserved_cost"] + cost > header["cost_limit"]):
+            return False
+        header["reserved_tokens"] += tokens
+        header["reserved_cost"] += cost
+        return True
+
+    def release(self, meeting_id: str, tokens: int, cost: float):
+        header = self.headers[meeting_id]
+        header["reserved_tokens"] = max(0, header["reserved_tokens"] - tokens)
+        header["reserved_cost"] = max(0.0, header["reserved_cost"] - cost)
+
+    def advance_speaker(self, meeting_id: str, participant_count: int) -> int:
+        header = self.headers[meeting_id]
+        header["current_speaker_index"] = (header["current_speaker_index"] + 1) % max(participant_count, 1)
+        return header["current_speaker_index"]
+
+    def add_participant(self, meeting_id: str, participant: dict, max_participants: int = 8) -> bool:
+        participants = self.headers[meeting_id]["participants"]
+        if len(participants) >= max_participants or any(p["id"] == participant["id"] for p in participants):
+            return False
+        participants.append(participant)
+        return True
+
+    def remove_participant(self, meeting_id: str, agent_id: str):
+        header = self.headers[meeting_id]
+        header["participants"] = [p for p in header["participants"] if p["id"] != agent_id]
+
+
+def read_rss_bytes() -> Optional[int]:
+    """Resident set size of this process (Linux /proc), None elsewhere"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return None
+
+
+def serve(args):
+    """Run the meeting backend with the stub LLM and in-memory store"""
+    import uvicorn
+    import roady_meeting_api_backend as backend
+    from roady_billing import PlanTier
+
+    agents = {
+        f"agent-{i}": StubAgent(f"agent-{i}", f"Agent {i}", "operations")
+        for i in range(1, args.agents + 1)
+    }
+    backend._llm_router = StubLLMRouter(latency_ms=args.llm_latency_ms, chunks=args.llm_chunks)
+    backend.count_tokens = stub_count_tokens
+    backend.get_agent = agents.get
+    backend.get_plan_tier = lambda user_id: PlanTier.ENTERPRISE
+    backend.get_remaining_budget = lambda user_id: None
+    backend.is_l1_agent = lambda agent_id: False
+    InMemoryMeetingStore().install(backend)
+
+    @backend.app.get("/__loadtest/stats")
+    async def loadtest_stats():
+        return {
+            "rss_bytes": read_rss_bytes(),
+            "connections": sum(len(c) for c in backend.manager.active_connections.values()),
+            "manager": dict(backend.manager.stats),
+            "admission": backend.admission_controller.get_stats()
+        }
+
+    uvicorn.run(
+        backend.app,
+        host="127.0.0.1",
+        port=args.port,
+        ws="websockets",
+        ws_per_message_deflate=not args.no_deflate,
+        log_level="warning"
+    )
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# CLIENTS (driver side)
+# ═══════════════════════════════════════════════════════════════════════════
+
+@dataclass
+class FrameStats:
+    frames: int = 0
+    events: int = 0
+    dropped: int = 0  # events missing from the seq stream
+    snapshots: int = 0
+    slow_consumer_closes: int = 0
+    errors: int = 0
+
+
+class LoadTracker:
+    """Shared state between the message driver and the clients"""
+
+    def __init__(self):
+        self.sent_at: Dict[str, float] = {}
+        self.latencies_ms: List[float] = []
+        self.frames = FrameStats()
+        self.connected = 0
+        self.failed_connects = 0
+
+    def on_event(self, event: dict, received_at: float):
+        message = event.get("message") if event.get("type") == "new_message" else None
+        if message and message.get("sender_type") == "user":
+            sent = self.sent_at.get(message.get("content"))
+            if sent is not None:
+                self.latencies_ms.append((received_at - sent) * 1000)
+
+
+def decode_frame(frame, protocol: Optional[str]) -> List[dict]:
+    """Events in one frame, whatever the negotiated protocol"""
+    if protocol is None:
+        return [json.loads(frame)] if frame != "pong" else []
+    if isinstance(frame, bytes):
+        import msgpack
+        events, _counters = msgpack.unpackb(frame)
+    else:
+        events, _counters = json.loads(frame)
+    return events
+
+
+async def run_client(url: str, protocol: Optional[str], deflate: bool, tracker: LoadTracker, stop: asyncio.Event):
+    import websockets
+
+    stats = tracker.frames
+    try:
+        socket = await websockets.connect(
+            url,
+            subprotocols=[protocol] if protocol else None,
+            compression="deflate" if deflate else None,
+            max_size=None,
+            ping_interval=None,
+            open_timeout=30
+        )
+    except Exception:
+        tracker.failed_connects += 1
+        return
+
+    tracker.connected += 1
+    last_seq = None
+    try:
+        while not stop.is_set():
+            try:
+                frame = await asyncio.wait_for(socket.recv(), timeout=0.5)
+            except asyncio.TimeoutError:
+                continue
+            received_at = time.perf_counter()
+            stats.frames += 1
+            for event in decode_frame(frame, protocol):
+                stats.events += 1
+                if event.get("type") == "meeting_snapshot":
+                    stats.snapshots += 1
+                    last_seq = None
+                    continue
+                seq = event.get("seq")
+                if seq is not None:
+                    if last_seq is not None and seq > last_seq + 1:
+                        stats.dropped += seq - last_seq - 1
+                    last_seq = seq
+                tracker.on_event(event, received_at)
+    except websockets.ConnectionClosed as e:
+        if e.code == 1013:
+            stats.slow_consumer_closes += 1
+        elif not stop.is_set():
+            stats.errors += 1
+    except Exception:
+        stats.errors += 1
+    finally:
+        await socket.close()
+
+
+async def drive_messages(http, meeting_ids: List[str], rate: float, duration: float, tracker: LoadTracker) -> dict:
+    """POST user messages round-robin across meetings at `rate` per second"""
+    statuses: Dict[str, int] = {}
+    in_flight = set()
+
+    async def post(meeting_id: str):
+        content = f"load-test {uuid.uuid4().hex}"
+        tracker.sent_at[content] = time.perf_counter()
+        try:
+            response = await http.post(f"/api/meetings/{meeting_id}/messages", json={"content": content})
+            key = str(response.status_code)
+        except Exception:
+            key = "error"
+        statuses[key] = statuses.get(key, 0) + 1
+
+    interval = 1 / rate
+    started = time.perf_counter()
+    for n, meeting_id in enumerate(itertools.cycle(meeting_ids)):
+        due = started + n * interval
+        if due - started >= duration:
+            break
+        await asyncio.sleep(max(0.0, due - time.perf_counter()))
+        task = asyncio.create_task(post(meeting_id))
+        in_flight.add(task)
+        task.add_done_callback(in_flight.discard)
+
+    if in_flight:
+        await asyncio.gather(*in_flight)
+    return {"sent": sum(statuses.values()), "status_codes": statuses}
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# REPORT
+# ═══════════════════════════════════════════════════════════════════════════
+
+def percentile(ordered: List[float], q: float) -> Optional[float]:
+    """Nearest-rank percentile of an already sorted list"""
+    if not ordered:
+        return None
+    index = min(len(ordered) - 1, max(0, int(round(q * len(ordered))) - 1))
+    return round(ordered[index], 2)
+
+
+def latency_summary(samples: List[float]) -> dict:
+    ordered = sorted(samples)
+    return {
+        "count": len(ordered),
+        "mean": round(sum(ordered) / len(ordered), 2) if ordered else None,
+        "p50": percentile(ordered, 0.50),
+        "p90": percentile(ordered, 0.90),
+        "p99": percentile(ordered, 0.99),
+        "p999": percentile(ordered, 0.999),
+        "max": round(ordered[-1], 2) if ordered else None
+    }
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "describe", "--always", "--dirty"],
+            capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+# Metrics shown side by side with --compare (path into the report, lower is better)
+COMPARED_METRICS = [
+    ("fan-out p50 ms", ("fanout_latency_ms", "p50")),
+    ("fan-out p99 ms", ("fanout_latency_ms", "p99")),
+    ("fan-out max ms", ("fanout_latency_ms", "max")),
+    ("bytes/connection", ("memory", "bytes_per_connection")),
+    ("dropped frames", ("frames", "dropped")),
+    ("snapshot resyncs", ("frames", "snapshots")),
+    ("slow-consumer closes", ("frames", "slow_consumer_closes")),
+]
+
+
+def print_comparison(report: dict, previous: dict):
+    print(f"\n📊 {previous.get('revision') or 'previous'} → {report.get('revision') or 'current'}")
+    for label, (section, key) in COMPARED_METRICS:
+        before = (previous.get(section) or {}).get(key)
+        after = (report.get(section) or {}).get(key)
+        change = ""
+        if isinstance(before, (int, float)) and isinstance(after, (int, float)) and before:
+            change = f" ({(after - before) / before:+.1%})"
+        print(f"   {label:<22} {before!s:>12} → {after!s:<12}{change}")
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# RUNNER
+# ═══════════════════════════════════════════════════════════════════════════
+
+def raise_fd_limit(needed: int):
+    """Thousands of sockets need more than the usual 1024 descriptors"""
+    try:
+        import resource
+    except ImportError:
+        return
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    target = hard if hard == resource.RLIM_INFINITY else min(hard, max(soft, needed))
+    if target > soft:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (target, hard))
+
+
+async def wait_for_server(http, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if (await http.get("/__loadtest/stats")).status_code == 200:
+                return
+        except Exception:
+            pass
+        await asyncio.sleep(0.2)
+    raise RuntimeError("Meeting backend did not start")
+
+
+async def run_load_test(args) -> dict:
+    import httpx
+
+    base_url = f"http://127.0.0.1:{args.port}"
+    raise_fd_limit(args.clients * 2 + 256)
+
+    env = dict(os.environ)
+    if args.bus_url:
+        env["MEETING_EVENT_BUS_URL"] = args.bus_url
+    else:
+        env.pop("MEETING_EVENT_BUS_URL", None)
+    server = subprocess.Popen(
+        [sys.executable, os.path.abspath(__file__), "serve",
+         "--port", str(args.port),
+         "--agents", str(args.agents),
+         "--llm-latency-ms", str(args.llm_latency_ms),
+         "--llm-chunks", str(args.llm_chunks)]
+        + (["--no-deflate"] if args.no_deflate else []),
+        env=env
+    )
+
+    tracker = LoadTracker()
+    stop = asyncio.Event()
+    clients: List[asyncio.Task] = []
+    try:
+        async with httpx.AsyncClient(base_url=base_url, timeout=60) as http:
+            await wait_for_server(http)
+
+            agent_ids = [f"agent-{i}" for i in range(1, args.agents + 1)]
+            meeting_ids = []
+            for n in range(args.meetings):
+                created = await http.post("/api/meetings", json={
+                    "name": f"Load test {n}",
+                    "agent_ids": agent_ids,
+                    "mode": "round-robin",
+                    "tokens_limit": 10 ** 9,
+                    "cost_limit": 10.0 ** 6
+                })
+                meeting_ids.append(created.json()["meeting_id"])
+
+            baseline = (await http.get("/__loadtest/stats")).json()
+            print(f"🚀 Opening {args.clients} sockets across {args.meetings} meetings...")
+
+            ws_base = base_url.replace("http://", "ws://")
+            query = f"?batch_ms={args.batch_ms}" if args.protocol and args.batch_ms else ""
+            for n in range(args.clients):
+                url = f"{ws_base}/meetings/{meeting_ids[n % len(meeting_ids)]}/ws{query}"
+                clients.append(asyncio.create_task(
+                    run_client(url, args.protocol, not args.no_deflate, tracker, stop)
+                ))
+                if (n + 1) % args.ramp == 0:
+                    await asyncio.sleep(1)
+            while tracker.connected + tracker.failed_connects < args.clients:
+                await asyncio.sleep(0.1)
+            await asyncio.sleep(1)
+            connected = (await http.get("/__loadtest/stats")).json()
+            print(f"🔌 {tracker.connected} connected, {tracker.failed_connects} failed")
+
+            print(f"💬 Posting {args.rate}/s for {args.duration}s (stub LLM {args.llm_latency_ms} ms)...")
+            messages = await drive_messages(http, meeting_ids, args.rate, args.duration, tracker)
+            # Let in-flight agent turns and writers drain
+            await asyncio.sleep(args.drain)
+            final = (await http.get("/__loadtest/stats")).json()
+    finally:
+        stop.set()
+        if clients:
+            await asyncio.gather(*clients, return_exceptions=True)
+        server.terminate()
+        try:
+            server.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            server.kill()
+
+    grown = None
+    if baseline.get("rss_bytes") and connected.get("rss_bytes") and tracker.connected:
+        grown = connected["rss_bytes"] - baseline["rss_bytes"]
+
+    return {
+        "revision": git_revision(),
+        "timestamp": datetime.utcnow().isoformat(),
+        "config": {
+            key: value for key, value in vars(args).items()
+            if key not in ("command", "report", "compare")
+        },
+        "connections": {
+            "target": args.clients,
+            "connected": tracker.connected,
+            "failed": tracker.failed_connects
+        },
+        "memory": {
+            "rss_baseline_bytes": baseline.get("rss_bytes"),
+            "rss_connected_bytes": connected.get("rss_bytes"),
+            "rss_final_bytes": final.get("rss_bytes"),
+            "bytes_per_connection": round(grown / tracker.connected) if grown is not None else None
+        },
+        "messages": messages,
+        "fanout_latency_ms": latency_summary(tracker.latencies_ms),
+        "frames": asdict(tracker.frames),
+        "server": {"manager": final.get("manager"), "admission": final.get("admission")}
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="ROADY meeting WebSocket load test")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    for name in ("run", "serve"):
+        p = sub.add_parser(name)
+        p.add_argument("--port", type=int, default=8765)
+        p.add_argument("--agents", type=int, default=3, help="stub agents per meeting")
+        p.add_argument("--llm-latency-ms", type=int, default=800)
+        p.add_argument("--llm-chunks", type=int, default=8, help="streamed chunks per stub reply")
+        p.add_argument("--no-deflate", action="store_true", help="disable permessage-deflate")
+        if name == "run":
+            p.add_argument("--clients", type=int, default=1000)
+            p.add_argument("--meetings", type=int, default=10)
+            p.add_argument("--rate", type=float, default=5.0, help="user messages per second, all meetings")
+            p.add_argument("--duration", type=float, default=30.0, help="seconds of message traffic")
+            p.add_argument("--drain", type=float, default=5.0, help="seconds to wait for in-flight turns")
+            p.add_argument("--ramp", type=int, default=500, help="sockets opened per second")
+            p.add_argument("--protocol", default=None, help="roady.json.v2 / roady.msgpack.v2 (default legacy JSON)")
+            p.add_argument("--batch-ms", type=int, default=0)
+            p.add_argument("--bus-url", default=None, help="Redis URL to test the cross-worker bus")
+            p.add_argument("--report", default="meeting-loadtest.json")
+            p.add_argument("--compare", default=None, help="previous report to diff against")
+
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.command == "serve":
+        serve(args)
+        return
+
+    report = asyncio.run(run_load_test(args))
+
+    report_dir = os.path.dirname(os.path.abspath(args.report))
+    os.makedirs(report_dir, exist_ok=True)
+    with open(args.report, "w") as f:
+        json.dump(report, f, indent=2)
+
+    latency = report["fanout_latency_ms"]
+    print(f"\n✅ Report written to {args.report}")
+    print(f"   fan-out latency p50/p90/p99/max: {latency['p50']} / {latency['p90']} / {latency['p99']} / {latency['max']} ms")
+    print(f"   memory per connection: {report['memory']['bytes_per_connection']} bytes")
+    print(f"   dropped frames: {report['frames']['dropped']}, snapshots: {report['frames']['snapshots']}, "
+          f"slow-consumer closes: {report['frames']['slow_consumer_closes']}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            print_comparison(report, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
@@ -88,6 +88,13 @@ export const MeetingRoom: React.FC<{ meetingId: string }> = ({ meetingId }) => {
           ...prev,
           participants: prev.participants.filter(a => a.id !== data.agentId)
         } : null);
+      } else if (data.type === 'usage_updated') {
+        // Running summary calls: counters move without a new message
+        setMeeting(prev => prev ? {
+          ...prev,
+          tokensUsed: data.tokensUsed,
+          costSoFar: data.costSoFar
+        } : null);
       }
     };
 
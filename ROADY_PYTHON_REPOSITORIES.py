@@ -5,11 +5,12 @@ Clean architecture pattern with repository classes for each model
 
 from typing import List, Optional, Dict, Any
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_, or_, desc
+from sqlalchemy import func, and_, or_, desc, update, text
 from datetime import datetime, timedelta
+import json
 from roady_models import (
     User, Agent, Task, AgentUsageLog, LLMProvider, LLMModel,
-    AgentIntegration, Workflow, BudgetAlert
+    AgentIntegration, Workflow, BudgetAlert, Meeting, MeetingMessage
 )
 
 
@@ -111,6 +112,12 @@ class AgentRepository:
         """Get all active agents"""
         return self.session.query(Agent).filter(Agent.is_active == True).all()
     
+    def get_updated_since(self, watermark: datetime) -> List[Agent]:
+        """Get agents (active or not) updated at or after the watermark"""
+        return self.session.query(Agent).filter(
+            Agent.updated_at >= watermark
+        ).order_by(Agent.updated_at).all()
+    
     def get_by_department(self, department: str) -> List[Agent]:
         """Get agents by department"""
         return self.session.query(Agent).filter(Agent.department == department).all()
@@ -527,6 +534,288 @@ class BudgetAlertRepository:
         return created_alerts
 
 
+# ═══════════════════════════════════════════════════════════════════════════
+# MEETING REPOSITORY
+# ═══════════════════════════════════════════════════════════════════════════
+
+class MeetingRepository:
+    """
+    Repository for meetings: a small mutable header row plus an
+    append-only message log. Every write touches the header and at most
+    one message row, and counters are updated in SQL so concurrent posts
+    never overwrite each other.
+    """
+    
+    def __init__(self, session: Session):
+        self.session = session
+    
+    def create(self, meeting_data: Dict[str, Any]) -> Meeting:
+        """Create a new meeting header"""
+        meeting = Meeting(**meeting_data)
+        self.session.add(meeting)
+        self.session.commit()
+        self.session.refresh(meeting)
+        return meeting
+    
+    def get_by_id(self, meeting_id: str) -> Optional[Meeting]:
+        """Get meeting header (messages are loaded separately, by page)"""
+        return self.session.query(Meeting).filter(Meeting.meeting_id == meeting_id).first()
+    
+    def get_all(self, status: Optional[str] = None, limit: int = 50) -> List[Meeting]:
+        """Get most recent meetings, optionally filtered by status"""
+        query = self.session.query(Meeting)
+        if status:
+            query = query.filter(Meeting.status == status)
+        return query.order_by(desc(Meeting.started_at)).limit(limit).all()
+    
+    def append_message(
+        self,
+        meeting_id: str,
+        message_data: Dict[str, Any],
+        tokens: int = 0,
+        cost: float = 0.0,
+        release_tokens: int = 0,
+        release_cost: float = 0.0
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Append a message and bump the meeting counters in one transaction.
+        The header UPDATE takes the row lock, so concurrent appends get
+        consecutive seq numbers and no counter increment is lost. The
+        call's budget reservation (if any) is released in the same UPDATE.
+        """
+        header = self.session.execute(
+            update(Meeting)
+            .where(Meeting.meeting_id == meeting_id)
+            .values(
+                last_seq=Meeting.last_seq + 1,
+                tokens_used=Meeting.tokens_used + int(tokens),
+                cost_so_far=Meeting.cost_so_far + cost,
+                reserved_tokens=func.greatest(Meeting.reserved_tokens - int(release_tokens), 0),
+                reserved_cost=func.greatest(Meeting.reserved_cost - release_cost, 0)
+            )
+            .returning(Meeting.last_seq, Meeting.tokens_used, Meeting.cost_so_far)
+        ).first()
+        if header is None:
+            self.session.rollback()
+            return None
+        
+        self.session.add(MeetingMessage(meeting_id=meeting_id, seq=header.last_seq, **message_data))
+        self.session.commit()
+        
+        return {
+            "seq": header.last_seq,
+            "tokens_used": header.tokens_used,
+            "cost_so_far": float(header.cost_so_far)
+        }
+    
+    def reserve_budget(self, meeting_id: str, tokens: int, cost: float) -> bool:
+        """
+        Reserve a call's estimated tokens and cost, only if used + reserved
+        + estimate stays within the meeting limits
+        """
+        updated = self.session.query(Meeting).filter(
+            Meeting.meeting_id == meeting_id,
+            Meeting.tokens_used + Meeting.reserved_tokens + int(tokens) <= Meeting.tokens_limit,
+            Meeting.cost_so_far + Meeting.reserved_cost + cost <= Meeting.cost_limit
+        ).update({
+            "reserved_tokens": Meeting.reserved_tokens + int(tokens),
+            "reserved_cost": Meeting.reserved_cost + cost
+        }, synchronize_session=False)
+        self.session.commit()
+        return updated == 1
+    
+    def record_usage(
+        self,
+        meeting_id: str,
+        tokens: int,
+        cost: float,
+        release_tokens: int = 0,
+        release_cost: float = 0.0
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Bump the meeting counters for a call that produced no message (e.g. a
+        running summary) and release its reservation, in one UPDATE
+        """
+        header = self.session.execute(
+            update(Meeting)
+            .where(Meeting.meeting_id == meeting_id)
+            .values(
+                tokens_used=Meeting.tokens_used + int(tokens),
+                cost_so_far=Meeting.cost_so_far + cost,
+                reserved_tokens=func.greatest(Meeting.reserved_tokens - int(release_tokens), 0),
+                reserved_cost=func.greatest(Meeting.reserved_cost - release_cost, 0)
+            )
+            .returning(Meeting.tokens_used, Meeting.cost_so_far)
+        ).first()
+        self.session.commit()
+        if header is None:
+            return None
+        return {"tokens_used": header.tokens_used, "cost_so_far": float(header.cost_so_far)}
+    
+    def release_budget(self, meeting_id: str, tokens: int, cost: float) -> None:
+        """Give back a reservation whose call failed"""
+        self.session.query(Meeting).filter(Meeting.meeting_id == meeting_id).update({
+            "reserved_tokens": func.greatest(Meeting.reserved_tokens - int(tokens), 0),
+            "reserved_cost": func.greatest(Meeting.reserved_cost - cost, 0)
+        }, synchronize_session=False)
+        self.session.commit()
+    
+    def get_messages(
+        self,
+        meeting_id: str,
+        before_seq: Optional[int] = None,
+        limit: int = 50,
+        include_superseded: bool = False,
+        after_seq: Optional[int] = None
+    ) -> List[MeetingMessage]:
+        """
+        Page of messages, oldest first: the newest page before `before_seq`
+        by default, or the oldest page after `after_seq` when it is given
+        """
+        query = self.session.query(MeetingMessage).filter(MeetingMessage.meeting_id == meeting_id)
+        if before_seq is not None:
+            query = query.filter(MeetingMessage.seq < before_seq)
+        if not include_superseded:
+            query = query.filter(MeetingMessage.superseded == False)
+        
+        if after_seq is not None:
+            return query.filter(MeetingMessage.seq > after_seq).order_by(MeetingMessage.seq).limit(limit).all()
+        
+        page = query.order_by(desc(MeetingMessage.seq)).limit(limit).all()
+        page.reverse()
+        return page
+    
+    def save_running_summary(
+        self,
+        meeting_id: str,
+        sections: List[Dict[str, Any]],
+        through_seq: int,
+        expected_through_seq: int
+    ) -> bool:
+        """
+        Store the rolling summary if nobody advanced it meanwhile
+        (compare-and-set on summarized_through_seq)
+        """
+        updated = self.session.query(Meeting).filter(
+            Meeting.meeting_id == meeting_id,
+            Meeting.summarized_through_seq == expected_through_seq
+        ).update(
+            {"running_summary": sections, "summarized_through_seq": through_seq},
+            synchronize_session=False
+        )
+        self.session.commit()
+        return updated == 1
+    
+    def supersede_messages(self, meeting_id: str, seqs: List[int]) -> int:
+        """Mark messages folded into a history summary"""
+        updated = self.session.query(MeetingMessage).filter(
+            MeetingMessage.meeting_id == meeting_id,
+            MeetingMessage.seq.in_(seqs)
+        ).update({"superseded": True}, synchronize_session=False)
+        self.session.commit()
+        return updated
+    
+    def advance_speaker(self, meeting_id: str, participant_count: int) -> Optional[int]:
+        """Atomically move the round-robin pointer to the next participant"""
+        row = self.session.execute(
+            update(Meeting)
+            .where(Meeting.meeting_id == meeting_id)
+            .values(current_speaker_index=(Meeting.current_speaker_index + 1) % max(participant_count, 1))
+            .returning(Meeting.current_speaker_index)
+        ).first()
+        self.session.commit()
+        return row.current_speaker_index if row else None
+    
+    def add_participant(self, meeting_id: str, participant: Dict[str, Any], max_participants: int = 8) -> bool:
+        """Append a participant unless the meeting is full or they're already in it"""
+        result = self.session.execute(
+            text("""
+                UPDATE meetings
+                SET participants = participants || CAST(:participant AS jsonb)
+                WHERE meeting_id = :meeting_id
+                  AND jsonb_array_length(participants) < :max_participants
+                  AND NOT participants @> CAST(:match AS jsonb)
+            """),
+            {
+                "meeting_id": meeting_id,
+                "participant": json.dumps([participant]),
+                "match": json.dumps([{"id": participant["id"]}]),
+                "max_participants": max_participants
+            }
+        )
+        self.session.commit()
+        return result.rowcount == 1
+    
+    def remove_participant(self, meeting_id: str, agent_id: str) -> bool:
+        """Remove a participant by agent ID"""
+        result = self.session.execute(
+            text("""
+                UPDATE meetings
+                SET participants = COALESCE(
+                    (SELECT jsonb_agg(p) FROM jsonb_array_elements(participants) p
+                     WHERE p->>'id' <> :agent_id),
+                    '[]'::jsonb
+                )
+                WHERE meeting_id = :meeting_id
+            """),
+            {"meeting_id": meeting_id, "agent_id": agent_id}
+        )
+        self.session.commit()
+        return result.rowcount == 1
+    
+    def update_settings(self, meeting_id: str, settings: Dict[str, Any]) -> None:
+        """Merge optimization flags into the settings document"""
+        self.session.execute(
+            text("UPDATE meetings SET settings = settings || CAST(:settings AS jsonb) WHERE meeting_id = :meeting_id"),
+            {"meeting_id": meeting_id, "settings": json.dumps(settings)}
+        )
+        self.session.commit()
+    
+    def update_header(self, meeting_id: str, updates: Dict[str, Any]) -> bool:
+        """Update header fields (status, summary, ended_at, ...) without touching messages"""
+        updated = self.session.query(Meeting).filter(
+            Meeting.meeting_id == meeting_id
+        ).update(updates, synchronize_session=False)
+        self.session.commit()
+        return updated == 1
+    
+    def get_archive_candidates(self, ended_before: datetime, limit: int = 50) -> List[Meeting]:
+        """Ended meetings whose transcript is still in meeting_messages, oldest first"""
+        return self.session.query(Meeting).filter(
+            Meeting.status == 'ended',
+            Meeting.archived_at.is_(None),
+            Meeting.ended_at < ended_before
+        ).order_by(Meeting.ended_at).limit(limit).all()
+    
+    def mark_archived(self, meeting_id: str, archive_index: Dict[str, Any]) -> bool:
+        """
+        Record the archive index and delete the hot message rows in one
+        transaction; only the first archiver of a meeting wins
+        """
+        updated = self.session.query(Meeting).filter(
+            Meeting.meeting_id == meeting_id,
+            Meeting.archived_at.is_(None)
+        ).update({
+            "archive_index": archive_index,
+            "archived_at": datetime.utcnow(),
+            "running_summary": []
+        }, synchronize_session=False)
+        if updated != 1:
+            self.session.rollback()
+            return False
+        
+        self.session.query(MeetingMessage).filter(
+            MeetingMessage.meeting_id == meeting_id
+        ).delete(synchronize_session=False)
+        self.session.commit()
+        return True
+    
+    def get_archive_index(self, meeting_id: str) -> Optional[Dict[str, Any]]:
+        """Chunk index of an archived transcript (None while it is still hot)"""
+        row = self.session.query(Meeting.archive_index).filter(Meeting.meeting_id == meeting_id).first()
+        return row.archive_index if row else None
+
+
 # ═══════════════════════════════════════════════════════════════════════════
 # EXAMPLE USAGE
 # ═══════════════════════════════════════════════════════════════════════════
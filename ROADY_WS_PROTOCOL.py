@@ -0,0 +1,196 @@
+"""
+ROADY WebSocket Wire Protocol - Negotiated Compact Framing
+msgpack or compact JSON frames, epoch-ms timestamps, delta-encoded counters, micro-batching
+"""
+
+from typing import Any, Dict, List, Optional, Tuple, Union
+from datetime import datetime, timezone
+import json
+
+try:
+    import msgpack
+except ImportError:  # compact JSON is still offered
+    msgpack = None
+
+# ═══════════════════════════════════════════════════════════════════════════
+# NEGOTIATION
+# ═══════════════════════════════════════════════════════════════════════════
+#
+# Clients opt in through the WebSocket subprotocol header, e.g.
+#   new WebSocket(url, ["roady.msgpack.v2", "roady.json.v2"])
+# Clients that offer neither keep the legacy one-JSON-object-per-frame format.
+#
+# Every compact frame is a two-element array:
+#   [events, counters]
+# `events` is a list of one or more events (several when batched) and
+# `counters` is null or [tokensDelta, costDelta] to add to the client's
+# running `tokensUsed` / `costSoFar` once the events are applied. A
+# `meeting_snapshot` event keeps absolute counters and resets the baseline.
+# ISO timestamps are sent as integer milliseconds since the epoch.
+#
+# Compression is permessage-deflate, negotiated by the server (uvicorn
+# with `ws_per_message_deflate=True`, the default for the websockets
+# implementation) and applied on top of either encoding.
+
+PROTOCOL_MSGPACK = "roady.msgpack.v2"
+PROTOCOL_JSON = "roady.json.v2"
+
+# Server preference when a client offers several
+SUPPORTED_PROTOCOLS = [PROTOCOL_MSGPACK, PROTOCOL_JSON] if msgpack else [PROTOCOL_JSON]
+
+# Top-level fields moved out of events and sent as per-connection deltas
+COUNTER_FIELDS = ("tokensUsed", "costSoFar")
+# Fields rewritten from ISO strings to epoch milliseconds
+TIMESTAMP_FIELDS = frozenset({"timestamp", "created_at", "updated_at", "started_at", "ended_at"})
+# Events carrying absolute counters that reset the client's baseline
+KEYFRAME_EVENTS = frozenset({"meeting_snapshot"})
+
+# Upper bound for the client-requested batching window
+MAX_BATCH_WINDOW_MS = 50
+# Events coalesced into one frame at most
+MAX_BATCH_EVENTS = 64
+
+# Decimal places kept on cost deltas
+COST_DELTA_DECIMALS = 6
+
+
+def negotiate_protocol(websocket) -> Optional[str]:
+    """Pick the compact protocol the client offered, or None for legacy JSON"""
+    offered = websocket.scope.get("subprotocols") or []
+    for protocol in SUPPORTED_PROTOCOLS:
+        if protocol in offered:
+            return protocol
+    return None
+
+
+def batch_window_seconds(batch_ms: Optional[int]) -> float:
+    """Clamp a client-requested batching window (ms) to seconds"""
+    if not batch_ms or batch_ms <= 0:
+        return 0.0
+    return min(batch_ms, MAX_BATCH_WINDOW_MS) / 1000
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# EVENTS
+# ═══════════════════════════════════════════════════════════════════════════
+
+def epoch_ms(value: str) -> Union[int, str]:
+    """ISO-8601 timestamp to epoch milliseconds (naive = UTC); unparseable values pass through"""
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        return value
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return int(parsed.timestamp() * 1000)
+
+
+def compact_value(value: Any) -> Any:
+    """Rewrite timestamp fields in nested dicts and lists"""
+    if isinstance(value, dict):
+        return {
+            key: epoch_ms(item) if key in TIMESTAMP_FIELDS and isinstance(item, str) else compact_value(item)
+            for key, item in value.items()
+        }
+    if isinstance(value, list):
+        return [compact_value(item) for item in value]
+    return value
+
+
+class CompactEvent:
+    """
+    One event in compact form, shared by every compact client of a worker.
+
+    The body is encoded at most once per protocol; connections only splice
+    the cached bytes into their own frames.
+    """
+
+    __slots__ = ("body", "counters", "keyframe", "_encoded")
+
+    def __init__(self, body: dict, counters: Optional[Tuple[int, float]], keyframe: bool):
+        self.body = body
+        self.counters = counters
+        self.keyframe = keyframe
+        self._encoded: Dict[str, Union[str, bytes]] = {}
+
+    @classmethod
+    def from_message(cls, message: dict) -> "CompactEvent":
+        body = compact_value(message)
+        keyframe = body.get("type") in KEYFRAME_EVENTS
+        counters = None
+
+        if keyframe:
+            # Snapshots keep their counters inline as the new absolute baseline
+            meeting = body.get("meeting") or {}
+            if all(field in meeting for field in COUNTER_FIELDS):
+                counters = (meeting["tokensUsed"], meeting["costSoFar"])
+        elif all(field in body for field in COUNTER_FIELDS):
+            counters = (body.pop("tokensUsed"), body.pop("costSoFar"))
+
+        return cls(body, counters, keyframe)
+
+    @classmethod
+    def from_frame(cls, frame: str) -> "CompactEvent":
+        """Build from a legacy JSON frame as carried by the event bus"""
+        return cls.from_message(json.loads(frame))
+
+    def encoded(self, protocol: str) -> Union[str, bytes]:
+        cached = self._encoded.get(protocol)
+        if cached is None:
+            if protocol == PROTOCOL_MSGPACK:
+                cached = msgpack.packb(self.body, default=str)
+            else:
+                cached = json.dumps(self.body, separators=(",", ":"), default=str)
+            self._encoded[protocol] = cached
+        return cached
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# FRAMES
+# ═══════════════════════════════════════════════════════════════════════════
+
+class FrameEncoder:
+    """Per-connection frame builder; remembers the counters the client holds"""
+
+    def __init__(self, protocol: str):
+        self.protocol = protocol
+        self.tokens = 0
+        self.cost = 0.0
+        self._msgpack_header = msgpack.Packer().pack_array_header if protocol == PROTOCOL_MSGPACK else None
+
+    def encode(self, events: List[CompactEvent]) -> Union[str, bytes]:
+        """One frame for a batch of events: [events, counters-delta]"""
+        base_tokens, base_cost = self.tokens, self.cost
+        tokens, cost = base_tokens, base_cost
+        for event in events:
+            if event.counters is None:
+                continue
+            if event.keyframe:
+                base_tokens, base_cost = event.counters
+            tokens, cost = event.counters
+
+        delta = None
+        if (tokens, cost) != (base_tokens, base_cost):
+            delta = [tokens - base_tokens, round(cost - base_cost, COST_DELTA_DECIMALS)]
+            # Track what the client computed, not the exact float, so rounding never drifts
+            self.tokens, self.cost = base_tokens + delta[0], base_cost + delta[1]
+        else:
+            self.tokens, self.cost = base_tokens, base_cost
+
+        if self.protocol == PROTOCOL_MSGPACK:
+            return (
+                b"\x92"
+                + self._msgpack_header(len(events))
+                + b"".join(event.encoded(self.protocol) for event in events)
+                + msgpack.packb(delta)
+            )
+        bodies = ",".join(event.encoded(self.protocol) for event in events)
+        return f"[[{bodies}],{json.dumps(delta, separators=(',', ':'))}]"
+
+
+async def send_frame(websocket, frame: Union[str, bytes]):
+    """msgpack goes out as binary frames, JSON as text"""
+    if isinstance(frame, bytes):
+        await websocket.send_bytes(frame)
+    else:
+        await websocket.send_text(frame)
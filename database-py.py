@@ -4,30 +4,27 @@ SQLAlchemy Async + Redis Connection
 """
 
 from typing import AsyncGenerator
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase, declared_attr
 from sqlalchemy import Column, DateTime, text
 from sqlalchemy.sql import func
 import redis.asyncio as redis
 
 from src.config import settings
+from src.performance import DatabasePool
 
 # ============================================================
 # ASYNC ENGINE
 # ============================================================
 
-# Convert sync URL to async (postgresql:// -> postgresql+asyncpg://)
-ASYNC_DATABASE_URL = settings.DATABASE_URL.replace(
-    "postgresql://", "postgresql+asyncpg://"
-)
-
-engine = create_async_engine(
-    ASYNC_DATABASE_URL,
+# The process-wide engine from DatabasePool (asyncpg URL conversion,
+# async pool class, pool checkout and per-statement timing). Sizing comes
+# from settings; DatabasePool.init elsewhere returns this same engine.
+engine = DatabasePool.init(
+    settings.DATABASE_URL,
     echo=settings.APP_ENV == "development",
     pool_size=settings.DB_POOL_SIZE,
     max_overflow=settings.DB_MAX_OVERFLOW,
-    pool_pre_ping=True,
-    pool_recycle=3600,
 )
 
 # Session factory
@@ -132,20 +129,29 @@ async def check_redis_connection() -> bool:
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
-sync_engine = create_engine(
-    settings.DATABASE_URL,
-    echo=False,
-    pool_size=5,
-)
+# Created on first use, so API workers never open this second pool
+sync_engine = None
 
 SessionLocal = sessionmaker(
-    bind=sync_engine,
     autocommit=False,
     autoflush=False,
 )
 
+def get_sync_engine():
+    """Get the sync engine (for scripts)"""
+    global sync_engine
+    if sync_engine is None:
+        sync_engine = create_engine(
+            settings.DATABASE_URL,
+            echo=False,
+            pool_size=5,
+        )
+        SessionLocal.configure(bind=sync_engine)
+    return sync_engine
+
 def get_sync_db():
     """Get sync database session (for scripts)"""
+    get_sync_engine()
     db = SessionLocal()
     try:
         yield db
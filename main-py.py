@@ -15,11 +15,17 @@ from fastapi.exceptions import RequestValidationError
 from starlette.exceptions import HTTPException as StarletteHTTPException
 
 from prometheus_client import make_asgi_app, Counter, Histogram
+import asyncio
 import time
 
 from src.config import settings
 from src.database import engine, Base, check_db_connection, check_redis_connection
 from src.logging_config import setup_logging, get_logger, LoggingMiddleware
+from src.performance import setup_performance_routes
+from src.auth.dependencies import require_permissions
+from src.auth.permissions import Permission
+from roady_agent_registry import agent_registry
+from roady_models import Database
 
 # ============================================================
 # PROMETHEUS METRICS
@@ -56,6 +62,11 @@ async def lifespan(app: FastAPI):
         log_level=settings.LOG_LEVEL
     )
     
+    # Agent registry: bulk load, then LISTEN/poll for changes in a thread. It reads
+    # from that one thread, so one pooled connection (plus LISTEN) instead of a pool
+    registry_db = Database(settings.DATABASE_URL, pool_size=1, max_overflow=0)
+    await asyncio.to_thread(agent_registry.start, registry_db, settings.DATABASE_URL)
+    
     # Create database tables (dev only)
     if settings.APP_ENV == "development":
         async with engine.begin() as conn:
@@ -70,6 +81,10 @@ async def lifespan(app: FastAPI):
     # === SHUTDOWN ===
     logger.info("👋 Shutting down ROADY Construction API...")
     
+    # Stop the agent registry watcher
+    await asyncio.to_thread(agent_registry.stop_watcher)
+    registry_db.engine.dispose()
+    
     # Close database connections
     await engine.dispose()
     
@@ -229,6 +244,9 @@ async def root():
 # MOUNT PROMETHEUS METRICS
 # ============================================================
 
+# Before the /metrics mount, which would shadow /metrics/performance
+setup_performance_routes(app, admin_dependency=require_permissions(Permission.ADMIN_SETTINGS))
+
 metrics_app = make_asgi_app()
 app.mount("/metrics", metrics_app)
 
@@ -13,6 +13,11 @@ from firebase_admin import credentials, messaging
 import asyncio
 import json
 
+from roady_ws_protocol import (
+    CompactEvent, FrameEncoder, MAX_BATCH_EVENTS,
+    batch_window_seconds, negotiate_protocol, send_frame
+)
+
 # ============================================================
 # CONFIGURATION FIREBASE
 # ============================================================
@@ -180,34 +185,95 @@ class NotificationPreferences(BaseModel):
 # ============================================================
 
 class ConnectionManager:
-    """Gère les connexions WebSocket pour les notifications temps réel"""
+    """
+    Gère les connexions WebSocket pour les notifications temps réel.
+    
+    Les clients qui négocient un sous-protocole compact (msgpack ou JSON
+    compact, voir roady_ws_protocol) reçoivent des trames [events, counters]
+    et peuvent demander `batch_ms` pour regrouper plusieurs notifications
+    dans une seule trame. Les autres gardent un objet JSON par trame.
+    """
     
     def __init__(self):
         # user_id -> list of websocket connections
         self.active_connections: Dict[str, List[WebSocket]] = {}
-    
-    async def connect(self, websocket: WebSocket, user_id: str):
-        await websocket.accept()
+        # websocket -> encodeur de trames (clients compacts seulement)
+        self.encoders: Dict[WebSocket, FrameEncoder] = {}
+        # websocket -> fenêtre de regroupement (secondes)
+        self.batch_windows: Dict[WebSocket, float] = {}
+        # websocket -> événements en attente du prochain envoi groupé
+        self.pending: Dict[WebSocket, List[CompactEvent]] = {}
+    
+    async def connect(self, websocket: WebSocket, user_id: str, batch_ms: Optional[int] = None):
+        protocol = negotiate_protocol(websocket)
+        await websocket.accept(subprotocol=protocol)
+        if protocol:
+            self.encoders[websocket] = FrameEncoder(protocol)
+            if batch_window_seconds(batch_ms):
+                self.batch_windows[websocket] = batch_window_seconds(batch_ms)
         if user_id not in self.active_connections:
             self.active_connections[user_id] = []
         self.active_connections[user_id].append(websocket)
-        print(f"✅ User {user_id} connected. Total connections: {len(self.active_connections[user_id])}")
+        print(f"✅ User {user_id} connected ({protocol or 'json'}). Total connections: {len(self.active_connections[user_id])}")
     
     def disconnect(self, websocket: WebSocket, user_id: str):
         if user_id in self.active_connections:
-            self.active_connections[user_id].remove(websocket)
+            if websocket in self.active_connections[user_id]:
+                self.active_connections[user_id].remove(websocket)
             if not self.active_connections[user_id]:
                 del self.active_connections[user_id]
+        self.encoders.pop(websocket, None)
+        self.batch_windows.pop(websocket, None)
+        self.pending.pop(websocket, None)
         print(f"❌ User {user_id} disconnected")
     
     async def send_to_user(self, user_id: str, message: dict):
         """Envoie un message à toutes les connexions d'un utilisateur"""
-        if user_id in self.active_connections:
-            for connection in self.active_connections[user_id]:
-                try:
-                    await connection.send_json(message)
-                except Exception as e:
-                    print(f"Error sending to {user_id}: {e}")
+        if user_id not in self.active_connections:
+            return
+        
+        # Sérialisé une seule fois par format, quel que soit le nombre de connexions
+        legacy_frame = None
+        event = None
+        for connection in list(self.active_connections.get(user_id, [])):
+            try:
+                encoder = self.encoders.get(connection)
+                if encoder is None:
+                    if legacy_frame is None:
+                        legacy_frame = json.dumps(message, default=str)
+                    await connection.send_text(legacy_frame)
+                    continue
+                
+                if event is None:
+                    event = CompactEvent.from_message(message)
+                if connection in self.batch_windows:
+                    self._queue_event(connection, user_id, event)
+                else:
+                    await send_frame(connection, encoder.encode([event]))
+            except Exception as e:
+                print(f"Error sending to {user_id}: {e}")
+    
+    def _queue_event(self, websocket: WebSocket, user_id: str, event: CompactEvent):
+        """Met l'événement en attente; le premier déclenche l'envoi groupé"""
+        pending = self.pending.get(websocket)
+        if pending is None:
+            self.pending[websocket] = [event]
+            asyncio.create_task(self._flush_later(websocket, user_id))
+        else:
+            pending.append(event)
+    
+    async def _flush_later(self, websocket: WebSocket, user_id: str):
+        """Envoie les événements accumulés pendant la fenêtre de regroupement"""
+        await asyncio.sleep(self.batch_windows.get(websocket, 0.0))
+        events = self.pending.pop(websocket, None)
+        encoder = self.encoders.get(websocket)
+        if not events or encoder is None:
+            return
+        try:
+            for start in range(0, len(events), MAX_BATCH_EVENTS):
+                await send_frame(websocket, encoder.encode(events[start:start + MAX_BATCH_EVENTS]))
+        except Exception as e:
+            print(f"Error sending to {user_id}: {e}")
     
     async def broadcast_to_users(self, user_ids: List[str], message: dict):
         """Envoie un message à plusieurs utilisateurs"""
@@ -410,9 +476,9 @@ app = FastAPI(title="ROADY Notifications API")
 # ---- WebSocket Endpoint ----
 
 @app.websocket("/ws/notifications/{user_id}")
-async def websocket_notifications(websocket: WebSocket, user_id: str):
-    """WebSocket pour notifications temps réel"""
-    await manager.connect(websocket, user_id)
+async def websocket_notifications(websocket: WebSocket, user_id: str, batch_ms: Optional[int] = None):
+    """WebSocket pour notifications temps réel (`batch_ms` : regroupement, clients compacts)"""
+    await manager.connect(websocket, user_id, batch_ms)
     try:
         while True:
             # Garder la connexion vivante
@@ -420,7 +486,11 @@ async def websocket_notifications(websocket: WebSocket, user_id: str):
             
             # Traiter les messages entrants (acknowledgment, etc.)
             if data == "ping":
-                await websocket.send_json({"type": "pong"})
+                encoder = manager.encoders.get(websocket)
+                if encoder:
+                    await send_frame(websocket, encoder.encode([CompactEvent.from_message({"type": "pong"})]))
+                else:
+                    await websocket.send_json({"type": "pong"})
             elif data.startswith("ack:"):
                 notif_id = data.split(":")[1]
                 await mark_notification_read(user_id, notif_id)
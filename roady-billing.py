@@ -65,31 +65,39 @@ class PlanFeatures:
     custom_branding: bool
     sso: bool
     audit_logs: bool
+    # Agent admission control (see ROADY_ADMISSION_CONTROL)
+    agent_concurrency: int = 1        # LLM calls in flight at once
+    agent_queue_depth: int = 5        # requests waiting before shedding
+    agent_fair_share_weight: float = 1.0
 
 PLAN_FEATURES: Dict[PlanTier, PlanFeatures] = {
     PlanTier.FREE: PlanFeatures(
         projects=2, users=1, storage_gb=1,
         agents_included=False, calculators=True, reports=False,
         api_access=False, priority_support=False, custom_branding=False,
-        sso=False, audit_logs=False
+        sso=False, audit_logs=False,
+        agent_concurrency=1, agent_queue_depth=2, agent_fair_share_weight=0.5
     ),
     PlanTier.STARTER: PlanFeatures(
         projects=10, users=5, storage_gb=10,
         agents_included=True, calculators=True, reports=True,
         api_access=False, priority_support=False, custom_branding=False,
-        sso=False, audit_logs=False
+        sso=False, audit_logs=False,
+        agent_concurrency=2, agent_queue_depth=10, agent_fair_share_weight=1.0
     ),
     PlanTier.PROFESSIONAL: PlanFeatures(
         projects=50, users=25, storage_gb=100,
         agents_included=True, calculators=True, reports=True,
         api_access=True, priority_support=True, custom_branding=True,
-        sso=False, audit_logs=True
+        sso=False, audit_logs=True,
+        agent_concurrency=5, agent_queue_depth=25, agent_fair_share_weight=2.0
     ),
     PlanTier.ENTERPRISE: PlanFeatures(
         projects=-1, users=-1, storage_gb=-1,
         agents_included=True, calculators=True, reports=True,
         api_access=True, priority_support=True, custom_branding=True,
-        sso=True, audit_logs=True
+        sso=True, audit_logs=True,
+        agent_concurrency=20, agent_queue_depth=100, agent_fair_share_weight=4.0
     ),
 }
 
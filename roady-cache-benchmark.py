@@ -0,0 +1,303 @@
+"""
+ROADY Construction - Cache Codec Benchmark
+Encode/decode time and stored size of each CacheCodec combination on project payloads
+
+Usage:
+    python roady-cache-benchmark.py [--samples 200] [--rounds 5] [--dict-path cache.zdict]
+                                    [--save-dict cache.zdict] [--json reports/codecs.json]
+
+Payloads mirror what the cache actually holds: CacheEnvelopes around
+OptimizedProjectRepository results (project list pages with stats, project
+detail with its json_agg columns, single rows). `legacy` is the pre-codec
+storage (pickle, gzip above 1KB). The zstd dictionary is trained on a
+separate sample set unless --dict-path points to an existing one.
+"""
+
+from typing import Any, Callable, Dict, List, Optional
+from dataclasses import asdict
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+import argparse
+import gzip
+import json
+import os
+import pickle
+import random
+import statistics
+import time
+import uuid
+
+from src.performance import (
+    CacheCodec, CacheEnvelope, PaginatedResult, PerformanceConfig, PROJECTS_BY_UPDATED, train_cache_dictionary,
+    lz4_block, msgpack, orjson, zstandard
+)
+
+# ============================================
+# PAYLOADS
+# ============================================
+
+CITIES = ["Montréal", "Québec", "Laval", "Gatineau", "Longueuil", "Sherbrooke", "Lévis", "Trois-Rivières"]
+STATUSES = ["draft", "planning", "in_progress", "on_hold", "completed"]
+TASK_STATUSES = ["backlog", "todo", "in_progress", "review", "done"]
+PRIORITIES = ["low", "medium", "high", "urgent"]
+TRADES = ["Excavation", "Fondations", "Charpente", "Électricité", "Plomberie", "Toiture", "Finition", "Inspection"]
+ROLES = ["Chargé de projet", "Contremaître", "Ingénieur", "Électricien", "Plombier", "Estimateur"]
+
+
+class PayloadFactory:
+    """Deterministic rows shaped like the projects / tasks / project_members tables"""
+
+    def __init__(self, seed: int):
+        self.rng = random.Random(seed)
+        self.now = datetime(2025, 6, 1, 12, 0, tzinfo=timezone.utc)
+
+    def _uuid(self) -> uuid.UUID:
+        return uuid.UUID(int=self.rng.getrandbits(128), version=4)
+
+    def _moment(self, days: int = 365) -> datetime:
+        return self.now - timedelta(seconds=self.rng.randint(0, days * 86400), microseconds=self.rng.randint(0, 999999))
+
+    def project(self, company_id: uuid.UUID) -> Dict[str, Any]:
+        start = date(2025, 1, 1) + timedelta(days=self.rng.randint(0, 180))
+        budget = Decimal(self.rng.randint(50_000, 5_000_000)).quantize(Decimal("0.01"))
+        city = self.rng.choice(CITIES)
+        return {
+            "id": self._uuid(),
+            "company_id": company_id,
+            "code": f"PRJ-2025-{self.rng.randint(1, 999):03d}",
+            "name": f"{self.rng.choice(TRADES)} - {city} lot {self.rng.randint(1, 60)}",
+            "description": "Travaux de construction résidentielle, phase " + str(self.rng.randint(1, 4)),
+            "client_name": f"Client {self.rng.randint(1, 400)} inc.",
+            "client_contact": f"contact{self.rng.randint(1, 999)}@example.com",
+            "address": f"{self.rng.randint(1, 9999)} rue Principale",
+            "city": city,
+            "location": "0101000020E6100000" + "".join(self.rng.choice("0123456789ABCDEF") for _ in range(32)),
+            "status": self.rng.choice(STATUSES),
+            "start_date": start,
+            "end_date": None,
+            "estimated_end_date": start + timedelta(days=self.rng.randint(60, 540)),
+            "budget_total": budget,
+            "budget_spent": (budget * Decimal(self.rng.random())).quantize(Decimal("0.01")),
+            "progress_percent": self.rng.randint(0, 100),
+            "manager_id": self._uuid(),
+            "settings": {"currency": "CAD", "notifications": self.rng.random() < 0.7, "locale": "fr-CA"},
+            "tags": self.rng.sample(TRADES, self.rng.randint(0, 3)),
+            "metadata": {"source": "web", "version": self.rng.randint(1, 9)},
+            "created_at": self._moment(),
+            "updated_at": self._moment(30)
+        }
+
+    def project_with_stats(self, company_id: uuid.UUID) -> Dict[str, Any]:
+        row = self.project(company_id)
+        tasks = self.rng.randint(0, 200)
+        row.update({
+            "task_count": tasks,
+            "completed_tasks": self.rng.randint(0, tasks),
+            "total_expenses": Decimal(self.rng.randint(0, 900_000)).quantize(Decimal("0.01")),
+            "team_members": self.rng.randint(1, 25)
+        })
+        return row
+
+    def projects_page(self, company_id: uuid.UUID) -> Dict[str, Any]:
+        # What OptimizedProjectRepository caches: asdict() of a keyset PaginatedResult
+        rows = sorted(
+            (self.project_with_stats(company_id) for _ in range(self.rng.randint(5, 50))),
+            key=lambda row: (row["updated_at"], row["id"]),
+            reverse=True
+        )
+        page = self.rng.randint(1, 10)
+        has_next = self.rng.random() < 0.8
+        return asdict(PaginatedResult(
+            items=rows,
+            total=None,
+            page=page,
+            page_size=len(rows),
+            has_next=has_next,
+            has_prev=page > 1,
+            next_cursor=PROJECTS_BY_UPDATED.encode_cursor("next", rows[-1], page) if has_next else None,
+            prev_cursor=PROJECTS_BY_UPDATED.encode_cursor("prev", rows[0], page) if page > 1 else None
+        ))
+
+    def task(self, project_id: uuid.UUID) -> Dict[str, Any]:
+        return {
+            "id": str(self._uuid()),
+            "project_id": str(project_id),
+            "code": f"T-{self.rng.randint(1, 9999)}",
+            "title": f"{self.rng.choice(TRADES)}: étape {self.rng.randint(1, 12)}",
+            "status": self.rng.choice(TASK_STATUSES),
+            "priority": self.rng.choice(PRIORITIES),
+            "assignee_id": str(self._uuid()),
+            "zone": f"Zone {self.rng.choice('ABCDE')}",
+            "estimated_hours": self.rng.randint(1, 80),
+            "actual_hours": self.rng.randint(0, 80),
+            "due_date": str(date(2025, 1, 1) + timedelta(days=self.rng.randint(0, 365))),
+            "progress_percent": self.rng.randint(0, 100),
+            "tags": [],
+            "created_at": self._moment().isoformat(),
+            "updated_at": self._moment(30).isoformat()
+        }
+
+    def member(self, project_id: uuid.UUID) -> Dict[str, Any]:
+        return {
+            "id": str(self._uuid()),
+            "project_id": str(project_id),
+            "user_id": str(self._uuid()),
+            "role": self.rng.choice(ROLES),
+            "permissions": ["read", "comment"] + (["write"] if self.rng.random() < 0.5 else []),
+            "joined_at": self._moment().isoformat(),
+            "left_at": None,
+            "is_active": True
+        }
+
+    def project_detail(self, company_id: uuid.UUID) -> Dict[str, Any]:
+        row = self.project(company_id)
+        # json_agg columns come back from asyncpg as JSON text
+        row["tasks"] = json.dumps([self.task(row["id"]) for _ in range(self.rng.randint(5, 60))])
+        row["members"] = json.dumps([self.member(row["id"]) for _ in range(self.rng.randint(1, 12))])
+        return row
+
+    def envelope(self, value: Any) -> CacheEnvelope:
+        return CacheEnvelope(value, time.time() + 300, self.rng.uniform(0.005, 0.2))
+
+    def payloads(self, samples: int) -> Dict[str, List[CacheEnvelope]]:
+        companies = [self._uuid() for _ in range(20)]
+        return {
+            "project_row": [self.envelope(self.project(self.rng.choice(companies))) for _ in range(samples)],
+            "projects_list_page": [
+                self.envelope(self.projects_page(self.rng.choice(companies))) for _ in range(samples)
+            ],
+            "project_detail": [self.envelope(self.project_detail(self.rng.choice(companies))) for _ in range(samples)]
+        }
+
+
+# ============================================
+# CODECS UNDER TEST
+# ============================================
+
+class LegacyCodec:
+    """Storage before CacheCodec: pickle, gzip above COMPRESSION_THRESHOLD"""
+
+    def encode(self, value: Any) -> bytes:
+        data = pickle.dumps(value)
+        if len(data) > PerformanceConfig.COMPRESSION_THRESHOLD:
+            return gzip.compress(data)
+        return data
+
+    def decode(self, data: bytes) -> Any:
+        try:
+            return pickle.loads(gzip.decompress(data))
+        except OSError:
+            return pickle.loads(data)
+
+
+def codecs_under_test(dictionary: Optional[bytes]) -> Dict[str, Any]:
+    codecs: Dict[str, Any] = {"legacy (pickle+gzip)": LegacyCodec()}
+    formats = ["pickle"] + [name for name, module in (("msgpack", msgpack), ("orjson", orjson)) if module]
+    compressions = ["none"] + [name for name, module in (("lz4", lz4_block), ("zstd", zstandard)) if module]
+    for fmt in formats:
+        for compression in compressions:
+            codecs[f"{fmt}+{compression}"] = CacheCodec(fmt, compression)
+        if dictionary:
+            codecs[f"{fmt}+zstd-dict"] = CacheCodec(fmt, "zstd", dictionary)
+    return codecs
+
+
+# ============================================
+# MEASUREMENT
+# ============================================
+
+def time_per_call_us(func: Callable[[Any], Any], items: List[Any], rounds: int) -> float:
+    """Best-of-`rounds` mean time per call over `items`, in microseconds"""
+    best = float("inf")
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for item in items:
+            func(item)
+        best = min(best, time.perf_counter() - started)
+    return best / len(items) * 1e6
+
+
+def benchmark(codecs: Dict[str, Any], payloads: Dict[str, List[Any]], rounds: int) -> List[Dict[str, Any]]:
+    results = []
+    for payload, values in payloads.items():
+        raw_bytes = statistics.mean(len(pickle.dumps(value)) for value in values)
+        for name, codec in codecs.items():
+            fallbacks = getattr(codec, "pickle_fallbacks", 0)
+            encoded = [codec.encode(value) for value in values]
+            # Round trip must be lossless for the codec to be usable at all
+            lossless = all(codec.decode(data) == value for data, value in zip(encoded, values))
+            results.append({
+                "payload": payload,
+                "codec": name,
+                "encode_us": round(time_per_call_us(codec.encode, values, rounds), 1),
+                "decode_us": round(time_per_call_us(codec.decode, encoded, rounds), 1),
+                "bytes": round(statistics.mean(len(data) for data in encoded)),
+                "ratio": round(raw_bytes / statistics.mean(len(data) for data in encoded), 2),
+                "pickle_fallback": getattr(codec, "pickle_fallbacks", 0) > fallbacks,
+                "lossless": lossless
+            })
+    return results
+
+
+def print_report(results: List[Dict[str, Any]]):
+    payload = None
+    for row in results:
+        if row["payload"] != payload:
+            payload = row["payload"]
+            print(f"\n📦 {payload}")
+            print(f"   {'codec':<22}{'encode µs':>11}{'decode µs':>11}{'bytes':>9}{'ratio':>8}  notes")
+        notes = []
+        if row["pickle_fallback"]:
+            notes.append("pickle fallback")
+        if not row["lossless"]:
+            notes.append("LOSSY")
+        print(
+            f"   {row['codec']:<22}{row['encode_us']:>11}{row['decode_us']:>11}"
+            f"{row['bytes']:>9}{row['ratio']:>8}  {', '.join(notes)}"
+        )
+
+
+# ============================================
+# MAIN
+# ============================================
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="ROADY cache codec benchmark")
+    parser.add_argument("--samples", type=int, default=200, help="Values per payload kind")
+    parser.add_argument("--rounds", type=int, default=5, help="Timing rounds (best is kept)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--dict-path", help="Existing zstd dictionary (CACHE_ZSTD_DICT_PATH) instead of training one")
+    parser.add_argument("--train-samples", type=int, default=2000, help="Values per payload kind used for training")
+    parser.add_argument("--save-dict", help="Write the trained dictionary here")
+    parser.add_argument("--json", help="Also write the results as JSON")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    dictionary = None
+    if args.dict_path:
+        with open(args.dict_path, "rb") as f:
+            dictionary = f.read()
+    elif zstandard:
+        # Train on a different seed than the measured payloads
+        training = PayloadFactory(args.seed + 1).payloads(args.train_samples)
+        dictionary = train_cache_dictionary(value for values in training.values() for value in values)
+        print(f"🧠 Trained a {len(dictionary) // 1024}KB zstd dictionary on {3 * args.train_samples} values")
+        if args.save_dict:
+            with open(args.save_dict, "wb") as f:
+                f.write(dictionary)
+
+    payloads = PayloadFactory(args.seed).payloads(args.samples)
+    results = benchmark(codecs_under_test(dictionary), payloads, args.rounds)
+    print_report(results)
+
+    if args.json:
+        os.makedirs(os.path.dirname(args.json) or ".", exist_ok=True)
+        with open(args.json, "w") as f:
+            json.dump({"generated_at": datetime.utcnow().isoformat(), "samples": args.samples, "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,23 +3,56 @@ ROADY Construction - Optimisation Performance
 Caching, Connection Pooling, Query Optimization, Async Processing
 """
 
-from typing import Any, Optional, Callable, TypeVar, Dict, List
-from datetime import datetime, timedelta
-from functools import wraps
-from dataclasses import dataclass
+from typing import Any, Optional, Callable, TypeVar, Dict, List, Iterable, AsyncIterable, AsyncIterator, Union
+from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache, wraps
+from dataclasses import dataclass, field, asdict
+from collections import OrderedDict
+from decimal import Decimal
 import asyncio
+import base64
+import bisect
 import hashlib
+import hmac
+import inspect
 import json
+import math
+import os
 import pickle
 import gzip
+import random
+import re
+import struct
+import time
+import uuid
+
+# Optional cache codecs (CacheCodec falls back to what is installed)
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+try:
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    import lz4.block as lz4_block
+except ImportError:
+    lz4_block = None
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
 
 from redis import asyncio as aioredis
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
-from sqlalchemy import text, event
-from sqlalchemy.pool import QueuePool
-import aiocache
-from aiocache import Cache
-from aiocache.serializers import PickleSerializer
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine, AsyncSession, async_sessionmaker
+from sqlalchemy import text, event, and_, or_, tuple_, select, func, bindparam
+from sqlalchemy.sql.expression import ClauseElement, Executable
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from prometheus_client import REGISTRY
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily, HistogramMetricFamily
 
 T = TypeVar('T')
 
@@ -40,56 +73,387 @@ class PerformanceConfig:
     CACHE_TTL_LONG = 3600       # 1 hour
     CACHE_TTL_DAY = 86400       # 24 hours
     
+    # Stampede protection
+    CACHE_STALE_TTL = 60          # Serve stale this long past expiry while one caller refreshes
+    CACHE_LOCK_LEASE_MS = 10000   # Cross-process recompute lease
+    CACHE_LOCK_POLL = 0.05        # Seconds between checks while another process recomputes
+    CACHE_XFETCH_BETA = 1.0       # > 1 refreshes earlier, 0 disables early refresh
+    
+    # Invalidation (peers are told over pub/sub, so local copies can live longer)
+    CACHE_NAMESPACE_VERSION_TTL = 60  # Seconds a worker trusts its copy of a namespace version
+    CACHE_INVALIDATION_CHANNEL = "cache:invalidate"
+    CACHE_INVALIDATION_MAX_KEYS = 500  # Larger invalidations tell peers to flush L1 instead
+    
+    # L1 (in-process) cache
+    L1_MAX_ENTRIES = 1000
+    L1_MAX_BYTES = 64 * 1024 * 1024  # Approximate (serialized size); None = count only
+    L1_TTL = 300                     # Cap on L1 lifetime, L2 keeps the full TTL
+    L1_POLICY = "tinylfu"            # "tinylfu" (W-TinyLFU admission) or "lru"
+    L1_WHEEL_SLOTS = 512             # Timing wheel span = slots * tick
+    L1_WHEEL_TICK = 1.0              # Seconds
+    
     # Query
     QUERY_TIMEOUT = 30
     MAX_ROWS_PER_QUERY = 1000
+    PAGE_SIZE = 50
+    
+    # Keyset pagination cursors (HMAC-signed, so every worker needs the same secret)
+    CURSOR_SECRET = os.getenv("PAGINATION_CURSOR_SECRET") or os.getenv("APP_SECRET_KEY", "change-me-in-production")
+    CURSOR_SIGNATURE_BYTES = 16
+    
+    # Cache codecs (see CacheCodec)
+    CACHE_FORMAT = "msgpack"      # "msgpack", "orjson" (JSON-native values only) or "pickle"
+    CACHE_COMPRESSION = "zstd"    # "zstd", "lz4" or "none"
+    CACHE_ZSTD_LEVEL = 3
+    CACHE_ZSTD_DICT_PATH = os.getenv("CACHE_ZSTD_DICT_PATH")  # Trained dictionary, identical on every worker
+    CACHE_ZSTD_DICT_SIZE = 112 * 1024
     
     # Compression
-    COMPRESSION_THRESHOLD = 1024  # Compress if > 1KB
+    COMPRESSION_THRESHOLD = 1024      # Compress if > 1KB
+    DICT_COMPRESSION_THRESHOLD = 128  # With a trained dictionary small rows compress too
     
     # Batch Processing
     BATCH_SIZE = 100
     CONCURRENT_TASKS = 10
+    
+    # Telemetry (histogram buckets in seconds)
+    CACHE_LATENCY_BUCKETS = (.0001, .00025, .0005, .001, .0025, .005, .01, .025, .05, .1, .25)
+    QUERY_LATENCY_BUCKETS = (.001, .0025, .005, .01, .025, .05, .1, .25, .5, 1.0, 2.5, 5.0, 10.0, 30.0)
+    POOL_WAIT_BUCKETS = (.0001, .001, .005, .01, .05, .1, .25, .5, 1.0, 5.0, 10.0, 30.0)
+    SLOW_QUERY_SECONDS = 1.0
+    STATEMENT_STATS_MAX = 500  # Fingerprints tracked per worker (least-called are evicted)
+
+# ============================================
+# TELEMETRY
+# ============================================
+#
+# Hot paths only bump plain counters; PerformanceCollector turns them into
+# Prometheus metrics at scrape time and get_performance_metrics() summarizes
+# them. Values are cumulative since the process started.
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram (seconds)"""
+    
+    __slots__ = ("buckets", "counts", "sum", "count")
+    
+    def __init__(self, buckets: Iterable[float]):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # Last slot = +Inf
+        self.sum = 0.0
+        self.count = 0
+    
+    def observe(self, seconds: float):
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.sum += seconds
+        self.count += 1
+    
+    def cumulative(self) -> List[tuple]:
+        """[(le, cumulative count)] in Prometheus form"""
+        result, total = [], 0
+        for bound, count in zip(self.buckets + (math.inf,), self.counts):
+            total += count
+            result.append(("+Inf" if bound == math.inf else repr(bound), total))
+        return result
+    
+    def quantile(self, q: float) -> float:
+        """Estimate (linear within the bucket, like histogram_quantile)"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen, lower = 0, 0.0
+        for index, count in enumerate(self.counts):
+            if index == len(self.buckets):
+                return lower  # Beyond the last bucket: report its bound
+            upper = self.buckets[index]
+            if count and seen + count >= rank:
+                return lower + (upper - lower) * (rank - seen) / count
+            seen += count
+            lower = upper
+        return lower
+    
+    @property
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else 0.0
+
+
+def key_prefix(key: str) -> str:
+    """Metric label for a cache key: "project:42" -> "project", "projects.list@ns:3:<hash>" -> "projects.list"""
+    return key.split(":", 1)[0].split("@", 1)[0]
+
+
+class CacheTelemetry:
+    """Per-prefix hit/miss/latency counters for L1 and L2 lookups, plus loads behind get_or_compute"""
+    
+    def __init__(self):
+        # (prefix, level) -> [hits, misses, seconds]
+        self.lookups: Dict[tuple, list] = {}
+        # prefix -> [loads, load seconds, stale values served]
+        self.loads: Dict[str, list] = {}
+        self.latency = {
+            CacheLevel.L1_MEMORY: LatencyHistogram(PerformanceConfig.CACHE_LATENCY_BUCKETS),
+            CacheLevel.L2_REDIS: LatencyHistogram(PerformanceConfig.CACHE_LATENCY_BUCKETS)
+        }
+    
+    def lookup(self, prefix: str, level: str, hit: bool, seconds: float):
+        counters = self.lookups.get((prefix, level))
+        if counters is None:
+            counters = self.lookups[(prefix, level)] = [0, 0, 0.0]
+        counters[0 if hit else 1] += 1
+        counters[2] += seconds
+        self.latency[level].observe(seconds)
+    
+    def _load_counters(self, prefix: str) -> list:
+        counters = self.loads.get(prefix)
+        if counters is None:
+            counters = self.loads[prefix] = [0, 0.0, 0]
+        return counters
+    
+    def load(self, prefix: str, seconds: float):
+        counters = self._load_counters(prefix)
+        counters[0] += 1
+        counters[1] += seconds
+    
+    def stale_served(self, prefix: str):
+        self._load_counters(prefix)[2] += 1
+    
+    def totals(self, level: str) -> tuple:
+        hits = sum(c[0] for (_, lvl), c in self.lookups.items() if lvl == level)
+        misses = sum(c[1] for (_, lvl), c in self.lookups.items() if lvl == level)
+        return hits, misses
+
+
+# Literals become "?", so statements differing only in values share a fingerprint
+_FINGERPRINT_RULES = [
+    (re.compile(r"\$(\w*)\$.*?\$\1\$", re.S), "?"),                 # Dollar-quoted bodies
+    (re.compile(r"[Ee]?'(?:[^']|'')*'"), "?"),                       # String literals
+    (re.compile(r"\$\d+|%\(\w+\)s|%s"), "?"),                        # Bind parameters
+    (re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?\b"), "?"),  # Numbers, not t1 / schema.v2
+    (re.compile(r"\b(TRUE|FALSE|NULL)\b", re.I), "?"),
+    (re.compile(r"\s+"), " "),
+    (re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)"), "(...)"),            # IN lists, VALUES rows
+    (re.compile(r"\(\.\.\.\)(?:\s*,\s*\(\.\.\.\))+"), "(...)"),      # Multi-row VALUES
+    (re.compile(r"\bARRAY\[[?,\s]*\]", re.I), "ARRAY[...]"),
+]
+
+
+@lru_cache(maxsize=4096)
+def statement_fingerprint(statement: str) -> str:
+    """
+    Normalized statement text used as the pg_stat_statements-style key:
+    "SELECT * FROM tasks WHERE id IN ($1, $2, $3) LIMIT 50" ->
+    "SELECT * FROM tasks WHERE id IN (...) LIMIT ?".
+    SQLAlchemy reuses compiled statement strings, so the cache absorbs most calls.
+    """
+    for pattern, replacement in _FINGERPRINT_RULES:
+        statement = pattern.sub(replacement, statement)
+    return statement.strip().rstrip(";")
+
+
+class _StatementEntry:
+    __slots__ = ("calls", "total", "max", "rows", "latency")
+    
+    def __init__(self):
+        self.calls = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.rows = 0
+        self.latency = LatencyHistogram(PerformanceConfig.QUERY_LATENCY_BUCKETS)
+    
+    @property
+    def p95(self) -> float:
+        # Bucket interpolation can overshoot when every call is fast
+        return min(self.latency.quantile(0.95), self.max)
+
+
+class StatementStats:
+    """
+    In-process aggregates per statement fingerprint (calls, time, p95, rows),
+    i.e. pg_stat_statements for this worker only, including time spent in
+    the driver. At most `max_entries` fingerprints are kept; when full, the
+    least-called 5% are dropped, as pg_stat_statements does.
+    """
+    
+    SORT_KEYS = {
+        "total": lambda e: e.total,
+        "mean": lambda e: e.total / e.calls,
+        "p95": lambda e: e.p95,
+        "calls": lambda e: e.calls,
+        "rows": lambda e: e.rows,
+        "max": lambda e: e.max
+    }
+    
+    def __init__(self, max_entries: int = None):
+        self.max_entries = max_entries or PerformanceConfig.STATEMENT_STATS_MAX
+        self.entries: Dict[str, _StatementEntry] = {}
+        self.evicted = 0
+        self.since = datetime.utcnow()
+    
+    def record(self, statement: str, seconds: float, rows: int):
+        fingerprint = statement_fingerprint(statement)
+        entry = self.entries.get(fingerprint)
+        if entry is None:
+            if len(self.entries) >= self.max_entries:
+                self._evict()
+            entry = self.entries[fingerprint] = _StatementEntry()
+        entry.calls += 1
+        entry.total += seconds
+        entry.max = max(entry.max, seconds)
+        if rows > 0:
+            entry.rows += rows
+        entry.latency.observe(seconds)
+    
+    def _evict(self):
+        victims = sorted(self.entries, key=lambda fp: self.entries[fp].calls)[:max(1, self.max_entries // 20)]
+        for fingerprint in victims:
+            del self.entries[fingerprint]
+        self.evicted += len(victims)
+    
+    def top(self, sort: str = "total", limit: int = 50) -> List[Dict[str, Any]]:
+        """Heaviest fingerprints first; times in milliseconds"""
+        if sort not in self.SORT_KEYS:
+            raise ValueError(f"sort must be one of {', '.join(self.SORT_KEYS)}")
+        key = self.SORT_KEYS[sort]
+        ranked = sorted(list(self.entries.items()), key=lambda item: key(item[1]), reverse=True)[:limit]
+        return [
+            {
+                "fingerprint": fingerprint,
+                "calls": entry.calls,
+                "total_ms": round(entry.total * 1000, 2),
+                "mean_ms": round(entry.total / entry.calls * 1000, 3),
+                "p95_ms": round(entry.p95 * 1000, 3),
+                "max_ms": round(entry.max * 1000, 3),
+                "rows": entry.rows,
+                "rows_per_call": round(entry.rows / entry.calls, 2)
+            }
+            for fingerprint, entry in ranked
+        ]
+    
+    def reset(self):
+        self.entries.clear()
+        self.evicted = 0
+        self.since = datetime.utcnow()
+
+
+class DatabaseTelemetry:
+    """Query latency by operation and fingerprint, and connection-pool checkout waits"""
+    
+    OPERATIONS = frozenset({"SELECT", "INSERT", "UPDATE", "DELETE", "WITH"})
+    
+    def __init__(self):
+        self.queries: Dict[str, LatencyHistogram] = {}
+        self.statements = StatementStats()
+        self.slow_queries = 0
+        self.pool_wait = LatencyHistogram(PerformanceConfig.POOL_WAIT_BUCKETS)
+        self.pool_timeouts = 0
+    
+    @classmethod
+    def operation(cls, statement: str) -> str:
+        head = statement[:64].split(None, 1)
+        verb = head[0].upper() if head else ""
+        return verb if verb in cls.OPERATIONS else "OTHER"
+    
+    def query(self, statement: str, seconds: float, rows: int = -1):
+        operation = self.operation(statement)
+        histogram = self.queries.get(operation)
+        if histogram is None:
+            histogram = self.queries[operation] = LatencyHistogram(PerformanceConfig.QUERY_LATENCY_BUCKETS)
+        histogram.observe(seconds)
+        self.statements.record(statement, seconds, rows)
+        if seconds > PerformanceConfig.SLOW_QUERY_SECONDS:
+            self.slow_queries += 1
+    
+    def instrument_pool(self, pool):
+        """
+        Time every checkout, including waits for a free connection. Pools have
+        no "checkout requested" event, so this wraps the pool's `_do_get`.
+        """
+        do_get = pool._do_get
+        
+        def timed_do_get():
+            started = time.perf_counter()
+            try:
+                return do_get()
+            except PoolTimeoutError:
+                self.pool_timeouts += 1
+                raise
+            finally:
+                self.pool_wait.observe(time.perf_counter() - started)
+        
+        pool._do_get = timed_do_get
 
 # ============================================
 # DATABASE CONNECTION POOL
 # ============================================
 
+def async_database_url(database_url: str) -> str:
+    """postgresql:// (or postgres://) -> postgresql+asyncpg://; URLs naming a driver pass through"""
+    for scheme in ("postgresql://", "postgres://"):
+        if database_url.startswith(scheme):
+            return "postgresql+asyncpg://" + database_url[len(scheme):]
+    return database_url
+
+
 class DatabasePool:
+    """
+    The process's one async engine. The app's session factory (src.database),
+    the optimized repositories and the maintenance scripts all go through
+    `init`, so there is a single pool to size and every query is timed.
+    """
     _engine = None
+    _url = None
     _session_factory = None
+    telemetry = DatabaseTelemetry()
     
     @classmethod
-    def init(cls, database_url: str):
-        cls._engine = create_async_engine(
-            database_url,
-            poolclass=QueuePool,
-            pool_size=PerformanceConfig.DB_POOL_SIZE,
-            max_overflow=PerformanceConfig.DB_MAX_OVERFLOW,
-            pool_timeout=PerformanceConfig.DB_POOL_TIMEOUT,
-            pool_recycle=PerformanceConfig.DB_POOL_RECYCLE,
-            pool_pre_ping=True,  # Verify connections before use
-            echo=False
-        )
-        
-        cls._session_factory = async_sessionmaker(
-            cls._engine,
-            class_=AsyncSession,
-            expire_on_commit=False
-        )
-        
+    def init(cls, database_url: str, **options) -> AsyncEngine:
+        """
+        Create the engine on first call and return it; later calls with the
+        same URL return the same engine (their `options` are ignored).
+        `options` override the PerformanceConfig pool settings.
+        """
+        url = async_database_url(database_url)
+        if cls._engine is not None:
+            if url != cls._url:
+                raise RuntimeError("DatabasePool is already initialized with a different database URL")
+            return cls._engine
+    
+        settings = {
+            # Async engines need the asyncio-aware pool; QueuePool is rejected
+            "poolclass": AsyncAdaptedQueuePool,
+            "pool_size": PerformanceConfig.DB_POOL_SIZE,
+            "max_overflow": PerformanceConfig.DB_MAX_OVERFLOW,
+            "pool_timeout": PerformanceConfig.DB_POOL_TIMEOUT,
+            "pool_recycle": PerformanceConfig.DB_POOL_RECYCLE,
+            "pool_pre_ping": True,  # Verify connections before use
+            "echo": False
+        }
+        settings.update(options)
+        engine = create_async_engine(url, **settings)
+    
+        cls.telemetry.instrument_pool(engine.pool)
+    
         # Query timing events
-        @event.listens_for(cls._engine.sync_engine, "before_cursor_execute")
+        @event.listens_for(engine.sync_engine, "before_cursor_execute")
         def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
-            conn.info.setdefault("query_start_time", []).append(datetime.utcnow())
-        
-        @event.listens_for(cls._engine.sync_engine, "after_cursor_execute")
+            conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+    
+        @event.listens_for(engine.sync_engine, "after_cursor_execute")
         def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
-            start_time = conn.info["query_start_time"].pop()
-            duration = (datetime.utcnow() - start_time).total_seconds()
-            if duration > 1.0:  # Log slow queries
+            duration = time.perf_counter() - conn.info["query_start_time"].pop()
+            cls.telemetry.query(statement, duration, cursor.rowcount)
+            if duration > PerformanceConfig.SLOW_QUERY_SECONDS:  # Log slow queries
                 import structlog
-                structlog.get_logger().warning("slow_query", duration=duration, query=statement[:200])
+                structlog.get_logger().warning(
+                    "slow_query", duration=duration, query=statement_fingerprint(statement)[:200]
+                )
+    
+        cls._engine, cls._url = engine, url
+        cls._session_factory = async_sessionmaker(
+            engine,
+            class_=AsyncSession,
+            expire_on_commit=False
+        )
+        return engine
     
     @classmethod
     async def get_session(cls) -> AsyncSession:
@@ -99,6 +463,478 @@ class DatabasePool:
     async def close(cls):
         if cls._engine:
             await cls._engine.dispose()
+            cls._engine = cls._url = cls._session_factory = None
+
+# ============================================
+# L1 MEMORY CACHE
+# ============================================
+
+class FrequencySketch:
+    """Count-min sketch of recent access frequency (TinyLFU), halved periodically to age out old hits"""
+    
+    SEEDS = (0x9E3779B97F4A7C15, 0xC2B2AE3D27D4EB4F, 0x165667B19E3779F9, 0xD6E8FEB86659FD93)
+    MAX_COUNT = 15
+    
+    def __init__(self, capacity: int):
+        width = 1 << max(4, (capacity * 4 - 1).bit_length())
+        self.mask = width - 1
+        self.rows = [[0] * width for _ in self.SEEDS]
+        self.sample_size = 10 * max(capacity, 1)
+        self.additions = 0
+    
+    def _slots(self, key: str):
+        h = hash(key)
+        for row, seed in zip(self.rows, self.SEEDS):
+            yield row, ((h * seed) >> 17) & self.mask
+    
+    def increment(self, key: str):
+        for row, i in self._slots(key):
+            if row[i] < self.MAX_COUNT:
+                row[i] += 1
+        self.additions += 1
+        if self.additions >= self.sample_size:
+            for row in self.rows:
+                for i in range(len(row)):
+                    row[i] >>= 1
+            self.additions //= 2
+    
+    def frequency(self, key: str) -> int:
+        return min(row[i] for row, i in self._slots(key))
+
+
+class TimingWheel:
+    """Hashed timing wheel: O(1) schedule, advance costs O(ticks elapsed + keys due)"""
+    
+    def __init__(self, slots: int, tick: float, now: float):
+        self.slots: List[set] = [set() for _ in range(slots)]
+        self.tick = tick
+        self.current = int(now // tick)
+    
+    def schedule(self, key: str, expires_at: float):
+        # Deadlines beyond the wheel span fire early and are rescheduled by the caller
+        due = max(int(expires_at // self.tick), self.current + 1)
+        self.slots[due % len(self.slots)].add(key)
+    
+    def advance(self, now: float) -> List[str]:
+        """Keys whose slot came due since the last advance (may not be expired yet)"""
+        target = int(now // self.tick)
+        steps = min(target - self.current, len(self.slots))
+        due: List[str] = []
+        for step in range(1, steps + 1):
+            slot = self.slots[(self.current + step) % len(self.slots)]
+            if slot:
+                due.extend(slot)
+                slot.clear()
+        self.current = max(self.current, target)
+        return due
+
+
+class _L1Entry:
+    __slots__ = ("value", "expires_at", "size")
+    
+    def __init__(self, value: Any, expires_at: float, size: int):
+        self.value = value
+        self.expires_at = expires_at
+        self.size = size
+
+
+class L1Cache:
+    """
+    Process-local cache tier with O(1) get, set and eviction.
+    
+    With the "tinylfu" policy new keys enter a small window LRU (1% of
+    capacity); a key leaving the window only displaces the main region's
+    LRU victim if TinyLFU estimates it is accessed more often, so one-off
+    scans don't flush hot entries such as project lists. The "lru" policy
+    is a plain OrderedDict LRU. TTLs are tracked in a timing wheel, so
+    expired entries are dropped as time advances instead of only on read.
+    Capacity is an entry count plus an optional approximate byte budget.
+    """
+    
+    def __init__(
+        self,
+        max_entries: int = PerformanceConfig.L1_MAX_ENTRIES,
+        max_bytes: Optional[int] = PerformanceConfig.L1_MAX_BYTES,
+        policy: str = PerformanceConfig.L1_POLICY,
+        wheel_slots: int = PerformanceConfig.L1_WHEEL_SLOTS,
+        wheel_tick: float = PerformanceConfig.L1_WHEEL_TICK,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        if policy not in ("tinylfu", "lru"):
+            raise ValueError(f"Unknown L1 policy: {policy}")
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.policy = policy
+        self.clock = clock
+        
+        self.window_size = max(1, max_entries // 100) if policy == "tinylfu" else 0
+        self.main_size = max(1, max_entries - self.window_size)
+        self._window: "OrderedDict[str, _L1Entry]" = OrderedDict()
+        self._main: "OrderedDict[str, _L1Entry]" = OrderedDict()
+        self._sketch = FrequencySketch(max_entries) if policy == "tinylfu" else None
+        self._wheel = TimingWheel(wheel_slots, wheel_tick, clock())
+        self.bytes = 0
+        
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0, "rejections": 0}
+    
+    def __len__(self) -> int:
+        return len(self._window) + len(self._main)
+    
+    def __contains__(self, key: str) -> bool:
+        return key in self._window or key in self._main
+    
+    def _region(self, key: str) -> Optional["OrderedDict[str, _L1Entry]"]:
+        if key in self._main:
+            return self._main
+        if key in self._window:
+            return self._window
+        return None
+    
+    def _expire(self, now: float):
+        for key in self._wheel.advance(now):
+            region = self._region(key)
+            if region is None:
+                continue
+            entry = region[key]
+            if entry.expires_at <= now:
+                self._remove(region, key)
+                self.stats["expirations"] += 1
+            else:
+                self._wheel.schedule(key, entry.expires_at)
+    
+    def _remove(self, region: "OrderedDict[str, _L1Entry]", key: str) -> _L1Entry:
+        entry = region.pop(key)
+        self.bytes -= entry.size
+        return entry
+    
+    def get(self, key: str) -> Optional[Any]:
+        now = self.clock()
+        self._expire(now)
+        if self._sketch:
+            self._sketch.increment(key)
+        
+        region = self._region(key)
+        if region is None:
+            self.stats["misses"] += 1
+            return None
+        entry = region[key]
+        if entry.expires_at <= now:
+            self._remove(region, key)
+            self.stats["expirations"] += 1
+            self.stats["misses"] += 1
+            return None
+        
+        region.move_to_end(key)
+        self.stats["hits"] += 1
+        return entry.value
+    
+    def set(self, key: str, value: Any, ttl: float, size: int = 0):
+        now = self.clock()
+        self._expire(now)
+        entry = _L1Entry(value, now + ttl, size)
+        self._wheel.schedule(key, entry.expires_at)
+        
+        region = self._region(key)
+        if region is not None:
+            self.bytes += size - region[key].size
+            region[key] = entry
+            region.move_to_end(key)
+        elif self._sketch is None:
+            self._main[key] = entry
+            self.bytes += size
+            while len(self._main) > self.max_entries:
+                self._evict(self._main)
+        else:
+            self._sketch.increment(key)
+            self._window[key] = entry
+            self.bytes += size
+            if len(self._window) > self.window_size:
+                self._admit(*self._window.popitem(last=False))
+        
+        while self.max_bytes is not None and self.bytes > self.max_bytes and len(self) > 1:
+            self._evict(self._main if self._main else self._window)
+    
+    def _admit(self, candidate: str, entry: _L1Entry):
+        """Move a key leaving the window into the main region if it beats the main victim"""
+        if len(self._main) >= self.main_size:
+            victim = next(iter(self._main))
+            if self._sketch.frequency(candidate) <= self._sketch.frequency(victim):
+                self.bytes -= entry.size
+                self.stats["rejections"] += 1
+                self.stats["evictions"] += 1
+                return
+            self._evict(self._main)
+        self._main[candidate] = entry
+    
+    def _evict(self, region: "OrderedDict[str, _L1Entry]"):
+        _, entry = region.popitem(last=False)
+        self.bytes -= entry.size
+        self.stats["evictions"] += 1
+    
+    def delete(self, key: str) -> bool:
+        region = self._region(key)
+        if region is None:
+            return False
+        self._remove(region, key)
+        return True
+    
+    def remove_if(self, predicate: Callable[[str], bool]) -> int:
+        """Drop every key matching `predicate` (O(n), for bulk invalidation only)"""
+        removed = 0
+        for region in (self._window, self._main):
+            for key in [k for k in region if predicate(k)]:
+                self._remove(region, key)
+                removed += 1
+        return removed
+    
+    def clear(self):
+        self._window.clear()
+        self._main.clear()
+        self.bytes = 0
+
+# ============================================
+# CACHE CODECS
+# ============================================
+
+class CacheDecodeError(Exception):
+    """Stored payload could not be decoded (corrupt, unknown codec or missing dictionary)"""
+
+# Header byte: 0b01EF FFCC (E = CacheEnvelope, FF = format, CC = compression).
+# 0x40-0x7f never starts a pickle (0x80) or gzip (0x1f) stream, so entries
+# written before the codec still decode until they expire (CACHE_TTL_DAY).
+FORMAT_PICKLE = 0
+FORMAT_MSGPACK = 1
+FORMAT_ORJSON = 2
+
+COMPRESS_NONE = 0
+COMPRESS_LZ4 = 1
+COMPRESS_ZSTD = 2
+COMPRESS_ZSTD_DICT = 3
+
+# msgpack extension types for row values msgpack has no encoding for
+# (decoded as the base type, e.g. asyncpg's UUID comes back as uuid.UUID)
+EXT_DATETIME = 1
+EXT_DATE = 2
+EXT_DECIMAL = 3
+EXT_UUID = 4
+EXT_TUPLE = 5
+
+# Datetimes: microseconds since the epoch, plus the UTC offset in seconds when aware
+_NAIVE_DATETIME = struct.Struct(">q")
+_AWARE_DATETIME = struct.Struct(">qi")
+_DATE = struct.Struct(">i")
+_EPOCH = datetime(1970, 1, 1)
+_EPOCH_UTC = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+
+_JSON_SCALAR_TYPES = (str, int, bool, type(None))
+
+def _json_native(value: Any) -> bool:
+    """
+    True if JSON gives `value` back unchanged. Checked before orjson.dumps,
+    which never refuses UUID, tuple, Enum, datetime or dataclass values but
+    stores them as strings, lists or dicts.
+    """
+    kind = type(value)
+    if kind is dict:
+        return all(type(key) is str and _json_native(item) for key, item in value.items())
+    if kind is list:
+        return all(_json_native(item) for item in value)
+    if kind is float:
+        return math.isfinite(value)  # orjson writes NaN / Infinity as null
+    return kind in _JSON_SCALAR_TYPES
+
+def _msgpack_default(obj: Any) -> Any:
+    if isinstance(obj, datetime):
+        if obj.tzinfo is None:
+            return msgpack.ExtType(EXT_DATETIME, _NAIVE_DATETIME.pack((obj - _EPOCH) // _MICROSECOND))
+        # Only fixed offsets (asyncpg uses timezone.utc); named zones are pickled as they are
+        if type(obj.tzinfo) is timezone:
+            offset = obj.utcoffset()
+            return msgpack.ExtType(
+                EXT_DATETIME, _AWARE_DATETIME.pack((obj - _EPOCH_UTC) // _MICROSECOND, offset // timedelta(seconds=1))
+            )
+    elif isinstance(obj, date):
+        return msgpack.ExtType(EXT_DATE, _DATE.pack(obj.toordinal()))
+    if isinstance(obj, Decimal):
+        return msgpack.ExtType(EXT_DECIMAL, str(obj).encode())
+    if isinstance(obj, uuid.UUID):
+        return msgpack.ExtType(EXT_UUID, obj.bytes)
+    if type(obj) is tuple:
+        return msgpack.ExtType(EXT_TUPLE, _msgpack_pack(list(obj)))
+    raise TypeError(f"{type(obj).__name__} is not msgpack serializable")
+
+def _msgpack_ext_hook(code: int, data: bytes) -> Any:
+    if code == EXT_DATETIME:
+        if len(data) == _NAIVE_DATETIME.size:
+            return _EPOCH + _NAIVE_DATETIME.unpack(data)[0] * _MICROSECOND
+        micros, offset = _AWARE_DATETIME.unpack(data)
+        tz = timezone.utc if offset == 0 else timezone(timedelta(seconds=offset))
+        return (_EPOCH_UTC + micros * _MICROSECOND).astimezone(tz)
+    if code == EXT_DATE:
+        return date.fromordinal(_DATE.unpack(data)[0])
+    if code == EXT_DECIMAL:
+        return Decimal(data.decode())
+    if code == EXT_UUID:
+        return uuid.UUID(bytes=bytes(data))
+    if code == EXT_TUPLE:
+        return tuple(_msgpack_unpack(data))
+    return msgpack.ExtType(code, data)
+
+def _msgpack_pack(value: Any) -> bytes:
+    # strict_types: dict/list/str subclasses go through default and end up pickled intact
+    return msgpack.packb(value, default=_msgpack_default, strict_types=True)
+
+def _msgpack_unpack(data) -> Any:
+    return msgpack.unpackb(data, ext_hook=_msgpack_ext_hook, strict_map_key=False)
+
+
+class CacheCodec:
+    """
+    Serializes cache values for Redis behind a one-byte header naming the
+    format and compression, so readers never guess (see FORMAT_* / COMPRESS_*).
+    
+    - msgpack (with ext types for datetime, date, Decimal, UUID, tuple) or
+      orjson (only dicts with str keys, lists, str, int, finite float, bool
+      and None); anything the format cannot store exactly falls back to
+      pickle, counted in `pickle_fallbacks`
+    - lz4 or zstd above the threshold, kept only when it actually shrinks
+      the value; with a trained dictionary (see train_cache_dictionary) zstd
+      also compresses small rows
+    - CacheEnvelope is stored as [value, fresh_until, delta] in the value's format
+    
+    Every worker must load the same dictionary: entries compressed with a
+    different one fail to decode and are treated as misses.
+    """
+    
+    FORMATS = {"pickle": FORMAT_PICKLE, "msgpack": FORMAT_MSGPACK, "orjson": FORMAT_ORJSON}
+    COMPRESSIONS = {"none": COMPRESS_NONE, "lz4": COMPRESS_LZ4, "zstd": COMPRESS_ZSTD}
+    
+    def __init__(
+        self,
+        format: str = "msgpack",
+        compression: str = "zstd",
+        dictionary: Optional[bytes] = None,
+        level: int = None
+    ):
+        if (format == "msgpack" and msgpack is None) or (format == "orjson" and orjson is None):
+            print(f"⚠️ {format} is not installed, cache values are pickled")
+            format = "pickle"
+        if (compression == "lz4" and lz4_block is None) or (compression == "zstd" and zstandard is None):
+            print(f"⚠️ {compression} is not installed, cache values are stored uncompressed")
+            compression = "none"
+        
+        self.format = self.FORMATS[format]
+        self.compression = self.COMPRESSIONS[compression]
+        self.threshold = PerformanceConfig.COMPRESSION_THRESHOLD
+        self.pickle_fallbacks = 0
+        
+        level = level or PerformanceConfig.CACHE_ZSTD_LEVEL
+        self._zstd = zstandard.ZstdCompressor(level=level) if zstandard else None
+        self._unzstd = zstandard.ZstdDecompressor() if zstandard else None
+        self._zstd_dict = self._unzstd_dict = None
+        if dictionary and zstandard:
+            zstd_dict = zstandard.ZstdCompressionDict(dictionary)
+            self._zstd_dict = zstandard.ZstdCompressor(level=level, dict_data=zstd_dict)
+            self._unzstd_dict = zstandard.ZstdDecompressor(dict_data=zstd_dict)
+            if self.compression == COMPRESS_ZSTD:
+                self.compression = COMPRESS_ZSTD_DICT
+                self.threshold = PerformanceConfig.DICT_COMPRESSION_THRESHOLD
+    
+    @classmethod
+    def from_config(cls) -> "CacheCodec":
+        dictionary = None
+        if PerformanceConfig.CACHE_ZSTD_DICT_PATH:
+            with open(PerformanceConfig.CACHE_ZSTD_DICT_PATH, "rb") as f:
+                dictionary = f.read()
+        return cls(PerformanceConfig.CACHE_FORMAT, PerformanceConfig.CACHE_COMPRESSION, dictionary)
+    
+    def encode(self, value: Any) -> bytes:
+        envelope = isinstance(value, CacheEnvelope)
+        if envelope:
+            value = [value.value, value.fresh_until, value.delta]
+        format, data = self.serialize(value)
+        compression, data = self.compress(data)
+        return bytes((0x40 | envelope << 5 | format << 2 | compression,)) + data
+    
+    def decode(self, data: bytes) -> Any:
+        try:
+            header = data[0]
+            if header & 0xC0 != 0x40:
+                return self._decode_legacy(data)
+            value = self.deserialize((header >> 2) & 0x03, self.decompress(header & 0x03, memoryview(data)[1:]))
+            return CacheEnvelope(*value) if header & 0x20 else value
+        except CacheDecodeError:
+            raise
+        except Exception as e:
+            raise CacheDecodeError(f"{type(e).__name__}: {e}") from e
+    
+    def serialize(self, value: Any) -> tuple:
+        if self.format == FORMAT_MSGPACK:
+            try:
+                return FORMAT_MSGPACK, _msgpack_pack(value)
+            except (TypeError, ValueError, OverflowError):
+                self.pickle_fallbacks += 1
+        elif self.format == FORMAT_ORJSON:
+            if _json_native(value):
+                try:
+                    return FORMAT_ORJSON, orjson.dumps(value)
+                except TypeError:  # Integers beyond 64 bits
+                    pass
+            self.pickle_fallbacks += 1
+        return FORMAT_PICKLE, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+    
+    def deserialize(self, format: int, data) -> Any:
+        if format == FORMAT_MSGPACK:
+            return _msgpack_unpack(data)
+        if format == FORMAT_ORJSON:
+            return orjson.loads(data)
+        if format == FORMAT_PICKLE:
+            return pickle.loads(data)
+        raise CacheDecodeError(f"unknown format {format}")
+    
+    def compress(self, data: bytes) -> tuple:
+        if self.compression == COMPRESS_NONE or len(data) <= self.threshold:
+            return COMPRESS_NONE, data
+        if self.compression == COMPRESS_LZ4:
+            packed = lz4_block.compress(data)
+        elif self.compression == COMPRESS_ZSTD_DICT:
+            packed = self._zstd_dict.compress(data)
+        else:
+            packed = self._zstd.compress(data)
+        if len(packed) >= len(data):
+            return COMPRESS_NONE, data
+        return self.compression, packed
+    
+    def decompress(self, compression: int, data) -> Any:
+        if compression == COMPRESS_NONE:
+            return data
+        if compression == COMPRESS_LZ4 and lz4_block:
+            return lz4_block.decompress(data)
+        if compression == COMPRESS_ZSTD and self._unzstd:
+            return self._unzstd.decompress(data)
+        if compression == COMPRESS_ZSTD_DICT and self._unzstd_dict:
+            return self._unzstd_dict.decompress(data)
+        raise CacheDecodeError(f"no decompressor for compression {compression} (library or dictionary missing)")
+    
+    @staticmethod
+    def _decode_legacy(data: bytes) -> Any:
+        # Written before the codec: pickle, gzipped above COMPRESSION_THRESHOLD
+        if data[:2] == b"\x1f\x8b":
+            data = gzip.decompress(data)
+        return pickle.loads(data)
+
+
+def train_cache_dictionary(values: Iterable[Any], size: int = None, format: str = None) -> bytes:
+    """
+    Train a zstd dictionary on serialized sample values (a few thousand real
+    cache entries, envelopes included). Write the bytes to
+    CACHE_ZSTD_DICT_PATH on every worker; changing it invalidates entries
+    compressed with the previous one.
+    """
+    codec = CacheCodec(format or PerformanceConfig.CACHE_FORMAT, "none")
+    samples = [codec.serialize(value)[1] for value in values]
+    return zstandard.train_dictionary(size or PerformanceConfig.CACHE_ZSTD_DICT_SIZE, samples).as_bytes()
 
 # ============================================
 # MULTI-LEVEL CACHE
@@ -109,81 +945,345 @@ class CacheLevel:
     L2_REDIS = "redis"       # Distributed Redis cache
     L3_DB = "database"       # Database query cache
 
+@dataclass
+class CacheEnvelope:
+    """Value stored by get_or_compute: fresh until `fresh_until`, `delta` = seconds it took to compute"""
+    value: Any
+    fresh_until: float
+    delta: float
+    
+    def should_refresh_early(self, now: float, beta: float) -> bool:
+        """XFetch: recompute before expiry with a probability that rises as expiry nears"""
+        if beta <= 0:
+            return False
+        return now - self.delta * beta * math.log(random.random() or 1e-12) >= self.fresh_until
+
+
+# Result of a background refresh that found the lease taken (never returned to callers)
+_REFRESH_SKIPPED = object()
+
+
 class MultiLevelCache:
+    # Release the recompute lease only if we still hold it
+    RELEASE_LOCK_SCRIPT = """
+    if redis.call('GET', KEYS[1]) == ARGV[1] then
+        return redis.call('DEL', KEYS[1])
+    end
+    return 0
+    """
+    
+    # KEYS[1] = cache key, KEYS[2..] = tag sets; ARGV = ttl, payload.
+    # Tag sets live at least as long as their longest-lived member.
+    SET_TAGGED_SCRIPT = """
+    local ttl = tonumber(ARGV[1])
+    redis.call('SET', KEYS[1], ARGV[2], 'EX', ttl)
+    for i = 2, #KEYS do
+        redis.call('SADD', KEYS[i], KEYS[1])
+        if redis.call('TTL', KEYS[i]) < ttl then
+            redis.call('EXPIRE', KEYS[i], ttl)
+        end
+    end
+    return 1
+    """
+    
+    # Delete every member of the given tag sets and the sets themselves;
+    # returns the deleted cache keys so L1 can drop them too
+    INVALIDATE_TAGS_SCRIPT = """
+    local deleted = {}
+    for _, tag in ipairs(KEYS) do
+        local members = redis.call('SMEMBERS', tag)
+        for i = 1, #members, 500 do
+            redis.call('DEL', unpack(members, i, math.min(i + 499, #members)))
+        end
+        for _, member in ipairs(members) do
+            deleted[#deleted + 1] = member
+        end
+        redis.call('DEL', tag)
+    end
+    return deleted
+    """
+    
     def __init__(self, redis_url: str):
         # L1: In-memory cache (process-local)
-        self.l1_cache: Dict[str, tuple[Any, datetime]] = {}
-        self.l1_max_size = 1000
+        self.l1_cache = L1Cache()
         
-        # L2: Redis cache (distributed)
+        # L2: Redis cache (distributed), values encoded by the configured codec
+        self.codec = CacheCodec.from_config()
         self.redis = aioredis.from_url(redis_url, encoding="utf-8", decode_responses=False)
+        
+        # Stampede protection: one load per key per process
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._refreshes: set = set()
+        
+        # Namespace -> (version, read at)
+        self._namespaces: Dict[str, tuple] = {}
+        
+        self.telemetry = CacheTelemetry()
+        
+        # Cross-process L1 invalidation (see start_invalidation_listener)
+        self.origin = f"{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._listener: Optional[asyncio.Task] = None
     
     def _make_key(self, prefix: str, *args, **kwargs) -> str:
+        # Readable prefix so metrics (and redis-cli) can group keys
         key_data = f"{prefix}:{args}:{sorted(kwargs.items())}"
-        return hashlib.md5(key_data.encode()).hexdigest()
-    
-    def _compress(self, data: bytes) -> bytes:
-        if len(data) > PerformanceConfig.COMPRESSION_THRESHOLD:
-            return gzip.compress(data)
-        return data
+        return f"{prefix}:{hashlib.md5(key_data.encode()).hexdigest()}"
     
-    def _decompress(self, data: bytes) -> bytes:
+    def _decode(self, key: str, data: bytes) -> Optional[Any]:
+        """Decode an L2 payload; undecodable entries count as misses and get overwritten"""
         try:
-            return gzip.decompress(data)
-        except:
-            return data
+            return self.codec.decode(data)
+        except CacheDecodeError as e:
+            print(f"⚠️ Undecodable cache entry {key}: {e}")
+            return None
     
     async def get(self, key: str) -> Optional[Any]:
+        prefix = key_prefix(key)
+        
         # L1: Check memory
-        if key in self.l1_cache:
-            value, expiry = self.l1_cache[key]
-            if expiry > datetime.utcnow():
-                return value
-            del self.l1_cache[key]
+        started = time.perf_counter()
+        value = self.l1_cache.get(key)
+        l1_done = time.perf_counter()
+        self.telemetry.lookup(prefix, CacheLevel.L1_MEMORY, value is not None, l1_done - started)
+        if value is not None:
+            return value
         
-        # L2: Check Redis
+        # L2: Check Redis (latency includes decoding)
         data = await self.redis.get(f"cache:{key}")
         if data:
-            value = pickle.loads(self._decompress(data))
-            # Promote to L1
-            self.l1_cache[key] = (value, datetime.utcnow() + timedelta(seconds=60))
-            return value
-        
-        return None
+            value = self._decode(key, data)
+            if value is not None:
+                # Promote to L1
+                self.l1_cache.set(key, value, PerformanceConfig.L1_TTL, size=len(data))
+        self.telemetry.lookup(prefix, CacheLevel.L2_REDIS, value is not None, time.perf_counter() - l1_done)
+        return value
     
-    async def set(self, key: str, value: Any, ttl: int = None):
+    async def set(self, key: str, value: Any, ttl: int = None, tags: Iterable[str] = ()):
+        """Store in L1 and Redis; `tags` (e.g. "project:42") register the key for invalidate_tags"""
         ttl = ttl or PerformanceConfig.CACHE_TTL_MEDIUM
         
-        # L1: Store in memory
-        if len(self.l1_cache) >= self.l1_max_size:
-            # Evict oldest entries
-            oldest = sorted(self.l1_cache.items(), key=lambda x: x[1][1])[:100]
-            for k, _ in oldest:
-                del self.l1_cache[k]
+        data = self.codec.encode(value)
         
-        self.l1_cache[key] = (value, datetime.utcnow() + timedelta(seconds=min(ttl, 60)))
+        # L1: Store in memory (sized by the serialized payload)
+        self.l1_cache.set(key, value, min(ttl, PerformanceConfig.L1_TTL), size=len(data))
         
-        # L2: Store in Redis
-        data = self._compress(pickle.dumps(value))
-        await self.redis.setex(f"cache:{key}", ttl, data)
+        # L2: Store in Redis (with its tag memberships in the same round trip)
+        tag_keys = [f"tag:{tag}" for tag in tags]
+        if tag_keys:
+            await self.redis.eval(self.SET_TAGGED_SCRIPT, 1 + len(tag_keys), f"cache:{key}", *tag_keys, ttl, data)
+        else:
+            await self.redis.setex(f"cache:{key}", ttl, data)
     
     async def delete(self, key: str):
-        if key in self.l1_cache:
-            del self.l1_cache[key]
+        self.l1_cache.delete(key)
         await self.redis.delete(f"cache:{key}")
+        await self._publish_invalidation("k", [key])
+    
+    # ---- Stampede protection ----
     
-    async def delete_pattern(self, pattern: str):
-        # Clear L1 matching keys
-        self.l1_cache = {k: v for k, v in self.l1_cache.items() if pattern not in k}
+    async def get_or_compute(
+        self,
+        key: str,
+        loader: Callable[[], Any],
+        ttl: int = None,
+        stale_ttl: int = None,
+        should_cache: Callable[[Any], bool] = lambda value: value is not None,
+        tags: Iterable[str] = ()
+    ) -> Any:
+        """
+        Read-through get that never lets a hot key stampede the database:
         
-        # Clear L2 matching keys
-        cursor = 0
+        - one load per key per process (concurrent misses share it)
+        - one load per key across processes (Redis lease; others wait for its result)
+        - XFetch early refresh in the background shortly before expiry
+        - stale values served for up to `stale_ttl` past expiry while a
+          single background refresh runs
+        
+        `tags` are registered on the stored entry (see invalidate_tags).
+        """
+        ttl = ttl or PerformanceConfig.CACHE_TTL_MEDIUM
+        stale_ttl = PerformanceConfig.CACHE_STALE_TTL if stale_ttl is None else stale_ttl
+        
+        envelope = await self.get(key)
+        if isinstance(envelope, CacheEnvelope):
+            now = time.time()
+            if now < envelope.fresh_until:
+                if envelope.should_refresh_early(now, PerformanceConfig.CACHE_XFETCH_BETA):
+                    self._refresh_in_background(key, loader, ttl, stale_ttl, should_cache, tags)
+                return envelope.value
+            if now < envelope.fresh_until + stale_ttl:
+                self.telemetry.stale_served(key_prefix(key))
+                self._refresh_in_background(key, loader, ttl, stale_ttl, should_cache, tags)
+                return envelope.value
+        
+        def load():
+            return self._load(key, loader, ttl, stale_ttl, should_cache, tags, wait=True)
+        
+        value = await self._single_flight(key, load)
+        while value is _REFRESH_SKIPPED:
+            # We joined a background refresh that stood down because another
+            # process holds the lease: load (or wait for that process) ourselves
+            value = await self._single_flight(key, load)
+        return value
+    
+    async def _single_flight(self, key: str, run: Callable[[], Any]) -> Any:
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(run())
+            self._inflight[key] = future
+            future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # A cancelled caller must not cancel the load other callers share
+        return await asyncio.shield(future)
+    
+    def _refresh_in_background(self, key: str, loader, ttl: int, stale_ttl: int, should_cache, tags):
+        if key in self._inflight:
+            return
+        task = asyncio.ensure_future(
+            self._single_flight(key, lambda: self._load(key, loader, ttl, stale_ttl, should_cache, tags, wait=False))
+        )
+        self._refreshes.add(task)
+        task.add_done_callback(self._refresh_done)
+    
+    def _refresh_done(self, task: asyncio.Task):
+        self._refreshes.discard(task)
+        if not task.cancelled() and task.exception():
+            print(f"⚠️ Background cache refresh failed: {task.exception()}")
+    
+    async def _load(self, key: str, loader, ttl: int, stale_ttl: int, should_cache, tags, wait: bool) -> Any:
+        """Compute under the cross-process lease; without it, wait for the holder (or skip a refresh)"""
+        lock_key = f"lock:{key}"
+        token = uuid.uuid4().hex
+        locked = await self.redis.set(lock_key, token, nx=True, px=PerformanceConfig.CACHE_LOCK_LEASE_MS)
+        
+        if not locked:
+            if not wait:
+                return _REFRESH_SKIPPED  # Another process is already refreshing
+            deadline = time.monotonic() + PerformanceConfig.CACHE_LOCK_LEASE_MS / 1000
+            while time.monotonic() < deadline:
+                await asyncio.sleep(PerformanceConfig.CACHE_LOCK_POLL)
+                data = await self.redis.get(f"cache:{key}")
+                if data:
+                    envelope = self._decode(key, data)
+                    if isinstance(envelope, CacheEnvelope) and time.time() < envelope.fresh_until:
+                        self.l1_cache.set(key, envelope, PerformanceConfig.L1_TTL, size=len(data))
+                        return envelope.value
+            # Lease expired without a result (holder died or is very slow): compute ourselves
+        
+        try:
+            started = time.perf_counter()
+            value = await loader()
+            delta = time.perf_counter() - started
+            self.telemetry.load(key_prefix(key), delta)
+            if should_cache(value):
+                envelope = CacheEnvelope(value, time.time() + ttl, delta)
+                await self.set(key, envelope, ttl + stale_ttl, tags)
+            return value
+        finally:
+            if locked:
+                await self.redis.eval(self.RELEASE_LOCK_SCRIPT, 1, lock_key, token)
+    
+    # ---- Invalidation ----
+    
+    async def invalidate_tags(self, *tags: str) -> int:
+        """Delete every entry registered under any of `tags`; cost scales with the entries affected"""
+        if not tags:
+            return 0
+        deleted = await self.redis.eval(self.INVALIDATE_TAGS_SCRIPT, len(tags), *[f"tag:{tag}" for tag in tags])
+        keys = []
+        for redis_key in deleted:
+            if isinstance(redis_key, bytes):
+                redis_key = redis_key.decode()
+            keys.append(redis_key[len("cache:"):])
+            self.l1_cache.delete(keys[-1])
+        if keys:
+            await self._publish_invalidation("k", keys)
+        return len(deleted)
+    
+    async def namespace_version(self, namespace: str) -> int:
+        """Current version of a key namespace (cached briefly per worker)"""
+        cached_version = self._namespaces.get(namespace)
+        now = time.monotonic()
+        if cached_version and now - cached_version[1] < PerformanceConfig.CACHE_NAMESPACE_VERSION_TTL:
+            return cached_version[0]
+        version = int(await self.redis.get(f"ns:{namespace}") or 0)
+        self._namespaces[namespace] = (version, now)
+        return version
+    
+    async def bump_namespace(self, namespace: str) -> int:
+        """O(1) bulk invalidation: every key built with the old version is orphaned and expires by TTL"""
+        version = await self.redis.incr(f"ns:{namespace}")
+        self._namespaces[namespace] = (version, time.monotonic())
+        await self._publish_invalidation("n", [namespace, version])
+        return version
+    
+    # ---- Cross-process L1 invalidation ----
+    #
+    # Messages on CACHE_INVALIDATION_CHANNEL are compact JSON arrays
+    # [origin, op, payload]: op "k" = evict these keys, "n" = namespace
+    # [name, version] was bumped, "f" = flush L1. Workers skip their own.
+    
+    async def _publish_invalidation(self, op: str, payload: list):
+        if op == "k" and len(payload) > PerformanceConfig.CACHE_INVALIDATION_MAX_KEYS:
+            op, payload = "f", []
+        message = json.dumps([self.origin, op, payload], separators=(",", ":"))
+        await self.redis.publish(PerformanceConfig.CACHE_INVALIDATION_CHANNEL, message)
+    
+    def _apply_invalidation(self, data: Any):
+        try:
+            origin, op, payload = json.loads(data)
+        except (ValueError, TypeError):
+            return
+        if origin == self.origin:
+            return
+        if op == "k":
+            for key in payload:
+                self.l1_cache.delete(key)
+        elif op == "n":
+            namespace, version = payload
+            self._namespaces[namespace] = (version, time.monotonic())
+        elif op == "f":
+            self._flush_local()
+    
+    def _flush_local(self):
+        self.l1_cache.clear()
+        self._namespaces.clear()
+    
+    def start_invalidation_listener(self):
+        if self._listener is None:
+            self._listener = asyncio.create_task(self._listen_for_invalidations())
+    
+    async def _listen_for_invalidations(self):
+        """Evict what other workers invalidate; after a reconnect, flush L1 since messages were missed"""
+        backoff = 0.5
+        connected_before = False
         while True:
-            cursor, keys = await self.redis.scan(cursor, match=f"cache:*{pattern}*")
-            if keys:
-                await self.redis.delete(*keys)
-            if cursor == 0:
-                break
+            pubsub = self.redis.pubsub()
+            try:
+                await pubsub.subscribe(PerformanceConfig.CACHE_INVALIDATION_CHANNEL)
+                if connected_before:
+                    self._flush_local()
+                connected_before = True
+                backoff = 0.5
+                async for message in pubsub.listen():
+                    if message["type"] == "message":
+                        self._apply_invalidation(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"⚠️ Cache invalidation channel lost ({e}), retrying in {backoff:.1f}s")
+            finally:
+                try:
+                    await pubsub.close()
+                except Exception:
+                    pass
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, 30)
+    
+    async def close(self):
+        if self._listener:
+            self._listener.cancel()
+            self._listener = None
+        await self.redis.close()
 
 cache: Optional[MultiLevelCache] = None
 
@@ -191,43 +1291,65 @@ cache: Optional[MultiLevelCache] = None
 # CACHE DECORATORS
 # ============================================
 
-def cached(ttl: int = None, key_prefix: str = None, invalidate_on: List[str] = None):
-    """Decorator for caching function results"""
+def _format_tags(func: Callable, templates: Optional[List[str]], args: tuple, kwargs: dict) -> List[str]:
+    """Fill tag templates such as "user:{user_id}" from the call's arguments"""
+    if not templates:
+        return []
+    bound = inspect.signature(func).bind(*args, **kwargs)
+    bound.apply_defaults()
+    return [template.format(**bound.arguments) for template in templates]
+
+def cached(
+    ttl: int = None,
+    key_prefix: str = None,
+    invalidate_on: List[str] = None,
+    stale_ttl: int = None,
+    namespace: str = None
+):
+    """
+    Decorator for caching function results (stale results served up to `stale_ttl` while refreshing).
+    `invalidate_on` holds tag templates filled from the arguments, e.g. ["user:{user_id}"];
+    with a `namespace`, `invalidate_all()` drops every cached result of the function at once.
+    """
     def decorator(func: Callable[..., T]) -> Callable[..., T]:
+        prefix = key_prefix or f"{func.__module__}.{func.__name__}"
+        
+        async def make_key(*args, **kwargs) -> str:
+            versioned = prefix
+            if namespace:
+                versioned = f"{prefix}@{namespace}:{await cache.namespace_version(namespace)}"
+            return cache._make_key(versioned, *args, **kwargs)
+        
         @wraps(func)
         async def wrapper(*args, **kwargs):
             if cache is None:
                 return await func(*args, **kwargs)
             
-            prefix = key_prefix or f"{func.__module__}.{func.__name__}"
-            cache_key = cache._make_key(prefix, *args, **kwargs)
-            
-            # Try to get from cache
-            result = await cache.get(cache_key)
-            if result is not None:
-                return result
-            
-            # Execute function
-            result = await func(*args, **kwargs)
-            
-            # Store in cache
-            await cache.set(cache_key, result, ttl or PerformanceConfig.CACHE_TTL_MEDIUM)
-            
-            return result
+            # Cached result, or a single stampede-protected execution
+            return await cache.get_or_compute(
+                await make_key(*args, **kwargs),
+                lambda: func(*args, **kwargs),
+                ttl or PerformanceConfig.CACHE_TTL_MEDIUM,
+                stale_ttl,
+                tags=_format_tags(func, invalidate_on, args, kwargs)
+            )
         
-        # Add cache invalidation method
+        # Add cache invalidation methods
         async def invalidate(*args, **kwargs):
             if cache:
-                prefix = key_prefix or f"{func.__module__}.{func.__name__}"
-                cache_key = cache._make_key(prefix, *args, **kwargs)
-                await cache.delete(cache_key)
+                await cache.delete(await make_key(*args, **kwargs))
+        
+        async def invalidate_all():
+            if cache and namespace:
+                await cache.bump_namespace(namespace)
         
         wrapper.invalidate = invalidate
+        wrapper.invalidate_all = invalidate_all
         return wrapper
     return decorator
 
-def cache_aside(model_name: str, ttl: int = None):
-    """Cache-aside pattern for database queries"""
+def cache_aside(model_name: str, ttl: int = None, stale_ttl: int = None, tags: List[str] = None):
+    """Cache-aside pattern for database queries (`tags` are templates, e.g. ["project:{id}"])"""
     def decorator(func: Callable[..., T]) -> Callable[..., T]:
         @wraps(func)
         async def wrapper(id: str, *args, **kwargs):
@@ -236,18 +1358,15 @@ def cache_aside(model_name: str, ttl: int = None):
             
             cache_key = f"{model_name}:{id}"
             
-            # Check cache first
-            result = await cache.get(cache_key)
-            if result is not None:
-                return result
-            
-            # Query database
-            result = await func(id, *args, **kwargs)
-            
-            if result:
-                await cache.set(cache_key, result, ttl or PerformanceConfig.CACHE_TTL_LONG)
-            
-            return result
+            # Check cache first, query the database once on a miss (empty results aren't cached)
+            return await cache.get_or_compute(
+                cache_key,
+                lambda: func(id, *args, **kwargs),
+                ttl or PerformanceConfig.CACHE_TTL_LONG,
+                stale_ttl,
+                should_cache=bool,
+                tags=_format_tags(func, tags, (id,) + args, kwargs)
+            )
         
         async def invalidate(id: str):
             if cache:
@@ -262,12 +1381,6 @@ def cache_aside(model_name: str, ttl: int = None):
 # ============================================
 
 class QueryOptimizer:
-    @staticmethod
-    def paginate(query: str, page: int = 1, page_size: int = 50) -> str:
-        page_size = min(page_size, PerformanceConfig.MAX_ROWS_PER_QUERY)
-        offset = (page - 1) * page_size
-        return f"{query} LIMIT {page_size} OFFSET {offset}"
-    
     @staticmethod
     def add_indexes_hint(query: str, indexes: List[str]) -> str:
         # PostgreSQL specific
@@ -278,34 +1391,584 @@ class QueryOptimizer:
         result = await session.execute(text(f"EXPLAIN ANALYZE {query}"))
         return {"plan": [row[0] for row in result.fetchall()]}
 
+# ============================================
+# KEYSET PAGINATION
+# ============================================
+
+class InvalidCursorError(ValueError):
+    """Cursor is malformed, was tampered with, or belongs to another listing"""
+
+@dataclass
+class KeysetColumn:
+    name: str                # Key of the value in result rows, e.g. "updated_at"
+    expression: Any          # SQL for text queries ("p.updated_at") or a Core column
+    descending: bool = True
+
+@dataclass
+class Cursor:
+    direction: str           # "next" = rows after `values` in sort order, "prev" = rows before
+    values: List[Any]
+    page: int                # Page the cursor was taken from
+
+def _cursor_dump(value: Any) -> Any:
+    # Typed so bind parameters get the column's Python type back
+    if isinstance(value, datetime):
+        return ["dt", value.isoformat()]
+    if isinstance(value, date):
+        return ["d", value.isoformat()]
+    if isinstance(value, uuid.UUID):
+        return ["u", value.hex]
+    if isinstance(value, Decimal):
+        return ["n", str(value)]
+    return value
+
+def _cursor_load(value: Any) -> Any:
+    if not isinstance(value, list):
+        return value
+    tag, raw = value
+    if tag == "dt":
+        return datetime.fromisoformat(raw)
+    if tag == "d":
+        return date.fromisoformat(raw)
+    if tag == "u":
+        return uuid.UUID(hex=raw)
+    if tag == "n":
+        return Decimal(raw)
+    raise InvalidCursorError(f"unknown cursor value type {tag!r}")
+
+
+class _ExplainJSON(Executable, ClauseElement):
+    """EXPLAIN (FORMAT JSON) around a Core or text statement"""
+    inherit_cache = False
+    
+    def __init__(self, statement):
+        self.statement = statement
+
+@compiles(_ExplainJSON)
+def _compile_explain_json(element, compiler, **kw):
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+async def estimate_count(session: AsyncSession, statement, params: Dict = None) -> int:
+    """Planner row estimate (nothing is executed): constant cost, as accurate as the table statistics"""
+    plan = (await session.execute(_ExplainJSON(statement), params or {})).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+async def count_exact(session: AsyncSession, statement, params: Dict = None) -> int:
+    if isinstance(statement, str):
+        statement = text(f"SELECT COUNT(*) FROM ({statement}) AS counted")
+    else:
+        statement = select(func.count()).select_from(statement.order_by(None).subquery())
+    return (await session.execute(statement, params or {})).scalar()
+
+
+class Keyset:
+    """
+    Keyset ("seek") pagination on a unique sort key such as (updated_at, id):
+    each page filters on the boundary row instead of skipping OFFSET rows,
+    so page 500 costs what page 1 costs, given an index matching the sort.
+    
+    Sort columns must be NOT NULL and end with a unique column. Cursors are
+    opaque, HMAC-signed and only valid for the keyset `name` they came from.
+    """
+    
+    def __init__(self, name: str, columns: List[KeysetColumn], secret: str = None):
+        self.name = name
+        self.columns = columns
+        self._secret = (secret or PerformanceConfig.CURSOR_SECRET).encode()
+        self._uniform = len({column.descending for column in columns}) == 1
+    
+    # ---- Cursors ----
+    
+    def _sign(self, payload: bytes) -> bytes:
+        digest = hmac.new(self._secret, self.name.encode() + b"\0" + payload, hashlib.sha256).digest()
+        return digest[:PerformanceConfig.CURSOR_SIGNATURE_BYTES]
+    
+    def encode_cursor(self, direction: str, row: Dict[str, Any], page: int) -> str:
+        values = [_cursor_dump(row[column.name]) for column in self.columns]
+        payload = json.dumps([direction, page, values], separators=(",", ":")).encode()
+        return base64.urlsafe_b64encode(payload + self._sign(payload)).rstrip(b"=").decode()
+    
+    def decode_cursor(self, token: str) -> Cursor:
+        size = PerformanceConfig.CURSOR_SIGNATURE_BYTES
+        try:
+            raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        except (ValueError, TypeError) as e:
+            raise InvalidCursorError("malformed cursor") from e
+        payload, signature = raw[:-size], raw[-size:]
+        if len(raw) <= size or not hmac.compare_digest(signature, self._sign(payload)):
+            raise InvalidCursorError("invalid cursor")
+        direction, page, values = json.loads(payload)
+        if direction not in ("next", "prev") or len(values) != len(self.columns):
+            raise InvalidCursorError("invalid cursor")
+        return Cursor(direction, [_cursor_load(value) for value in values], page)
+    
+    # ---- Seek predicate and order ----
+    
+    def _operator(self, column: KeysetColumn, cursor: Cursor) -> str:
+        return "<" if column.descending == (cursor.direction == "next") else ">"
+    
+    def text_filter(self, cursor: Optional[Cursor]) -> tuple:
+        """(SQL, params) selecting the rows past `cursor`; "TRUE" on the first page"""
+        if cursor is None:
+            return "TRUE", {}
+        params = {f"keyset_{i}": value for i, value in enumerate(cursor.values)}
+        names = [f":keyset_{i}" for i in range(len(self.columns))]
+        expressions = [column.expression for column in self.columns]
+        if self._uniform:
+            # Row comparison: one index range scan
+            op = self._operator(self.columns[0], cursor)
+            return f"({', '.join(expressions)}) {op} ({', '.join(names)})", params
+        terms = []
+        for i, column in enumerate(self.columns):
+            equal = [f"{expressions[j]} = {names[j]}" for j in range(i)]
+            terms.append(" AND ".join(equal + [f"{expressions[i]} {self._operator(column, cursor)} {names[i]}"]))
+        return "(" + " OR ".join(f"({term})" for term in terms) + ")", params
+    
+    def text_order(self, reverse: bool = False) -> str:
+        return ", ".join(
+            f"{column.expression} {'DESC' if column.descending != reverse else 'ASC'}" for column in self.columns
+        )
+    
+    def core_filter(self, cursor: Cursor):
+        """Core expression selecting the rows past `cursor`"""
+        values = [bindparam(f"keyset_{i}", value) for i, value in enumerate(cursor.values)]
+        expressions = [column.expression for column in self.columns]
+        
+        def compare(expression, column, value):
+            return expression < value if self._operator(column, cursor) == "<" else expression > value
+        
+        if self._uniform:
+            return compare(tuple_(*expressions), self.columns[0], tuple_(*values))
+        return or_(*[
+            and_(*[expressions[j] == values[j] for j in range(i)], compare(expressions[i], column, values[i]))
+            for i, column in enumerate(self.columns)
+        ])
+    
+    def core_order(self, reverse: bool = False) -> list:
+        return [
+            column.expression.desc() if column.descending != reverse else column.expression.asc()
+            for column in self.columns
+        ]
+    
+    # ---- Pages ----
+    
+    async def paginate(
+        self,
+        session: AsyncSession,
+        query,
+        params: Dict = None,
+        cursor: Optional[str] = None,
+        limit: int = None,
+        count: Optional[str] = None,
+        count_query=None
+    ) -> "PaginatedResult":
+        """
+        Fetch the page after (or before) `cursor`, the first page without one.
+        
+        `query` is a Core Select (seek filter, ORDER BY and LIMIT are added) or
+        SQL text with a `{keyset}` placeholder in its WHERE clause and no
+        ORDER BY / LIMIT. `count` fills `total`: None (skip), "estimated"
+        (planner estimate, constant cost) or "exact" (COUNT(*), grows with
+        the table). `count_query` counts a cheaper equivalent of `query`.
+        """
+        limit = max(1, min(limit or PerformanceConfig.PAGE_SIZE, PerformanceConfig.MAX_ROWS_PER_QUERY))
+        position = self.decode_cursor(cursor) if cursor else None
+        backward = position is not None and position.direction == "prev"
+        params = params or {}
+        
+        if isinstance(query, str):
+            seek, seek_params = self.text_filter(position)
+            statement = text(
+                f"{query.replace('{keyset}', seek)} ORDER BY {self.text_order(backward)} LIMIT {limit + 1}"
+            )
+            result = await session.execute(statement, {**params, **seek_params})
+        else:
+            statement = query.where(self.core_filter(position)) if position else query
+            statement = statement.order_by(None).order_by(*self.core_order(backward)).limit(limit + 1)
+            result = await session.execute(statement, params)
+        
+        rows = [dict(row._mapping) for row in result.fetchall()]
+        more = len(rows) > limit
+        del rows[limit:]
+        if backward:
+            rows.reverse()
+        
+        # One extra row tells whether the paging direction continues
+        has_next = True if backward else more
+        has_prev = more if backward else position is not None
+        page = 1 if not has_prev else position.page + (-1 if backward else 1)
+        
+        total = None
+        if count:
+            counted = count_query if count_query is not None else query
+            if isinstance(counted, str):
+                counted = counted.replace("{keyset}", "TRUE")
+            if count == "estimated":
+                total = await estimate_count(session, text(counted) if isinstance(counted, str) else counted, params)
+            else:
+                total = await count_exact(session, counted, params)
+        
+        return PaginatedResult(
+            items=rows,
+            total=total,
+            page=page,
+            page_size=limit,
+            has_next=has_next,
+            has_prev=has_prev,
+            next_cursor=self.encode_cursor("next", rows[-1], page) if has_next and rows else None,
+            prev_cursor=self.encode_cursor("prev", rows[0], page) if has_prev and rows else None,
+            total_is_estimate=count == "estimated"
+        )
+
+# ============================================
+# PROJECT STATISTICS
+# ============================================
+#
+# project_stats holds per-project counters kept current by row triggers on
+# tasks, expenses and project_members, so listings read one row per project
+# instead of aggregating child tables. Each trigger upserts a delta on the
+# project's stats row (writers to the same project serialize on that row
+# until commit). ProjectStatsMaintainer installs the schema, rebuilds rows
+# from the child tables and checks them for drift.
+
+PROJECT_STATS_SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS project_stats (
+        project_id UUID PRIMARY KEY REFERENCES projects(id) ON DELETE CASCADE,
+        task_count INT NOT NULL DEFAULT 0,
+        completed_tasks INT NOT NULL DEFAULT 0,
+        tasks_by_status JSONB NOT NULL DEFAULT '{}',   -- status -> count, zero counts removed
+        total_expenses DECIMAL(15,2) NOT NULL DEFAULT 0,
+        expense_count INT NOT NULL DEFAULT 0,
+        member_count INT NOT NULL DEFAULT 0,
+        updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+    )
+    """,
+    # Deltas are skipped once the project is gone (its stats row cascades away with it)
+    """
+    CREATE OR REPLACE FUNCTION project_stats_apply(
+        p_project_id UUID,
+        p_status TEXT,
+        p_tasks INT,
+        p_amount DECIMAL,
+        p_expenses INT,
+        p_members INT
+    ) RETURNS VOID AS $$
+    BEGIN
+        INSERT INTO project_stats (project_id)
+        SELECT p_project_id WHERE EXISTS (SELECT 1 FROM projects WHERE id = p_project_id)
+        ON CONFLICT (project_id) DO NOTHING;
+        
+        UPDATE project_stats AS s SET
+            task_count = s.task_count + p_tasks,
+            completed_tasks = s.completed_tasks + CASE WHEN p_status = 'completed' THEN p_tasks ELSE 0 END,
+            tasks_by_status = CASE
+                WHEN p_status IS NULL THEN s.tasks_by_status
+                WHEN COALESCE((s.tasks_by_status ->> p_status)::INT, 0) + p_tasks = 0 THEN s.tasks_by_status - p_status
+                ELSE s.tasks_by_status || jsonb_build_object(
+                    p_status, COALESCE((s.tasks_by_status ->> p_status)::INT, 0) + p_tasks
+                )
+            END,
+            total_expenses = s.total_expenses + p_amount,
+            expense_count = s.expense_count + p_expenses,
+            member_count = s.member_count + p_members,
+            updated_at = NOW()
+        WHERE s.project_id = p_project_id;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION project_stats_tasks_changed() RETURNS TRIGGER AS $$
+    BEGIN
+        IF TG_OP IN ('UPDATE', 'DELETE') THEN
+            PERFORM project_stats_apply(OLD.project_id, COALESCE(OLD.status::TEXT, 'none'), -1, 0, 0, 0);
+        END IF;
+        IF TG_OP IN ('INSERT', 'UPDATE') THEN
+            PERFORM project_stats_apply(NEW.project_id, COALESCE(NEW.status::TEXT, 'none'), 1, 0, 0, 0);
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION project_stats_expenses_changed() RETURNS TRIGGER AS $$
+    BEGIN
+        IF TG_OP IN ('UPDATE', 'DELETE') THEN
+            PERFORM project_stats_apply(OLD.project_id, NULL, 0, -COALESCE(OLD.amount, 0), -1, 0);
+        END IF;
+        IF TG_OP IN ('INSERT', 'UPDATE') THEN
+            PERFORM project_stats_apply(NEW.project_id, NULL, 0, COALESCE(NEW.amount, 0), 1, 0);
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION project_stats_members_changed() RETURNS TRIGGER AS $$
+    BEGIN
+        IF TG_OP IN ('UPDATE', 'DELETE') THEN
+            PERFORM project_stats_apply(OLD.project_id, NULL, 0, 0, 0, -1);
+        END IF;
+        IF TG_OP IN ('INSERT', 'UPDATE') THEN
+            PERFORM project_stats_apply(NEW.project_id, NULL, 0, 0, 0, 1);
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    # Updates only fire when a counted column actually changes
+    "DROP TRIGGER IF EXISTS project_stats_tasks ON tasks",
+    """
+    CREATE TRIGGER project_stats_tasks
+    AFTER INSERT OR DELETE ON tasks
+    FOR EACH ROW EXECUTE FUNCTION project_stats_tasks_changed()
+    """,
+    "DROP TRIGGER IF EXISTS project_stats_tasks_update ON tasks",
+    """
+    CREATE TRIGGER project_stats_tasks_update
+    AFTER UPDATE OF project_id, status ON tasks
+    FOR EACH ROW
+    WHEN (OLD.project_id IS DISTINCT FROM NEW.project_id OR OLD.status IS DISTINCT FROM NEW.status)
+    EXECUTE FUNCTION project_stats_tasks_changed()
+    """,
+    "DROP TRIGGER IF EXISTS project_stats_expenses ON expenses",
+    """
+    CREATE TRIGGER project_stats_expenses
+    AFTER INSERT OR DELETE ON expenses
+    FOR EACH ROW EXECUTE FUNCTION project_stats_expenses_changed()
+    """,
+    "DROP TRIGGER IF EXISTS project_stats_expenses_update ON expenses",
+    """
+    CREATE TRIGGER project_stats_expenses_update
+    AFTER UPDATE OF project_id, amount ON expenses
+    FOR EACH ROW
+    WHEN (OLD.project_id IS DISTINCT FROM NEW.project_id OR OLD.amount IS DISTINCT FROM NEW.amount)
+    EXECUTE FUNCTION project_stats_expenses_changed()
+    """,
+    "DROP TRIGGER IF EXISTS project_stats_members ON project_members",
+    """
+    CREATE TRIGGER project_stats_members
+    AFTER INSERT OR DELETE ON project_members
+    FOR EACH ROW EXECUTE FUNCTION project_stats_members_changed()
+    """,
+    "DROP TRIGGER IF EXISTS project_stats_members_update ON project_members",
+    """
+    CREATE TRIGGER project_stats_members_update
+    AFTER UPDATE OF project_id ON project_members
+    FOR EACH ROW
+    WHEN (OLD.project_id IS DISTINCT FROM NEW.project_id)
+    EXECUTE FUNCTION project_stats_members_changed()
+    """
+]
+
+# Source of truth: every counter aggregated separately from its child table
+PROJECT_STATS_ACTUAL_SQL = """
+    SELECT
+        p.id AS project_id,
+        COALESCE(t.task_count, 0) AS task_count,
+        COALESCE(t.completed_tasks, 0) AS completed_tasks,
+        COALESCE(t.tasks_by_status, '{}'::JSONB) AS tasks_by_status,
+        e.total_expenses,
+        e.expense_count,
+        m.member_count
+    FROM projects p
+    LEFT JOIN LATERAL (
+        SELECT SUM(n)::INT AS task_count,
+               (COALESCE(SUM(n) FILTER (WHERE status = 'completed'), 0))::INT AS completed_tasks,
+               jsonb_object_agg(status, n) AS tasks_by_status
+        FROM (
+            SELECT COALESCE(status::TEXT, 'none') AS status, COUNT(*) AS n
+            FROM tasks WHERE project_id = p.id GROUP BY 1
+        ) by_status
+    ) t ON TRUE
+    LEFT JOIN LATERAL (
+        SELECT COALESCE(SUM(amount), 0) AS total_expenses, COUNT(*)::INT AS expense_count
+        FROM expenses WHERE project_id = p.id
+    ) e ON TRUE
+    LEFT JOIN LATERAL (
+        SELECT COUNT(*)::INT AS member_count FROM project_members WHERE project_id = p.id
+    ) m ON TRUE
+    WHERE p.id = ANY(:ids)
+"""
+
+PROJECT_STATS_COLUMNS = (
+    "task_count", "completed_tasks", "tasks_by_status", "total_expenses", "expense_count", "member_count"
+)
+
+
+class ProjectStatsMaintainer:
+    """Install, rebuild and verify project_stats (see PROJECT_STATS_SCHEMA)"""
+    
+    def __init__(self, session: AsyncSession, batch_size: int = 500):
+        self.session = session
+        self.batch_size = batch_size
+    
+    async def install(self):
+        """Create the table, functions and triggers (idempotent), then fill it"""
+        for statement in PROJECT_STATS_SCHEMA:
+            await self.session.execute(text(statement))
+        await self.session.commit()
+        return await self.rebuild()
+    
+    async def _project_ids(self, project_ids: Optional[List[Any]]):
+        """All project ids in batches (keyset on id), or the given ones"""
+        if project_ids is not None:
+            for i in range(0, len(project_ids), self.batch_size):
+                yield list(project_ids[i:i + self.batch_size])
+            return
+        ids: List[Any] = []
+        while True:
+            after = "WHERE id > :last" if ids else ""
+            result = await self.session.execute(
+                text(f"SELECT id FROM projects {after} ORDER BY id LIMIT :limit"),
+                {"last": ids[-1] if ids else None, "limit": self.batch_size}
+            )
+            ids = [row[0] for row in result.fetchall()]
+            if not ids:
+                return
+            yield ids
+    
+    async def _actual(self, ids: List[Any]) -> Dict[Any, Dict[str, Any]]:
+        result = await self.session.execute(text(PROJECT_STATS_ACTUAL_SQL), {"ids": ids})
+        return {row.project_id: dict(row._mapping) for row in result.fetchall()}
+    
+    async def _stored(self, ids: List[Any], lock: bool = False) -> Dict[Any, Dict[str, Any]]:
+        query = f"SELECT project_id, {', '.join(PROJECT_STATS_COLUMNS)} FROM project_stats WHERE project_id = ANY(:ids)"
+        if lock:
+            query += " ORDER BY project_id FOR UPDATE"
+        result = await self.session.execute(text(query), {"ids": ids})
+        return {row.project_id: dict(row._mapping) for row in result.fetchall()}
+    
+    async def _rebuild_batch(self, ids: List[Any]) -> int:
+        # Lock the rows first: triggers of in-flight writes wait for us, and the
+        # aggregate below (a new statement) sees everything committed before
+        await self.session.execute(
+            text(
+                "INSERT INTO project_stats (project_id) SELECT id FROM projects WHERE id = ANY(:ids) "
+                "ON CONFLICT (project_id) DO NOTHING"
+            ),
+            {"ids": ids}
+        )
+        await self._stored(ids, lock=True)
+        result = await self.session.execute(
+            text(f"""
+                UPDATE project_stats AS s SET
+                    {', '.join(f'{column} = actual.{column}' for column in PROJECT_STATS_COLUMNS)},
+                    updated_at = NOW()
+                FROM ({PROJECT_STATS_ACTUAL_SQL}) AS actual
+                WHERE s.project_id = actual.project_id
+            """),
+            {"ids": ids}
+        )
+        await self.session.commit()
+        return result.rowcount
+    
+    async def rebuild(self, project_ids: Optional[List[Any]] = None) -> int:
+        """Recompute stats from the child tables (all projects by default), one transaction per batch"""
+        rebuilt = 0
+        async for ids in self._project_ids(project_ids):
+            rebuilt += await self._rebuild_batch(ids)
+        return rebuilt
+    
+    @staticmethod
+    def _differences(stored: Optional[Dict[str, Any]], actual: Dict[str, Any]) -> Dict[str, tuple]:
+        if stored is None:
+            stored = {"task_count": 0, "completed_tasks": 0, "tasks_by_status": {}, "total_expenses": 0,
+                      "expense_count": 0, "member_count": 0}
+        differences = {}
+        for column in PROJECT_STATS_COLUMNS:
+            expected, found = actual[column], stored[column]
+            if column == "tasks_by_status":
+                expected = {k: int(v) for k, v in (json.loads(expected) if isinstance(expected, str) else expected).items()}
+                found = {k: int(v) for k, v in (json.loads(found) if isinstance(found, str) else found).items()}
+            elif column == "total_expenses":
+                expected, found = Decimal(str(expected)), Decimal(str(found))
+            if expected != found:
+                differences[column] = (found, expected)
+        return differences
+    
+    async def check(self, project_ids: Optional[List[Any]] = None, repair: bool = False) -> List[Dict[str, Any]]:
+        """
+        Compare stored stats with the child tables; returns one entry per
+        drifted project ({"project_id", "differences": {column: (stored, actual)}}).
+        Candidates are re-read under the row lock so in-flight writes aren't
+        reported; `repair` rebuilds the drifted rows.
+        """
+        drifted = []
+        async for ids in self._project_ids(project_ids):
+            actual, stored = await self._actual(ids), await self._stored(ids)
+            suspects = [pid for pid, row in actual.items() if self._differences(stored.get(pid), row)]
+            if suspects:
+                stored = await self._stored(suspects, lock=True)
+                actual = await self._actual(suspects)
+                for pid in suspects:
+                    differences = self._differences(stored.get(pid), actual[pid])
+                    if differences:
+                        drifted.append({"project_id": pid, "differences": differences})
+            await self.session.commit()
+        
+        if repair and drifted:
+            await self.rebuild([entry["project_id"] for entry in drifted])
+        return drifted
+
+# ============================================
+# OPTIMIZED REPOSITORIES
+# ============================================
+
+# Project listings, newest first. Served by
+#   CREATE INDEX idx_projects_user_updated ON projects (user_id, updated_at DESC, id DESC)
+#   WHERE deleted_at IS NULL
+PROJECTS_BY_UPDATED = Keyset(
+    "projects.by_updated",
+    [KeysetColumn("updated_at", "p.updated_at"), KeysetColumn("id", "p.id")]
+)
+
 # Optimized queries with preloading
 class OptimizedProjectRepository:
     @staticmethod
-    @cached(ttl=300, key_prefix="projects.list")
-    async def get_projects_with_stats(user_id: str, page: int = 1) -> List[Dict]:
+    async def get_projects_with_stats(
+        user_id: str,
+        cursor: Optional[str] = None,
+        limit: int = None,
+        count: Optional[str] = None
+    ) -> "PaginatedResult":
+        """One page of the user's projects with stats; pass `next_cursor` / `prev_cursor` back to move"""
+        page = await OptimizedProjectRepository._projects_page(user_id, cursor, limit, count)
+        return PaginatedResult(**page)
+    
+    @staticmethod
+    @cached(ttl=300, key_prefix="projects.list", invalidate_on=["user:{user_id}"])
+    async def _projects_page(
+        user_id: str,
+        cursor: Optional[str] = None,
+        limit: int = None,
+        count: Optional[str] = None
+    ) -> Dict[str, Any]:
+        # Cached as a plain dict: CacheCodec's msgpack/orjson formats pickle dataclasses
         async with await DatabasePool.get_session() as session:
-            # Single query with JOINs instead of N+1
+            # One ordered index scan over projects, one stats row per project of the page
             query = """
                 SELECT 
                     p.*,
-                    COUNT(DISTINCT t.id) as task_count,
-                    COUNT(DISTINCT t.id) FILTER (WHERE t.status = 'completed') as completed_tasks,
-                    COALESCE(SUM(e.amount), 0) as total_expenses,
-                    COUNT(DISTINCT m.id) as team_members
+                    COALESCE(s.task_count, 0) AS task_count,
+                    COALESCE(s.completed_tasks, 0) AS completed_tasks,
+                    COALESCE(s.tasks_by_status, '{}'::JSONB) AS tasks_by_status,
+                    COALESCE(s.total_expenses, 0) AS total_expenses,
+                    COALESCE(s.member_count, 0) AS team_members
                 FROM projects p
-                LEFT JOIN tasks t ON t.project_id = p.id
-                LEFT JOIN expenses e ON e.project_id = p.id
-                LEFT JOIN project_members m ON m.project_id = p.id
-                WHERE p.user_id = :user_id AND p.deleted_at IS NULL
-                GROUP BY p.id
-                ORDER BY p.updated_at DESC
+                LEFT JOIN project_stats s ON s.project_id = p.id
+                WHERE p.user_id = :user_id AND p.deleted_at IS NULL AND {keyset}
             """
-            query = QueryOptimizer.paginate(query, page)
-            result = await session.execute(text(query), {"user_id": user_id})
-            return [dict(row._mapping) for row in result.fetchall()]
+            count_query = "SELECT 1 FROM projects p WHERE p.user_id = :user_id AND p.deleted_at IS NULL"
+            page = await PROJECTS_BY_UPDATED.paginate(
+                session, query, {"user_id": user_id}, cursor, limit, count, count_query
+            )
+            return asdict(page)
     
     @staticmethod
-    @cache_aside("project", ttl=600)
+    @cache_aside("project", ttl=600, tags=["project:{id}"])
     async def get_project_detail(id: str) -> Optional[Dict]:
         async with await DatabasePool.get_session() as session:
             query = """
@@ -326,29 +1989,210 @@ class OptimizedProjectRepository:
 # BATCH PROCESSING
 # ============================================
 
+@dataclass
+class BatchItemResult:
+    """Outcome of one item; `index` is its position in the input"""
+    index: int
+    item: Any
+    value: Any = None
+    error: Optional[BaseException] = None
+    attempts: int = 0
+    seconds: float = 0.0          # Across all attempts, backoff included
+    
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+@dataclass
+class BatchReport:
+    """Running totals of a BatchProcessor run (readable while it streams)"""
+    concurrency: int
+    items: int = 0                # Finished, successfully or not
+    succeeded: int = 0
+    failed: int = 0
+    retries: int = 0
+    timeouts: int = 0
+    busy_seconds: float = 0.0     # Summed over workers
+    started_at: float = field(default_factory=time.perf_counter)
+    finished_at: Optional[float] = None
+    
+    @property
+    def elapsed_seconds(self) -> float:
+        return (self.finished_at or time.perf_counter()) - self.started_at
+    
+    @property
+    def items_per_second(self) -> float:
+        elapsed = self.elapsed_seconds
+        return self.items / elapsed if elapsed > 0 else 0.0
+    
+    @property
+    def utilization(self) -> float:
+        """Share of worker time spent processing; low means the source cannot keep up"""
+        capacity = self.elapsed_seconds * self.concurrency
+        return min(self.busy_seconds / capacity, 1.0) if capacity > 0 else 0.0
+    
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "items": self.items,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "retries": self.retries,
+            "timeouts": self.timeouts,
+            "elapsed_seconds": round(self.elapsed_seconds, 3),
+            "items_per_second": round(self.items_per_second, 2),
+            "avg_item_ms": round(self.busy_seconds / self.items * 1000, 2) if self.items else 0.0,
+            "utilization": round(self.utilization, 3)
+        }
+
+_STREAM_END = object()
+
+async def _aiter_items(items: Union[Iterable[Any], AsyncIterable[Any]]) -> AsyncIterator[Any]:
+    if hasattr(items, "__aiter__"):
+        async for item in items:
+            yield item
+    else:
+        for item in items:
+            yield item
+
 class BatchProcessor:
-    def __init__(self, batch_size: int = None, concurrency: int = None):
+    """
+    Streams items through `concurrency` workers that pull from a bounded
+    queue, so a slow item only occupies its own worker. At most `batch_size`
+    items are read ahead of the consumer (queued, running, or finished but
+    not yet yielded), which bounds memory for any input size.
+    
+        processor = BatchProcessor(concurrency=20, retries=2, timeout=30)
+        async for result in processor.stream(users_to_notify(), send_digest):
+            if not result.ok:
+                log.warning("digest_failed", user=result.item, error=str(result.error))
+        print(processor.report.summary())
+    
+    Items are retried on `retry_on` exceptions and timeouts, with
+    exponential backoff and jitter.
+    """
+    
+    def __init__(
+        self,
+        batch_size: int = None,
+        concurrency: int = None,
+        retries: int = 0,
+        timeout: Optional[float] = None,
+        retry_backoff: float = 0.1,
+        retry_on: tuple = (Exception,)
+    ):
         self.batch_size = batch_size or PerformanceConfig.BATCH_SIZE
         self.concurrency = concurrency or PerformanceConfig.CONCURRENT_TASKS
+        self.retries = retries
+        self.timeout = timeout
+        self.retry_backoff = retry_backoff
+        self.retry_on = retry_on
+        self.report = BatchReport(self.concurrency)
     
-    async def process_batch(self, items: List[Any], processor: Callable) -> List[Any]:
-        """Process items in batches with controlled concurrency"""
-        results = []
-        semaphore = asyncio.Semaphore(self.concurrency)
+    async def _run_item(self, index: int, item: Any, processor: Callable) -> BatchItemResult:
+        result = BatchItemResult(index, item)
+        started = time.perf_counter()
+        while True:
+            result.attempts += 1
+            try:
+                if self.timeout:
+                    result.value = await asyncio.wait_for(processor(item), self.timeout)
+                else:
+                    result.value = await processor(item)
+                result.error = None
+                break
+            except asyncio.TimeoutError as e:
+                self.report.timeouts += 1
+                result.error = e
+            except self.retry_on as e:
+                result.error = e
+            except Exception as e:  # Not retryable
+                result.error = e
+                break
+            if result.attempts > self.retries:
+                break
+            self.report.retries += 1
+            await asyncio.sleep(self.retry_backoff * 2 ** (result.attempts - 1) * random.uniform(0.5, 1.5))
+        result.seconds = time.perf_counter() - started
+        return result
+    
+    async def stream(
+        self,
+        items: Union[Iterable[Any], AsyncIterable[Any]],
+        processor: Callable[[Any], Any],
+        ordered: bool = False
+    ) -> AsyncIterator[BatchItemResult]:
+        """
+        Yield a BatchItemResult per item as soon as it finishes, or in input
+        order with `ordered=True` (finished items then wait behind slower
+        earlier ones, still within the `batch_size` window). Failures are
+        yielded, not raised; an error from `items` itself is raised.
+        Closing the iterator early (e.g. under contextlib.aclosing) cancels
+        the remaining work.
+        """
+        self.report = report = BatchReport(self.concurrency)
+        window = asyncio.Semaphore(self.batch_size)
+        work: asyncio.Queue = asyncio.Queue(maxsize=self.concurrency)
+        done: asyncio.Queue = asyncio.Queue()
         
-        async def process_with_semaphore(item):
-            async with semaphore:
-                return await processor(item)
+        async def produce():
+            count = 0
+            try:
+                async for item in _aiter_items(items):
+                    await window.acquire()
+                    await work.put((count, item))
+                    count += 1
+            except Exception as e:
+                await done.put((_STREAM_END, e))
+                return
+            await done.put((_STREAM_END, count))
         
-        for i in range(0, len(items), self.batch_size):
-            batch = items[i:i + self.batch_size]
-            batch_results = await asyncio.gather(
-                *[process_with_semaphore(item) for item in batch],
-                return_exceptions=True
-            )
-            results.extend(batch_results)
+        async def work_loop():
+            while True:
+                index, item = await work.get()
+                result = await self._run_item(index, item, processor)
+                report.items += 1
+                report.busy_seconds += result.seconds
+                if result.ok:
+                    report.succeeded += 1
+                else:
+                    report.failed += 1
+                await done.put((index, result))
         
-        return results
+        tasks = [asyncio.create_task(produce())] + [asyncio.create_task(work_loop()) for _ in range(self.concurrency)]
+        pending: Dict[int, BatchItemResult] = {}
+        next_index, yielded, total = 0, 0, None
+        try:
+            while total is None or yielded < total:
+                index, payload = await done.get()
+                if index is _STREAM_END:
+                    if isinstance(payload, Exception):
+                        raise payload
+                    total = payload
+                    continue
+                if not ordered:
+                    yielded += 1
+                    window.release()
+                    yield payload
+                    continue
+                pending[index] = payload
+                while next_index in pending:
+                    result = pending.pop(next_index)
+                    next_index += 1
+                    yielded += 1
+                    window.release()
+                    yield result
+        finally:
+            report.finished_at = time.perf_counter()
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+    
+    async def process_batch(self, items: Iterable[Any], processor: Callable) -> List[Any]:
+        """Values in input order, exceptions in place of failed items (as gather(return_exceptions=True))"""
+        return [
+            result.value if result.ok else result.error
+            async for result in self.stream(items, processor, ordered=True)
+        ]
 
 # ============================================
 # LAZY LOADING & PAGINATION
@@ -357,14 +2201,19 @@ class BatchProcessor:
 @dataclass
 class PaginatedResult:
     items: List[Any]
-    total: int
+    total: Optional[int]            # None when not counted
     page: int
     page_size: int
     has_next: bool
     has_prev: bool
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
+    total_is_estimate: bool = False
     
     @property
-    def total_pages(self) -> int:
+    def total_pages(self) -> Optional[int]:
+        if self.total is None:
+            return None
         return (self.total + self.page_size - 1) // self.page_size
 
 class LazyLoader:
@@ -387,7 +2236,7 @@ class LazyLoader:
 # RESPONSE COMPRESSION
 # ============================================
 
-from fastapi import Response
+from fastapi import Depends, HTTPException, Response
 from starlette.middleware.gzip import GZipMiddleware
 
 def setup_compression(app):
@@ -426,42 +2275,204 @@ background_tasks = BackgroundTaskManager()
 # PERFORMANCE MONITORING
 # ============================================
 
+class PerformanceCollector:
+    """Prometheus collector reading the cache and database telemetry at scrape time"""
+    
+    def collect(self):
+        if cache:
+            yield from self._collect_cache(cache)
+        yield from self._collect_database(DatabasePool.telemetry, DatabasePool._engine)
+    
+    @staticmethod
+    def _histogram(name: str, documentation: str, label: str, histograms: Dict[str, LatencyHistogram]):
+        family = HistogramMetricFamily(name, documentation, labels=[label])
+        for value, histogram in histograms.items():
+            family.add_metric([value], histogram.cumulative(), sum_value=histogram.sum)
+        return family
+    
+    def _collect_cache(self, cache: "MultiLevelCache"):
+        telemetry = cache.telemetry
+        requests = CounterMetricFamily(
+            "roady_cache_requests", "Cache lookups by key prefix, level and result", labels=["prefix", "level", "result"]
+        )
+        seconds = CounterMetricFamily(
+            "roady_cache_lookup_seconds_by_prefix", "Time spent in cache lookups by key prefix and level",
+            labels=["prefix", "level"]
+        )
+        for (prefix, level), (hits, misses, spent) in list(telemetry.lookups.items()):
+            requests.add_metric([prefix, level, "hit"], hits)
+            requests.add_metric([prefix, level, "miss"], misses)
+            seconds.add_metric([prefix, level], spent)
+        yield requests
+        yield seconds
+        yield self._histogram(
+            "roady_cache_lookup_seconds", "Cache lookup latency by level (L2 includes decoding)", "level", telemetry.latency
+        )
+        
+        loads = CounterMetricFamily("roady_cache_loads", "Loader executions behind get_or_compute", labels=["prefix"])
+        load_seconds = CounterMetricFamily("roady_cache_load_seconds", "Time spent in loaders", labels=["prefix"])
+        stale = CounterMetricFamily("roady_cache_stale_served", "Stale values served while refreshing", labels=["prefix"])
+        for prefix, (count, spent, stale_count) in list(telemetry.loads.items()):
+            loads.add_metric([prefix], count)
+            load_seconds.add_metric([prefix], spent)
+            stale.add_metric([prefix], stale_count)
+        yield loads
+        yield load_seconds
+        yield stale
+        
+        l1 = cache.l1_cache
+        yield GaugeMetricFamily("roady_cache_l1_entries", "Entries in this worker's L1 cache", value=len(l1))
+        yield GaugeMetricFamily("roady_cache_l1_bytes", "Approximate size of this worker's L1 cache", value=l1.bytes)
+        events = CounterMetricFamily("roady_cache_l1_removals", "L1 entries removed by the cache itself", labels=["reason"])
+        for reason in ("evictions", "expirations", "rejections"):
+            events.add_metric([reason], l1.stats[reason])
+        yield events
+        yield CounterMetricFamily(
+            "roady_cache_pickle_fallbacks", "Values the cache codec had to pickle", value=cache.codec.pickle_fallbacks
+        )
+    
+    def _collect_database(self, telemetry: DatabaseTelemetry, engine):
+        yield self._histogram(
+            "roady_db_query_seconds", "Query latency by operation", "operation", dict(telemetry.queries)
+        )
+        yield CounterMetricFamily(
+            "roady_db_slow_queries", f"Queries slower than {PerformanceConfig.SLOW_QUERY_SECONDS}s",
+            value=telemetry.slow_queries
+        )
+        wait = HistogramMetricFamily("roady_db_pool_checkout_wait_seconds", "Time to obtain a pooled connection")
+        wait.add_metric([], telemetry.pool_wait.cumulative(), sum_value=telemetry.pool_wait.sum)
+        yield wait
+        yield CounterMetricFamily(
+            "roady_db_pool_checkout_timeouts", "Checkouts that gave up after DB_POOL_TIMEOUT", value=telemetry.pool_timeouts
+        )
+        pool = engine.pool if engine is not None else None
+        if hasattr(pool, "checkedout"):
+            connections = GaugeMetricFamily("roady_db_pool_connections", "Pooled connections by state", labels=["state"])
+            connections.add_metric(["checked_out"], pool.checkedout())
+            connections.add_metric(["idle"], pool.checkedin())
+            connections.add_metric(["overflow"], max(pool.overflow(), 0))
+            yield connections
+
+REGISTRY.register(PerformanceCollector())
+
+
 @dataclass
 class PerformanceMetrics:
-    cache_hit_rate: float
+    """Summary for the performance endpoint; cumulative since this worker started"""
+    cache_hit_rate: float                 # Lookups answered by L1 or L2
     avg_query_time_ms: float
     active_connections: int
     memory_usage_mb: float
+    cache_lookups: int = 0
+    l1_hit_rate: float = 0.0
+    l2_hit_rate: float = 0.0              # Of the lookups that reached Redis
+    l2_avg_latency_ms: float = 0.0
+    cache_by_prefix: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    queries: int = 0
+    query_p95_ms: float = 0.0
+    slow_queries: int = 0
+    pool_checkouts: int = 0
+    pool_wait_avg_ms: float = 0.0
+    pool_wait_p95_ms: float = 0.0
+    pool_timeouts: int = 0
+
+def _ratio(part: float, whole: float) -> float:
+    return round(part / whole, 4) if whole else 0.0
+
+def _cache_by_prefix(telemetry: CacheTelemetry) -> Dict[str, Dict[str, Any]]:
+    by_prefix: Dict[str, Dict[str, Any]] = {}
+    for (prefix, level), (hits, misses, spent) in list(telemetry.lookups.items()):
+        stats = by_prefix.setdefault(prefix, {"lookups": 0})
+        if level == CacheLevel.L1_MEMORY:
+            stats["lookups"] = hits + misses
+            stats["l1_hits"] = hits
+        else:
+            stats["l2_hits"] = hits
+            stats["l2_misses"] = misses
+            stats["l2_avg_latency_ms"] = round(spent / (hits + misses) * 1000, 3) if hits + misses else 0.0
+    for prefix, (loads, spent, stale) in list(telemetry.loads.items()):
+        stats = by_prefix.setdefault(prefix, {"lookups": 0})
+        stats["loads"] = loads
+        stats["avg_load_ms"] = round(spent / loads * 1000, 2) if loads else 0.0
+        stats["stale_served"] = stale
+    for stats in by_prefix.values():
+        stats["hit_rate"] = _ratio(stats.get("l1_hits", 0) + stats.get("l2_hits", 0), stats["lookups"])
+    return by_prefix
 
 async def get_performance_metrics() -> PerformanceMetrics:
     """Get current performance metrics"""
     import psutil
     
+    metrics = PerformanceMetrics(cache_hit_rate=0.0, avg_query_time_ms=0.0, active_connections=0, memory_usage_mb=0.0)
+    
     # Cache stats
     if cache:
-        l1_size = len(cache.l1_cache)
-        # Calculate hit rate from prometheus metrics if available
-        hit_rate = 0.85  # Placeholder
-    else:
-        hit_rate = 0.0
+        telemetry = cache.telemetry
+        l1_hits, l1_misses = telemetry.totals(CacheLevel.L1_MEMORY)
+        l2_hits, l2_misses = telemetry.totals(CacheLevel.L2_REDIS)
+        metrics.cache_lookups = l1_hits + l1_misses
+        metrics.cache_hit_rate = _ratio(l1_hits + l2_hits, metrics.cache_lookups)
+        metrics.l1_hit_rate = _ratio(l1_hits, metrics.cache_lookups)
+        metrics.l2_hit_rate = _ratio(l2_hits, l2_hits + l2_misses)
+        metrics.l2_avg_latency_ms = round(telemetry.latency[CacheLevel.L2_REDIS].mean * 1000, 3)
+        metrics.cache_by_prefix = _cache_by_prefix(telemetry)
+    
+    # Queries
+    db = DatabasePool.telemetry
+    merged = LatencyHistogram(PerformanceConfig.QUERY_LATENCY_BUCKETS)
+    for histogram in list(db.queries.values()):
+        merged.counts = [a + b for a, b in zip(merged.counts, histogram.counts)]
+        merged.sum += histogram.sum
+        merged.count += histogram.count
+    metrics.queries = merged.count
+    metrics.avg_query_time_ms = round(merged.mean * 1000, 2)
+    metrics.query_p95_ms = round(merged.quantile(0.95) * 1000, 2)
+    metrics.slow_queries = db.slow_queries
     
     # DB connections
+    metrics.pool_checkouts = db.pool_wait.count
+    metrics.pool_wait_avg_ms = round(db.pool_wait.mean * 1000, 3)
+    metrics.pool_wait_p95_ms = round(db.pool_wait.quantile(0.95) * 1000, 3)
+    metrics.pool_timeouts = db.pool_timeouts
     if DatabasePool._engine:
         pool = DatabasePool._engine.pool
-        active = pool.checkedout() if hasattr(pool, 'checkedout') else 0
-    else:
-        active = 0
+        metrics.active_connections = pool.checkedout() if hasattr(pool, 'checkedout') else 0
     
     # Memory
     process = psutil.Process()
-    memory_mb = process.memory_info().rss / 1024 / 1024
+    metrics.memory_usage_mb = process.memory_info().rss / 1024 / 1024
     
-    return PerformanceMetrics(
-        cache_hit_rate=hit_rate,
-        avg_query_time_ms=15.0,  # From metrics
-        active_connections=active,
-        memory_usage_mb=memory_mb
-    )
+    return metrics
+
+def setup_performance_routes(app, admin_dependency: Callable):
+    """
+    Expose get_performance_metrics (Prometheus picks the same data up from /metrics)
+    and the statement statistics. `admin_dependency` guards the /admin routes:
+    statement text reveals schema and query shapes, and DELETE resets the counters.
+    """
+    admin_only = [Depends(admin_dependency)]
+    
+    @app.get("/metrics/performance")
+    async def performance_metrics():
+        return asdict(await get_performance_metrics())
+
+    # Statement statistics by fingerprint
+    @app.get("/admin/performance/statements", dependencies=admin_only)
+    async def statement_statistics(sort: str = "total", limit: int = 50):
+        stats = DatabasePool.telemetry.statements
+        if sort not in StatementStats.SORT_KEYS:
+            raise HTTPException(status_code=400, detail=f"sort must be one of {', '.join(StatementStats.SORT_KEYS)}")
+        return {
+            "since": stats.since.isoformat(),
+            "fingerprints": len(stats.entries),
+            "evicted": stats.evicted,
+            "statements": stats.top(sort, max(1, min(limit, PerformanceConfig.STATEMENT_STATS_MAX)))
+        }
+
+    @app.delete("/admin/performance/statements", dependencies=admin_only)
+    async def reset_statement_statistics():
+        DatabasePool.telemetry.statements.reset()
+        return {"reset": True}
 
 # ============================================
 # SETUP
@@ -473,9 +2484,11 @@ async def init_performance(database_url: str, redis_url: str):
     
     DatabasePool.init(database_url)
     cache = MultiLevelCache(redis_url)
+    cache.start_invalidation_listener()
     
     return {
         "database_pool": "initialized",
         "multi_level_cache": "initialized",
+        "l1_invalidation": "subscribed",
         "compression": "enabled"
     }
@@ -0,0 +1,80 @@
+"""
+ROADY Construction - Project Statistics Maintenance
+Install, rebuild and verify the trigger-maintained project_stats table
+
+Usage:
+    python roady-project-stats.py install
+    python roady-project-stats.py rebuild [--project ID ...]
+    python roady-project-stats.py check [--project ID ...] [--repair]
+
+`check` exits with status 1 when drift is found (after repairing it with
+--repair), so it can run from cron and alert.
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+
+from src.performance import DatabasePool, ProjectStatsMaintainer
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="ROADY project_stats maintenance")
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL"), help="postgresql://... (asyncpg is used)")
+    parser.add_argument("--batch-size", type=int, default=500, help="Projects per transaction")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    sub.add_parser("install", help="Create table, functions and triggers, then fill the table")
+
+    rebuild = sub.add_parser("rebuild", help="Recompute stats from tasks, expenses and project_members")
+    rebuild.add_argument("--project", action="append", dest="projects", help="Only this project (repeatable)")
+
+    check = sub.add_parser("check", help="Report projects whose stats drifted from the child tables")
+    check.add_argument("--project", action="append", dest="projects", help="Only this project (repeatable)")
+    check.add_argument("--repair", action="store_true", help="Rebuild drifted projects")
+    return parser.parse_args(argv)
+
+
+async def run(args) -> int:
+    if not args.database_url:
+        print("❌ DATABASE_URL is not set (or pass --database-url)")
+        return 2
+
+    # A maintenance run needs a couple of connections, not the API pool
+    DatabasePool.init(args.database_url, pool_size=2, max_overflow=0)
+    try:
+        async with await DatabasePool.get_session() as session:
+            maintainer = ProjectStatsMaintainer(session, batch_size=args.batch_size)
+
+            if args.command == "install":
+                count = await maintainer.install()
+                print(f"✅ project_stats installed, {count} projects filled")
+                return 0
+
+            if args.command == "rebuild":
+                count = await maintainer.rebuild(args.projects)
+                print(f"✅ Rebuilt stats for {count} projects")
+                return 0
+
+            drifted = await maintainer.check(args.projects, repair=args.repair)
+            for entry in drifted:
+                details = ", ".join(
+                    f"{column}: {stored} != {actual}" for column, (stored, actual) in entry["differences"].items()
+                )
+                print(f"⚠️ {entry['project_id']}: {details}")
+            if not drifted:
+                print("✅ project_stats is consistent")
+                return 0
+            print(f"{'🔧 Repaired' if args.repair else '❌ Found'} {len(drifted)} drifted projects")
+            return 1
+    finally:
+        await DatabasePool.close()
+
+
+def main(argv=None):
+    sys.exit(asyncio.run(run(parse_args(argv))))
+
+
+if __name__ == "__main__":
+    main()
@@ -747,6 +747,1861 @@ class TestFullWorkflow:
         assert "concrete" in response.lower() or "m³" in response
 
 
+# ============================================
+# tests/unit/test_agent_registry.py
+# ============================================
+
+import pytest
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+import roady_agent_registry
+from roady_agent_registry import AgentRegistry
+
+
+def make_agent(agent_id: str, updated_at: datetime, is_active: bool = True):
+    return SimpleNamespace(
+        agent_id=agent_id, agent_name=agent_id.title(), department="construction", level=2,
+        capability_keywords=["béton"], reports_to=None, is_active=is_active, updated_at=updated_at,
+        primary_llm_provider="anthropic", primary_llm_model="claude", fallback_llm_provider=None,
+        fallback_llm_model=None, secondary_fallback_provider=None, secondary_fallback_model=None,
+        temperature=0.7, top_p=0.9, max_tokens_per_request=4000, custom_system_prompt=None,
+        auto_downgrade_on_budget=True
+    )
+
+
+class FakeAgentRepository:
+    """AgentRepository over a dict, with the same >= watermark semantics"""
+    rows: dict = {}
+    calls = 0
+    
+    def __init__(self, session):
+        pass
+    
+    def get_all_active(self):
+        return [a for a in self.rows.values() if a.is_active]
+    
+    def get_updated_since(self, watermark):
+        FakeAgentRepository.calls += 1
+        return [a for a in self.rows.values() if a.updated_at >= watermark]
+    
+    def get_by_id(self, agent_id):
+        return self.rows.get(agent_id)
+
+
+class TestAgentRegistry:
+    """Tests for snapshot refreshes driven by the updated_at watermark."""
+    
+    @pytest.fixture
+    def registry(self, monkeypatch):
+        monkeypatch.setattr(roady_agent_registry, "AgentRepository", FakeAgentRepository)
+        t0 = datetime(2025, 1, 1)
+        FakeAgentRepository.rows = {"estimator": make_agent("estimator", t0), "planner": make_agent("planner", t0)}
+        registry = AgentRegistry()
+        registry.load(session=None)
+        return registry
+    
+    def test_deactivation_removes_agent_and_advances_watermark(self, registry):
+        later = datetime(2025, 1, 2)
+        FakeAgentRepository.rows["planner"] = make_agent("planner", later, is_active=False)
+        
+        assert registry.refresh(session=None) is True
+        assert registry.get("planner") is None
+        assert registry.snapshot.watermark == later
+    
+    def test_inactive_row_is_not_refetched_forever(self, registry):
+        later = datetime(2025, 1, 2)
+        FakeAgentRepository.rows["ghost"] = make_agent("ghost", later, is_active=False)
+        version = registry.version
+        
+        # Nothing visible changed, but the watermark moves past the inactive row
+        assert registry.refresh(session=None) is False
+        assert registry.version == version
+        assert registry.snapshot.watermark == later
+        
+        FakeAgentRepository.rows = {k: v for k, v in FakeAgentRepository.rows.items() if v.updated_at >= later}
+        assert registry.refresh(session=None) is False
+        assert registry.snapshot.watermark == later
+
+
+# ============================================
+# tests/unit/test_admission_control.py
+# ============================================
+
+import asyncio
+import pytest
+from roady_admission_control import AdmissionController, AdmissionRejected
+from roady_billing import PlanTier
+
+
+async def hold_slot(controller: AdmissionController, user_id: str, release: asyncio.Event, tier=PlanTier.ENTERPRISE):
+    async with controller.admit(user_id, tier):
+        await release.wait()
+
+
+class TestAdmissionControl:
+    """Tests for fair queuing, shedding and waiter cleanup."""
+    
+    @pytest.mark.asyncio
+    async def test_fair_queuing_interleaves_tenants(self):
+        controller = AdmissionController(capacity=1, max_queue_wait=5)
+        release = asyncio.Event()
+        order = []
+        
+        async def job(user_id: str, label: str):
+            async with controller.admit(user_id, PlanTier.ENTERPRISE):
+                order.append(label)
+        
+        holder = asyncio.create_task(hold_slot(controller, "noisy", release))
+        await asyncio.sleep(0)
+        jobs = [asyncio.create_task(job("noisy", f"noisy-{i}")) for i in range(3)]
+        await asyncio.sleep(0)
+        jobs.append(asyncio.create_task(job("quiet", "quiet-0")))
+        await asyncio.sleep(0)
+        
+        release.set()
+        await asyncio.gather(holder, *jobs)
+        
+        # The quiet tenant's first request does not wait behind the noisy backlog
+        assert order == ["noisy-0", "quiet-0", "noisy-1", "noisy-2"]
+    
+    @pytest.mark.asyncio
+    async def test_tenant_queue_full_is_429_with_retry_after(self):
+        controller = AdmissionController(capacity=10, max_queue_wait=5)
+        release = asyncio.Event()
+        holders = [asyncio.create_task(hold_slot(controller, "free-user", release, PlanTier.FREE)) for _ in range(3)]
+        await asyncio.sleep(0)
+        
+        with pytest.raises(AdmissionRejected) as exc:
+            async with controller.admit("free-user", PlanTier.FREE):
+                pass
+        
+        assert exc.value.status_code == 429
+        assert exc.value.reason == "tenant_queue_full"
+        assert int(exc.value.headers["Retry-After"]) >= 1
+        release.set()
+        await asyncio.gather(*holders)
+    
+    @pytest.mark.asyncio
+    async def test_global_queue_limit_is_503(self):
+        controller = AdmissionController(capacity=1, global_queue_limit=1, max_queue_wait=5)
+        release = asyncio.Event()
+        holders = [asyncio.create_task(hold_slot(controller, user, release)) for user in ("a", "b")]
+        await asyncio.sleep(0)
+        
+        with pytest.raises(AdmissionRejected) as exc:
+            async with controller.admit("c", PlanTier.ENTERPRISE):
+                pass
+        
+        assert exc.value.status_code == 503
+        assert exc.value.reason == "overloaded"
+        assert "Retry-After" in exc.value.headers
+        release.set()
+        await asyncio.gather(*holders)
+    
+    @pytest.mark.asyncio
+    async def test_queue_timeout_is_503_and_leaves_no_waiter(self):
+        controller = AdmissionController(capacity=1, max_queue_wait=0.05)
+        release = asyncio.Event()
+        holder = asyncio.create_task(hold_slot(controller, "a", release))
+        await asyncio.sleep(0)
+        
+        with pytest.raises(AdmissionRejected) as exc:
+            async with controller.admit("b", PlanTier.ENTERPRISE):
+                pass
+        
+        assert exc.value.status_code == 503
+        assert exc.value.reason == "queue_timeout"
+        assert controller._heap == []
+        assert controller.get_stats()["waiting"] == 0
+        release.set()
+        await holder
+    
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_is_dropped_from_the_heap(self):
+        controller = AdmissionController(capacity=1, max_queue_wait=5)
+        release = asyncio.Event()
+        holder = asyncio.create_task(hold_slot(controller, "a", release))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(hold_slot(controller, "b", release))
+        await asyncio.sleep(0)
+        assert len(controller._heap) == 1
+        
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        
+        assert controller._heap == []
+        assert controller.get_stats()["waiting"] == 0
+        release.set()
+        await holder
+        
+        # Back on the fast path: admitted without queuing
+        queued = controller.stats["queued"]
+        async with controller.admit("c", PlanTier.ENTERPRISE):
+            assert controller.get_stats()["in_flight"] == 1
+        assert controller.stats["queued"] == queued
+        assert controller.get_stats()["in_flight"] == 0
+    
+    @pytest.mark.asyncio
+    async def test_budget_rejection_releases_reservation(self):
+        controller = AdmissionController(capacity=4)
+        
+        with pytest.raises(AdmissionRejected) as exc:
+            async with controller.admit("a", PlanTier.STARTER, predicted_cost=2.0, remaining_budget=1.0):
+                pass
+        
+        assert exc.value.status_code == 429
+        assert exc.value.reason == "budget_exhausted"
+        async with controller.admit("a", PlanTier.STARTER, predicted_cost=0.5, remaining_budget=1.0):
+            pass
+        assert controller._tenants["user:a"].reserved_cost == 0
+
+
+# ============================================
+# tests/unit/test_performance_l1.py
+# ============================================
+
+import pytest
+from src.performance import L1Cache
+
+
+class FakeClock:
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+    
+    def __call__(self) -> float:
+        return self.now
+    
+    def advance(self, seconds: float):
+        self.now += seconds
+
+
+def stored_bytes(cache: L1Cache) -> int:
+    return sum(e.size for region in (cache._window, cache._main) for e in region.values())
+
+
+class TestL1Cache:
+    """Tests for W-TinyLFU admission, timing-wheel expiry and byte accounting."""
+    
+    @pytest.fixture
+    def clock(self) -> FakeClock:
+        return FakeClock()
+    
+    def test_entry_expires_after_ttl(self, clock: FakeClock):
+        cache = L1Cache(max_entries=10, clock=clock)
+        cache.set("project:1", {"id": 1}, ttl=10)
+        
+        clock.advance(9)
+        assert cache.get("project:1") == {"id": 1}
+        clock.advance(2)
+        assert cache.get("project:1") is None
+        assert cache.stats["expirations"] == 1
+    
+    def test_wheel_drops_expired_entries_without_reads(self, clock: FakeClock):
+        cache = L1Cache(max_entries=100, clock=clock)
+        for i in range(50):
+            cache.set(f"project:{i}", i, ttl=5, size=10)
+        
+        clock.advance(6)
+        cache.get("unrelated")  # Any operation advances the wheel
+        
+        assert len(cache) == 0
+        assert cache.bytes == 0
+        assert cache.stats["expirations"] == 50
+    
+    def test_ttl_longer_than_wheel_span_is_rescheduled(self, clock: FakeClock):
+        cache = L1Cache(max_entries=10, wheel_slots=8, wheel_tick=1.0, clock=clock)  # 8s span
+        cache.set("projects.list", [1, 2, 3], ttl=20)
+        
+        for _ in range(19):
+            clock.advance(1)
+            cache.get("unrelated")
+            assert "projects.list" in cache
+        
+        clock.advance(2)
+        cache.get("unrelated")
+        assert "projects.list" not in cache
+        assert cache.stats["expirations"] == 1
+    
+    def test_tinylfu_keeps_hot_entries_through_a_scan(self, clock: FakeClock):
+        cache = L1Cache(max_entries=100, max_bytes=None, policy="tinylfu", clock=clock)
+        hot = [f"project:{i}" for i in range(90)]
+        for key in hot:
+            cache.set(key, key, ttl=3600)
+        for _ in range(5):
+            for key in hot:
+                assert cache.get(key) == key
+        
+        for i in range(1000):
+            cache.set(f"scan:{i}", i, ttl=3600)
+        
+        # Sketch collisions (string hashes are randomized) may let a few scan keys in
+        assert sum(key in cache for key in hot) >= 0.9 * len(hot)
+        assert cache.stats["rejections"] > 0
+        assert len(cache) <= 100
+    
+    def test_lru_is_flushed_by_the_same_scan(self, clock: FakeClock):
+        cache = L1Cache(max_entries=100, max_bytes=None, policy="lru", clock=clock)
+        hot = [f"project:{i}" for i in range(90)]
+        for key in hot:
+            cache.set(key, key, ttl=3600)
+            cache.get(key)
+        
+        for i in range(1000):
+            cache.set(f"scan:{i}", i, ttl=3600)
+        
+        assert not any(key in cache for key in hot)
+    
+    def test_byte_budget_and_accounting(self, clock: FakeClock):
+        cache = L1Cache(max_entries=100, max_bytes=100, policy="lru", clock=clock)
+        cache.set("a", "a", ttl=60, size=40)
+        cache.set("b", "b", ttl=60, size=40)
+        cache.set("c", "c", ttl=60, size=40)
+        
+        assert "a" not in cache  # Oldest evicted to fit the byte budget
+        assert cache.bytes == stored_bytes(cache) == 80
+        
+        cache.set("b", "b2", ttl=60, size=10)  # Overwrite adjusts by the size difference
+        assert cache.bytes == stored_bytes(cache) == 50
+        
+        cache.delete("c")
+        assert cache.bytes == stored_bytes(cache) == 10
+        
+        clock.advance(61)
+        cache.get("b")
+        assert cache.bytes == 0
+    
+    def test_rejected_candidates_release_their_bytes(self, clock: FakeClock):
+        cache = L1Cache(max_entries=100, max_bytes=None, policy="tinylfu", clock=clock)
+        for i in range(300):
+            cache.set(f"k:{i}", i, ttl=3600, size=7)
+            if i < 50:
+                cache.get(f"k:{i}")
+        
+        assert cache.stats["rejections"] > 0
+        assert cache.bytes == stored_bytes(cache) == 7 * len(cache)
+    
+    def test_unknown_policy_is_rejected(self):
+        with pytest.raises(ValueError):
+            L1Cache(policy="fifo")
+
+
+# ============================================
+# tests/unit/test_performance_cache.py
+# ============================================
+
+import asyncio
+import json
+import time
+import pytest
+from src.performance import CacheEnvelope, MultiLevelCache, PerformanceConfig, cached
+
+
+class FakeRedis:
+    """The commands MultiLevelCache uses, each taking `latency` seconds (TTLs are ignored)"""
+    
+    def __init__(self, latency: float = 0.005):
+        self.latency = latency
+        self.slow: dict = {}  # Command -> latency override
+        self.data: dict = {}
+        self.published: list = []
+    
+    async def _tick(self, command: str = None):
+        await asyncio.sleep(self.slow.get(command, self.latency))
+    
+    async def get(self, key):
+        await self._tick()
+        return self.data.get(key)
+    
+    async def set(self, key, value, nx=False, px=None):
+        await self._tick("set")
+        if nx and key in self.data:
+            return None
+        self.data[key] = value
+        return True
+    
+    async def setex(self, key, ttl, value):
+        await self._tick()
+        self.data[key] = value
+    
+    async def delete(self, *keys):
+        await self._tick()
+        return sum(self.data.pop(key, None) is not None for key in keys)
+    
+    async def eval(self, script, numkeys, *args):
+        await self._tick()
+        keys, argv = args[:numkeys], args[numkeys:]
+        if script == MultiLevelCache.RELEASE_LOCK_SCRIPT:
+            if self.data.get(keys[0]) == argv[0]:
+                return await self.delete(keys[0])
+            return 0
+        if script == MultiLevelCache.SET_TAGGED_SCRIPT:
+            self.data[keys[0]] = argv[1]
+            for tag in keys[1:]:
+                self.data.setdefault(tag, set()).add(keys[0])
+            return 1
+        if script == MultiLevelCache.INVALIDATE_TAGS_SCRIPT:
+            deleted = []
+            for tag in keys:
+                members = sorted(self.data.pop(tag, set()))
+                for member in members:
+                    self.data.pop(member, None)
+                deleted.extend(member.encode() for member in members)
+            return deleted
+        raise NotImplementedError(script)
+    
+    async def incr(self, key):
+        await self._tick()
+        self.data[key] = int(self.data.get(key) or 0) + 1
+        return self.data[key]
+    
+    async def publish(self, channel, message):
+        await self._tick()
+        self.published.append((channel, message))
+        return 0
+    
+    async def close(self):
+        pass
+
+
+class TestGetOrCompute:
+    """Tests for single-flight loads and background refreshes."""
+    
+    @pytest.fixture
+    def cache(self) -> MultiLevelCache:
+        cache = MultiLevelCache("redis://localhost:6379/15")
+        cache.redis = FakeRedis()
+        return cache
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_share_one_load(self, cache: MultiLevelCache):
+        calls = 0
+        
+        async def loader():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.02)
+            return {"projects": [1, 2]}
+        
+        results = await asyncio.gather(*[cache.get_or_compute("projects.list:1", loader) for _ in range(10)])
+        
+        assert calls == 1
+        assert all(result == {"projects": [1, 2]} for result in results)
+    
+    @pytest.mark.asyncio
+    async def test_miss_joining_a_skipped_refresh_still_loads(self, cache: MultiLevelCache, monkeypatch):
+        monkeypatch.setattr(PerformanceConfig, "CACHE_LOCK_LEASE_MS", 200)
+        monkeypatch.setattr(PerformanceConfig, "CACHE_LOCK_POLL", 0.01)
+        key = "projects.list:1"
+        
+        async def loader():
+            return "fresh"
+        
+        # A stale entry while another worker holds the recompute lease
+        await cache.set(key, CacheEnvelope("stale", time.time() - 1, 0.01), ttl=60)
+        cache.redis.data[f"lock:{key}"] = "other-worker"
+        
+        cache.redis.slow["set"] = 0.05  # The refresh's lease attempt is still pending below
+        assert await cache.get_or_compute(key, loader, stale_ttl=60) == "stale"
+        await asyncio.sleep(0)
+        assert key in cache._inflight
+        
+        # A write on another worker invalidates the key (L2 delete + pub/sub to our L1)
+        del cache.redis.data[f"cache:{key}"]
+        cache.l1_cache.delete(key)
+        
+        # This miss joins the refresh, which then stands down on the taken lease
+        assert await cache.get_or_compute(key, loader, stale_ttl=60) == "fresh"
+    
+    @pytest.mark.asyncio
+    async def test_miss_waits_for_the_lease_holder_result(self, cache: MultiLevelCache, monkeypatch):
+        monkeypatch.setattr(PerformanceConfig, "CACHE_LOCK_POLL", 0.01)
+        key = "projects.list:2"
+        cache.redis.data[f"lock:{key}"] = "other-worker"
+        
+        async def other_worker_finishes():
+            await asyncio.sleep(0.05)
+            data = cache.codec.encode(CacheEnvelope("from other worker", time.time() + 60, 0.01))
+            cache.redis.data[f"cache:{key}"] = data
+            del cache.redis.data[f"lock:{key}"]
+        
+        async def loader():
+            raise AssertionError("the lease holder computes, not us")
+        
+        finisher = asyncio.create_task(other_worker_finishes())
+        assert await cache.get_or_compute(key, loader) == "from other worker"
+        await finisher
+
+
+class TestInvalidation:
+    """Tests for tag and namespace invalidation."""
+    
+    @pytest.fixture
+    def cache(self, monkeypatch) -> MultiLevelCache:
+        cache = MultiLevelCache("redis://localhost:6379/15")
+        cache.redis = FakeRedis(latency=0)
+        monkeypatch.setattr("src.performance.cache", cache)
+        return cache
+    
+    @pytest.mark.asyncio
+    async def test_tagged_set_registers_the_key(self, cache: MultiLevelCache):
+        await cache.set("project:1", {"id": 1}, ttl=60, tags=["project:1", "user:u1"])
+        await cache.set("project:2", {"id": 2}, ttl=60, tags=["user:u1"])
+        
+        assert cache.redis.data["tag:project:1"] == {"cache:project:1"}
+        assert cache.redis.data["tag:user:u1"] == {"cache:project:1", "cache:project:2"}
+    
+    @pytest.mark.asyncio
+    async def test_invalidate_tags_deletes_exactly_the_tagged_keys(self, cache: MultiLevelCache):
+        await cache.set("project:1", {"id": 1}, ttl=60, tags=["user:u1"])
+        await cache.set("project:2", {"id": 2}, ttl=60, tags=["user:u1"])
+        await cache.set("project:3", {"id": 3}, ttl=60, tags=["user:u2"])
+        
+        assert await cache.invalidate_tags("user:u1") == 2
+        
+        assert "cache:project:1" not in cache.redis.data
+        assert "cache:project:2" not in cache.redis.data
+        assert "tag:user:u1" not in cache.redis.data
+        assert cache.l1_cache.get("project:1") is None
+        assert cache.l1_cache.get("project:2") is None
+        assert await cache.get("project:3") == {"id": 3}
+        assert cache.redis.data["tag:user:u2"] == {"cache:project:3"}
+    
+    @pytest.mark.asyncio
+    async def test_invalidate_tags_tells_other_workers(self, cache: MultiLevelCache):
+        await cache.set("project:1", {"id": 1}, ttl=60, tags=["user:u1"])
+        
+        await cache.invalidate_tags("user:u1", "user:unknown")
+        
+        assert cache.redis.published == [
+            (PerformanceConfig.CACHE_INVALIDATION_CHANNEL, json.dumps([cache.origin, "k", ["project:1"]], separators=(",", ":")))
+        ]
+    
+    @pytest.mark.asyncio
+    async def test_decorated_results_are_invalidated_by_tag(self, cache: MultiLevelCache):
+        calls = []
+        
+        @cached(ttl=60, key_prefix="projects.list", invalidate_on=["user:{user_id}"])
+        async def list_projects(user_id: str, page: int = 1):
+            calls.append((user_id, page))
+            return [user_id, page]
+        
+        for user_id, page in [("u1", 1), ("u1", 2), ("u2", 1)]:
+            await list_projects(user_id, page)
+        await cache.invalidate_tags("user:u1")
+        for user_id, page in [("u1", 1), ("u1", 2), ("u2", 1)]:
+            await list_projects(user_id, page)
+        
+        assert calls == [("u1", 1), ("u1", 2), ("u2", 1), ("u1", 1), ("u1", 2)]
+    
+    @pytest.mark.asyncio
+    async def test_bump_namespace_orphans_old_keys(self, cache: MultiLevelCache):
+        calls = 0
+        
+        @cached(ttl=60, key_prefix="projects.list", namespace="projects")
+        async def list_projects(user_id: str):
+            nonlocal calls
+            calls += 1
+            return calls
+        
+        assert await list_projects("u1") == 1
+        old_keys = {key for key in cache.redis.data if key.startswith("cache:")}
+        
+        await list_projects.invalidate_all()
+        
+        assert await list_projects("u1") == 2
+        assert await list_projects("u1") == 2
+        assert cache.redis.data["ns:projects"] == 1
+        # The old entry is not deleted, just never read again (it expires by TTL)
+        assert old_keys < {key for key in cache.redis.data if key.startswith("cache:")}
+
+
+class FakePubSub:
+    """Delivers `messages`, then blocks until `drop` is set and fails like a lost connection"""
+    
+    def __init__(self, messages=()):
+        self.messages = list(messages)
+        self.subscribed = asyncio.Event()
+        self.drop = asyncio.Event()
+    
+    async def subscribe(self, channel):
+        self.subscribed.set()
+    
+    async def listen(self):
+        for message in self.messages:
+            yield {"type": "message", "data": message}
+        await self.drop.wait()
+        raise ConnectionError("connection reset by peer")
+    
+    async def close(self):
+        pass
+
+
+class TestCrossProcessInvalidation:
+    """Tests for applying other workers' invalidations to L1."""
+    
+    @pytest.fixture
+    def cache(self) -> MultiLevelCache:
+        cache = MultiLevelCache("redis://localhost:6379/15")
+        cache.redis = FakeRedis(latency=0)
+        for key in ["project:1", "project:2", "project:3"]:
+            cache.l1_cache.set(key, {"key": key}, 60)
+        return cache
+    
+    @staticmethod
+    def message(origin: str, op: str, payload: list) -> bytes:
+        return json.dumps([origin, op, payload]).encode()
+    
+    def test_own_messages_are_skipped(self, cache: MultiLevelCache):
+        cache._apply_invalidation(self.message(cache.origin, "f", []))
+        
+        assert cache.l1_cache.get("project:1") is not None
+    
+    def test_key_eviction(self, cache: MultiLevelCache):
+        cache._apply_invalidation(self.message("peer", "k", ["project:1", "project:3", "project:9"]))
+        
+        assert cache.l1_cache.get("project:1") is None
+        assert cache.l1_cache.get("project:2") is not None
+        assert cache.l1_cache.get("project:3") is None
+    
+    @pytest.mark.asyncio
+    async def test_namespace_bump_is_adopted_without_a_redis_read(self, cache: MultiLevelCache):
+        cache.redis.data["ns:projects"] = 3
+        assert await cache.namespace_version("projects") == 3
+        
+        cache._apply_invalidation(self.message("peer", "n", ["projects", 4]))
+        cache.redis.data["ns:projects"] = 99  # Must not be read again while the local copy is fresh
+        
+        assert await cache.namespace_version("projects") == 4
+    
+    def test_flush(self, cache: MultiLevelCache):
+        cache._namespaces["projects"] = (2, time.monotonic())
+        
+        cache._apply_invalidation(self.message("peer", "f", []))
+        
+        assert all(cache.l1_cache.get(key) is None for key in ["project:1", "project:2", "project:3"])
+        assert cache._namespaces == {}
+    
+    def test_malformed_messages_are_ignored(self, cache: MultiLevelCache):
+        for data in [b"not json", b"[]", b"null"]:
+            cache._apply_invalidation(data)
+        
+        assert cache.l1_cache.get("project:1") is not None
+    
+    @pytest.mark.asyncio
+    async def test_large_invalidation_flushes_peers(self, cache: MultiLevelCache, monkeypatch):
+        monkeypatch.setattr(PerformanceConfig, "CACHE_INVALIDATION_MAX_KEYS", 2)
+        peer = MultiLevelCache("redis://localhost:6379/15")
+        peer.redis = cache.redis
+        for key in ["project:1", "project:2", "project:3"]:
+            await peer.set(key, {"key": key}, ttl=60, tags=["user:u1"])
+        
+        await peer.invalidate_tags("user:u1")
+        
+        [(channel, data)] = cache.redis.published
+        assert json.loads(data) == [peer.origin, "f", []]
+        cache.l1_cache.set("project:9", {"key": "project:9"}, 60)
+        cache._apply_invalidation(data)
+        assert cache.l1_cache.get("project:9") is None
+    
+    @pytest.mark.asyncio
+    async def test_listener_flushes_after_reconnect(self, cache: MultiLevelCache):
+        first = FakePubSub([self.message("peer", "k", ["project:1"])])
+        second = FakePubSub()
+        connections = [first, second]
+        cache.redis.pubsub = lambda: connections.pop(0)
+        
+        cache.start_invalidation_listener()
+        try:
+            await asyncio.wait_for(first.subscribed.wait(), 1)
+            await asyncio.sleep(0)
+            # First connection: messages are applied, nothing else is flushed
+            assert cache.l1_cache.get("project:1") is None
+            assert cache.l1_cache.get("project:2") is not None
+            
+            first.drop.set()
+            await asyncio.wait_for(second.subscribed.wait(), 2)
+            # Messages may have been missed while disconnected
+            assert cache.l1_cache.get("project:2") is None
+        finally:
+            await cache.close()
+
+
+# ============================================
+# tests/unit/test_cache_codec.py
+# ============================================
+
+import gzip
+import pickle
+import uuid
+import pytest
+from datetime import date, datetime, timezone
+from dataclasses import asdict
+from decimal import Decimal
+from src.performance import CacheCodec, CacheDecodeError, CacheEnvelope, PaginatedResult, train_cache_dictionary
+
+ROW = {
+    "id": uuid.UUID("6f1c2b9e-3c1a-4d8e-9f6b-2a7e5c4d3b21"),
+    "name": "Fondations - Laval lot 12",
+    "budget_total": Decimal("1250000.00"),
+    "start_date": date(2025, 3, 1),
+    "updated_at": datetime(2025, 6, 1, 12, 30, tzinfo=timezone.utc),
+    "created_at": datetime(2025, 1, 15, 8, 0),
+    "tags": ("Charpente", "Toiture"),
+    "settings": {"currency": "CAD", "notifications": True},
+    "progress_percent": 42,
+    "end_date": None
+}
+
+
+class TestCacheCodec:
+    """Tests for lossless round trips, pickle fallbacks and undecodable payloads."""
+    
+    @pytest.mark.parametrize("compression", ["none", "lz4", "zstd"])
+    def test_msgpack_round_trip_keeps_row_types(self, compression: str):
+        codec = CacheCodec("msgpack", compression)
+        value = [ROW] * 20  # Above the compression threshold
+        
+        decoded = codec.decode(codec.encode(value))
+        
+        assert decoded == value
+        assert type(decoded[0]["id"]) is uuid.UUID
+        assert type(decoded[0]["tags"]) is tuple
+        assert decoded[0]["updated_at"].utcoffset() == ROW["updated_at"].utcoffset()
+        assert codec.pickle_fallbacks == 0
+    
+    def test_cached_projects_page_needs_no_pickle(self):
+        # OptimizedProjectRepository caches asdict() of the page, not the dataclass
+        codec = CacheCodec("msgpack", "zstd")
+        page = PaginatedResult(
+            items=[ROW] * 20, total=None, page=2, page_size=20, has_next=True, has_prev=True,
+            next_cursor="bmV4dA", prev_cursor="cHJldg"
+        )
+        
+        decoded = codec.decode(codec.encode(CacheEnvelope(asdict(page), 1750000000.5, 0.042)))
+        
+        assert PaginatedResult(**decoded.value) == page
+        assert codec.pickle_fallbacks == 0
+    
+    @pytest.mark.parametrize("value", [
+        {"id": uuid.UUID("6f1c2b9e-3c1a-4d8e-9f6b-2a7e5c4d3b21")},
+        {"tags": ("a", "b")},
+        {"amount": Decimal("10.50")},
+        {"at": datetime(2025, 6, 1)},
+        {1: "non-str key"},
+        {"ratio": float("nan")}
+    ])
+    def test_orjson_falls_back_to_pickle_instead_of_converting(self, value):
+        codec = CacheCodec("orjson", "none")
+        
+        decoded = codec.decode(codec.encode(value))
+        
+        assert codec.pickle_fallbacks == 1
+        assert type(next(iter(decoded.values()))) is type(next(iter(value.values())))
+        assert list(decoded) == list(value)
+    
+    def test_orjson_stores_json_native_values(self):
+        codec = CacheCodec("orjson", "none")
+        value = {"projects": [{"id": "p-1", "progress": 0.5, "done": False, "manager": None}]}
+        
+        assert codec.decode(codec.encode(value)) == value
+        assert codec.pickle_fallbacks == 0
+    
+    def test_envelope_round_trip(self):
+        codec = CacheCodec()
+        envelope = CacheEnvelope(ROW, 1750000000.5, 0.042)
+        
+        decoded = codec.decode(codec.encode(envelope))
+        
+        assert isinstance(decoded, CacheEnvelope)
+        assert decoded == envelope
+    
+    def test_legacy_pickle_and_gzip_entries_still_decode(self):
+        codec = CacheCodec()
+        raw = pickle.dumps(ROW)
+        
+        assert codec.decode(raw) == ROW
+        assert codec.decode(gzip.compress(raw)) == ROW
+    
+    def test_dictionary_mismatch_is_a_decode_error(self):
+        samples = [dict(ROW, name=f"Projet {i}", progress_percent=i) for i in range(2000)]
+        dictionary = train_cache_dictionary(samples, size=8192)
+        
+        data = CacheCodec("msgpack", "zstd", dictionary).encode(ROW)
+        
+        with pytest.raises(CacheDecodeError):
+            CacheCodec("msgpack", "zstd").decode(data)
+    
+    def test_corrupt_payload_is_a_decode_error(self):
+        data = CacheCodec("msgpack", "none").encode(ROW)
+        
+        with pytest.raises(CacheDecodeError):
+            CacheCodec().decode(data[:10])
+
+
+# ============================================
+# tests/unit/test_keyset.py
+# ============================================
+
+import base64
+import uuid
+import pytest
+from datetime import datetime, timezone
+from decimal import Decimal
+from sqlalchemy import Column, Integer, MetaData, String, Table, select, text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from src.performance import InvalidCursorError, Keyset, KeysetColumn
+
+# (id, priority, title): priorities repeat so ties are broken on id
+TASK_ROWS = [(i, i % 4, f"Tâche {i}") for i in range(1, 24)]
+
+TASKS = Table(
+    "tasks", MetaData(),
+    Column("id", Integer, primary_key=True),
+    Column("priority", Integer, nullable=False),
+    Column("title", String)
+)
+
+
+def newest_first() -> Keyset:
+    return Keyset("tasks.newest", [KeysetColumn("id", "t.id")], secret="test-secret")
+
+
+def by_priority(core: bool = False) -> Keyset:
+    """Priority ascending, then id descending: no row comparison can express it"""
+    return Keyset("tasks.by_priority", [
+        KeysetColumn("priority", TASKS.c.priority if core else "t.priority", descending=False),
+        KeysetColumn("id", TASKS.c.id if core else "t.id", descending=True)
+    ], secret="test-secret")
+
+
+def expected_order(rows):
+    return [row[0] for row in sorted(rows, key=lambda row: (row[1], -row[0]))]
+
+
+@pytest.fixture
+async def session():
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.run_sync(TASKS.metadata.create_all)
+        await conn.execute(TASKS.insert(), [{"id": i, "priority": p, "title": t} for i, p, t in TASK_ROWS])
+    async with AsyncSession(engine) as session:
+        yield session
+    await engine.dispose()
+
+
+class TestKeysetCursor:
+    """Tests for cursor encoding, signing and validation."""
+    
+    def test_round_trip_keeps_value_types(self):
+        keyset = Keyset("projects.by_updated", [
+            KeysetColumn("updated_at", "p.updated_at"),
+            KeysetColumn("budget", "p.budget"),
+            KeysetColumn("id", "p.id")
+        ], secret="test-secret")
+        row = {
+            "updated_at": datetime(2025, 6, 1, 12, 30, tzinfo=timezone.utc),
+            "budget": Decimal("1250000.00"),
+            "id": uuid.UUID("6f1c2b9e-3c1a-4d8e-9f6b-2a7e5c4d3b21")
+        }
+        cursor = keyset.decode_cursor(keyset.encode_cursor("prev", row, 7))
+        
+        assert cursor.direction == "prev"
+        assert cursor.page == 7
+        assert cursor.values == [row["updated_at"], row["budget"], row["id"]]
+        assert [type(value) for value in cursor.values] == [datetime, Decimal, uuid.UUID]
+    
+    def test_tampered_payload_is_rejected(self):
+        keyset = newest_first()
+        token = keyset.encode_cursor("next", {"id": 10}, 1)
+        raw = bytearray(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+        raw[raw.index(b"10")] = ord("9")  # Same length, different boundary row
+        forged = base64.urlsafe_b64encode(bytes(raw)).rstrip(b"=").decode()
+        
+        with pytest.raises(InvalidCursorError):
+            keyset.decode_cursor(forged)
+    
+    def test_cursor_from_another_listing_or_secret_is_rejected(self):
+        token = newest_first().encode_cursor("next", {"id": 10}, 1)
+        other_name = Keyset("projects.newest", [KeysetColumn("id", "p.id")], secret="test-secret")
+        other_secret = Keyset("tasks.newest", [KeysetColumn("id", "t.id")], secret="other-secret")
+        
+        for keyset in (other_name, other_secret):
+            with pytest.raises(InvalidCursorError):
+                keyset.decode_cursor(token)
+    
+    @pytest.mark.parametrize("token", ["", "abc", "%%%not-base64%%%", "A" * 40])
+    def test_malformed_cursor_is_rejected(self, token: str):
+        with pytest.raises(InvalidCursorError):
+            newest_first().decode_cursor(token)
+
+
+class TestKeysetPredicate:
+    """Tests for the seek predicate built from a cursor."""
+    
+    def test_uniform_direction_uses_row_comparison(self):
+        keyset = Keyset("projects.by_updated", [
+            KeysetColumn("updated_at", "p.updated_at"), KeysetColumn("id", "p.id")
+        ], secret="test-secret")
+        cursor = keyset.decode_cursor(keyset.encode_cursor("next", {"updated_at": 5, "id": 9}, 1))
+        
+        sql, params = keyset.text_filter(cursor)
+        
+        assert sql == "(p.updated_at, p.id) < (:keyset_0, :keyset_1)"
+        assert params == {"keyset_0": 5, "keyset_1": 9}
+    
+    def test_mixed_direction_expands_to_or_of_ties(self):
+        keyset = by_priority()
+        cursor = keyset.decode_cursor(keyset.encode_cursor("next", {"priority": 2, "id": 9}, 1))
+        
+        sql, _ = keyset.text_filter(cursor)
+        
+        assert sql == "((t.priority > :keyset_0) OR (t.priority = :keyset_0 AND t.id < :keyset_1))"
+    
+    def test_prev_cursor_flips_every_comparison(self):
+        keyset = by_priority()
+        cursor = keyset.decode_cursor(keyset.encode_cursor("prev", {"priority": 2, "id": 9}, 2))
+        
+        sql, _ = keyset.text_filter(cursor)
+        
+        assert sql == "((t.priority < :keyset_0) OR (t.priority = :keyset_0 AND t.id > :keyset_1))"
+        assert keyset.text_order(reverse=True) == "t.priority DESC, t.id ASC"
+    
+    def test_first_page_has_no_filter(self):
+        assert newest_first().text_filter(None) == ("TRUE", {})
+
+
+class TestKeysetPaginate:
+    """Tests for walking pages forward and back against a real database."""
+    
+    QUERY = "SELECT t.id, t.priority, t.title FROM tasks t WHERE {keyset}"
+    
+    async def walk_forward(self, keyset, session, query, limit):
+        pages, cursor = [], None
+        while True:
+            page = await keyset.paginate(session, query, cursor=cursor, limit=limit)
+            pages.append(page)
+            if not page.has_next:
+                return pages
+            cursor = page.next_cursor
+    
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("core", [False, True], ids=["text", "core"])
+    async def test_forward_pages_cover_rows_once_in_order(self, session, core: bool):
+        query = select(TASKS) if core else self.QUERY
+        
+        pages = await self.walk_forward(by_priority(core), session, query, limit=5)
+        
+        assert [row["id"] for page in pages for row in page.items] == expected_order(TASK_ROWS)
+        assert [len(page.items) for page in pages] == [5, 5, 5, 5, 3]
+    
+    @pytest.mark.asyncio
+    async def test_page_numbers_and_flags(self, session):
+        pages = await self.walk_forward(by_priority(), session, self.QUERY, limit=5)
+        
+        assert [page.page for page in pages] == [1, 2, 3, 4, 5]
+        assert [page.has_prev for page in pages] == [False, True, True, True, True]
+        assert [page.has_next for page in pages] == [True, True, True, True, False]
+        assert pages[0].prev_cursor is None
+        assert pages[-1].next_cursor is None
+    
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("core", [False, True], ids=["text", "core"])
+    async def test_backward_pages_match_forward_pages(self, session, core: bool):
+        keyset = by_priority(core)
+        query = select(TASKS) if core else self.QUERY
+        forward = await self.walk_forward(keyset, session, query, limit=5)
+        
+        backward, cursor = [], forward[-1].prev_cursor
+        while cursor:
+            page = await keyset.paginate(session, query, cursor=cursor, limit=5)
+            backward.append(page)
+            cursor = page.prev_cursor
+        
+        assert [page.items for page in backward] == [page.items for page in reversed(forward[:-1])]
+        assert [page.page for page in backward] == [4, 3, 2, 1]
+        assert [page.has_prev for page in backward] == [True, True, True, False]
+        assert all(page.has_next for page in backward)
+    
+    @pytest.mark.asyncio
+    async def test_exact_count_ignores_the_cursor(self, session):
+        keyset = newest_first()
+        first = await keyset.paginate(session, self.QUERY, limit=10)
+        
+        second = await keyset.paginate(session, self.QUERY, cursor=first.next_cursor, limit=10, count="exact")
+        
+        assert [row["id"] for row in second.items] == list(range(13, 3, -1))
+        assert second.total == len(TASK_ROWS)
+        assert second.total_pages == 3
+        assert second.total_is_estimate is False
+
+
+# ============================================
+# tests/unit/test_performance_routes.py
+# ============================================
+
+import pytest
+from fastapi import FastAPI, Header, HTTPException
+from httpx import AsyncClient, ASGITransport
+from src.performance import DatabasePool, setup_performance_routes
+
+ADMIN_TOKEN = "admin-token"
+
+
+async def admin_only(authorization: str = Header(None)):
+    if authorization != f"Bearer {ADMIN_TOKEN}":
+        raise HTTPException(status_code=403, detail="Permission required: admin:settings")
+
+
+@pytest.fixture
+async def client():
+    app = FastAPI()
+    setup_performance_routes(app, admin_dependency=admin_only)
+    statements = DatabasePool.telemetry.statements
+    statements.reset()
+    statements.record("SELECT * FROM projects WHERE id = 'a'", 0.004, 1)
+    statements.record("SELECT * FROM projects WHERE id = 'b'", 0.002, 1)
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        yield client
+    statements.reset()
+
+
+class TestStatementRoutes:
+    """Tests for the admin-only statement statistics routes."""
+    
+    ADMIN = {"Authorization": f"Bearer {ADMIN_TOKEN}"}
+    
+    @pytest.mark.asyncio
+    async def test_statistics_require_admin(self, client: AsyncClient):
+        assert (await client.get("/admin/performance/statements")).status_code == 403
+        assert (await client.delete("/admin/performance/statements")).status_code == 403
+        assert len(DatabasePool.telemetry.statements.entries) == 1
+    
+    @pytest.mark.asyncio
+    async def test_admin_reads_statements_by_fingerprint(self, client: AsyncClient):
+        response = await client.get("/admin/performance/statements?sort=calls", headers=self.ADMIN)
+        
+        assert response.status_code == 200
+        body = response.json()
+        assert body["fingerprints"] == 1
+        assert body["statements"][0]["calls"] == 2
+        assert body["statements"][0]["fingerprint"] == "SELECT * FROM projects WHERE id = ?"
+    
+    @pytest.mark.asyncio
+    async def test_unknown_sort_is_rejected(self, client: AsyncClient):
+        response = await client.get("/admin/performance/statements?sort=slowest", headers=self.ADMIN)
+        
+        assert response.status_code == 400
+    
+    @pytest.mark.asyncio
+    async def test_admin_resets_statements(self, client: AsyncClient):
+        response = await client.delete("/admin/performance/statements", headers=self.ADMIN)
+        
+        assert response.json() == {"reset": True}
+        assert DatabasePool.telemetry.statements.entries == {}
+
+
+# ============================================
+# tests/unit/test_batch_processor.py
+# ============================================
+
+import asyncio
+import contextlib
+import pytest
+from src.performance import BatchProcessor
+
+
+async def double(x: int) -> int:
+    await asyncio.sleep(0)
+    return x * 2
+
+
+class TestBatchProcessor:
+    """Tests for streaming, ordering, retries, timeouts and shutdown."""
+    
+    @pytest.mark.asyncio
+    async def test_slow_item_does_not_stall_the_others(self):
+        # Item 0 only finishes once every other item has: a batch barrier would deadlock
+        others_done = asyncio.Event()
+        finished = 0
+        
+        async def process(x):
+            nonlocal finished
+            if x == 0:
+                await others_done.wait()
+            else:
+                await asyncio.sleep(0)
+                finished += 1
+                if finished == 99:
+                    others_done.set()
+            return x
+        
+        processor = BatchProcessor(batch_size=20, concurrency=5)
+        order = await asyncio.wait_for(
+            self.collect(processor.stream(range(100), process), lambda result: result.index), timeout=5
+        )
+        
+        assert sorted(order) == list(range(100))
+        assert order[-1] == 0
+        assert processor.report.succeeded == 100
+    
+    @pytest.mark.asyncio
+    async def test_ordered_stream_keeps_input_order(self):
+        async def process(x):
+            await asyncio.sleep((10 - x % 10) / 1000)  # Later items finish first
+            return x * 2
+        
+        processor = BatchProcessor(batch_size=8, concurrency=4)
+        values = await self.collect(processor.stream(range(50), process, ordered=True), lambda result: result.value)
+        
+        assert values == [x * 2 for x in range(50)]
+    
+    @pytest.mark.asyncio
+    async def test_read_ahead_is_bounded_by_batch_size(self):
+        produced = 0
+        
+        async def source():
+            nonlocal produced
+            for i in range(1000):
+                produced += 1
+                yield i
+        
+        processor = BatchProcessor(batch_size=20, concurrency=4)
+        seen = 0
+        async for _ in processor.stream(source(), double):
+            seen += 1
+            if seen == 10:
+                await asyncio.sleep(0.05)  # Slow consumer: workers must not run ahead
+                assert produced <= seen + 20 + 1
+        
+        assert seen == 1000
+    
+    @pytest.mark.asyncio
+    async def test_retry_and_timeout_counts(self):
+        calls = {}
+        
+        async def process(x):
+            calls[x] = calls.get(x, 0) + 1
+            if x == 1 and calls[x] < 3:
+                raise ConnectionError("blip")
+            if x == 2:
+                await asyncio.sleep(1)
+            if x == 3:
+                raise KeyError("bad row")
+            return x
+        
+        processor = BatchProcessor(
+            concurrency=3, retries=2, timeout=0.05, retry_backoff=0.01, retry_on=(ConnectionError,)
+        )
+        results = {result.index: result async for result in processor.stream([0, 1, 2, 3], process)}
+        
+        assert results[0].ok and results[0].attempts == 1
+        assert results[1].ok and results[1].value == 1 and results[1].attempts == 3
+        assert isinstance(results[2].error, asyncio.TimeoutError) and results[2].attempts == 3
+        assert isinstance(results[3].error, KeyError) and results[3].attempts == 1  # Not retryable
+        report = processor.report
+        assert (report.items, report.succeeded, report.failed) == (4, 2, 2)
+        assert report.retries == 4      # Two for item 1, two for item 2
+        assert report.timeouts == 3
+    
+    @pytest.mark.asyncio
+    async def test_source_error_is_reraised(self):
+        async def source():
+            yield 1
+            yield 2
+            raise ValueError("source failed")
+        
+        with pytest.raises(ValueError, match="source failed"):
+            async for _ in BatchProcessor(concurrency=2).stream(source(), double):
+                pass
+        
+        await asyncio.sleep(0)
+        assert self.leftover_tasks() == []
+    
+    @pytest.mark.asyncio
+    async def test_aclose_cancels_workers(self):
+        started, cancelled = set(), set()
+        
+        async def process(x):
+            if x == 0:
+                return x
+            started.add(x)
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.add(x)
+                raise
+        
+        stream = BatchProcessor(batch_size=10, concurrency=3).stream(range(10 ** 6), process)
+        async with contextlib.aclosing(stream):
+            async for result in stream:
+                assert result.index == 0
+                await asyncio.sleep(0.01)  # Let the workers pick up the slow items
+                break
+        
+        await asyncio.sleep(0)
+        assert started and cancelled == started
+        assert self.leftover_tasks() == []
+    
+    @pytest.mark.asyncio
+    async def test_process_batch_returns_values_and_errors_in_order(self):
+        async def process(x):
+            if x == 3:
+                raise KeyError("bad row")
+            return x
+        
+        results = await BatchProcessor(concurrency=2).process_batch([0, 3, 5], process)
+        
+        assert results[0] == 0
+        assert isinstance(results[1], KeyError)
+        assert results[2] == 5
+    
+    async def collect(self, stream, key):
+        return [key(result) async for result in stream]
+    
+    def leftover_tasks(self):
+        return [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+
+
+# ============================================
+# tests/unit/test_ws_protocol.py
+# ============================================
+
+import json
+import msgpack
+import pytest
+from roady_ws_protocol import CompactEvent, FrameEncoder, PROTOCOL_JSON, PROTOCOL_MSGPACK
+
+
+def message(tokens: int, cost: float, text: str = "ok") -> CompactEvent:
+    return CompactEvent.from_message({
+        "type": "new_message",
+        "message": {"content": text, "timestamp": "2026-01-01T00:00:00"},
+        "tokensUsed": tokens,
+        "costSoFar": cost
+    })
+
+
+def snapshot(tokens: int, cost: float) -> CompactEvent:
+    return CompactEvent.from_message({
+        "type": "meeting_snapshot",
+        "meeting": {"id": "m-1", "tokensUsed": tokens, "costSoFar": cost}
+    })
+
+
+def decode(frame):
+    return msgpack.unpackb(frame) if isinstance(frame, bytes) else json.loads(frame)
+
+
+class Client:
+    """What a browser does with frames: snapshots set the counters, deltas add to them"""
+    
+    def __init__(self):
+        self.tokens, self.cost = 0, 0.0
+    
+    def apply(self, frame) -> list:
+        events, delta = decode(frame)
+        for event in events:
+            if event["type"] == "meeting_snapshot":
+                self.tokens, self.cost = event["meeting"]["tokensUsed"], event["meeting"]["costSoFar"]
+        if delta:
+            self.tokens += delta[0]
+            self.cost += delta[1]
+        return events
+
+
+@pytest.fixture(params=[PROTOCOL_JSON, PROTOCOL_MSGPACK])
+def encoder(request) -> FrameEncoder:
+    return FrameEncoder(request.param)
+
+
+class TestFrameEncoder:
+    """Tests for counter deltas, keyframes and the two encodings."""
+    
+    def test_delta_across_batches(self, encoder: FrameEncoder):
+        first = decode(encoder.encode([message(10, 0.01), message(25, 0.03)]))
+        second = decode(encoder.encode([message(40, 0.05)]))
+        
+        assert first[1] == [25, 0.03]
+        assert second[1] == [15, 0.02]
+        assert decode(encoder.encode([CompactEvent.from_message({"type": "agent_left", "agentId": "a"})]))[1] is None
+    
+    def test_counters_follow_the_server_across_frames(self, encoder: FrameEncoder):
+        client = Client()
+        
+        for tokens, cost in [(10, 0.01), (25, 0.03), (40, 0.05)]:
+            client.apply(encoder.encode([message(tokens, cost)]))
+        
+        assert (client.tokens, round(client.cost, 6)) == (40, 0.05)
+    
+    def test_keyframe_mid_batch_rebases(self, encoder: FrameEncoder):
+        client = Client()
+        client.apply(encoder.encode([message(10, 0.01)]))
+        
+        frame = encoder.encode([message(12, 0.02), snapshot(100, 1.0), message(130, 1.25)])
+        events = client.apply(frame)
+        
+        assert [event["type"] for event in events] == ["new_message", "meeting_snapshot", "new_message"]
+        assert decode(frame)[1] == [30, 0.25]  # Relative to the snapshot, not to the frame before
+        assert (client.tokens, round(client.cost, 6)) == (130, 1.25)
+    
+    def test_rounding_does_not_drift(self, encoder: FrameEncoder):
+        client = Client()
+        tokens, cost = 0, 0.0
+        
+        for i in range(2000):
+            tokens += 7
+            cost += 0.0000123456789 * (1 + i % 3)
+            client.apply(encoder.encode([message(tokens, cost)]))
+        
+        assert client.tokens == tokens
+        assert abs(client.cost - cost) < 1e-6  # One rounding step, not 2000
+    
+    def test_msgpack_and_json_frames_decode_alike(self):
+        events = [message(10, 0.01, "Béton coulé"), snapshot(100, 1.0), message(130, 1.25)]
+        
+        as_json = decode(FrameEncoder(PROTOCOL_JSON).encode(events))
+        as_msgpack = decode(FrameEncoder(PROTOCOL_MSGPACK).encode(events))
+        
+        assert as_msgpack == as_json
+        assert as_json[0][0]["message"]["timestamp"] == 1767225600000
+        assert "tokensUsed" not in as_json[0][0]
+
+
+# ============================================
+# tests/unit/test_event_bus.py
+# ============================================
+
+import json
+import pytest
+from roady_meeting_event_bus import InProcessEventBus, frame_with_seq
+
+
+@pytest.fixture
+def bus() -> InProcessEventBus:
+    bus = InProcessEventBus()
+    bus.HISTORY_SIZE = 5
+    return bus
+
+
+class TestInProcessEventBus:
+    """Tests for sequence numbers, delivery and resume."""
+    
+    @pytest.mark.asyncio
+    async def test_seq_is_monotonic_per_meeting(self, bus: InProcessEventBus):
+        seqs = []
+        for meeting_id in ["m-1", "m-2", "m-1", "m-1", "m-2"]:
+            seqs.append((meeting_id, await bus.publish(meeting_id, {"type": "new_message"})))
+        
+        assert [seq for meeting_id, seq in seqs if meeting_id == "m-1"] == [1, 2, 3]
+        assert [seq for meeting_id, seq in seqs if meeting_id == "m-2"] == [1, 2]
+    
+    @pytest.mark.asyncio
+    async def test_subscribed_meetings_are_delivered_with_seq(self, bus: InProcessEventBus):
+        delivered = []
+        bus.bind(lambda meeting_id, seq, frame: delivered.append((meeting_id, seq, json.loads(frame))))
+        await bus.subscribe("m-1")
+        
+        await bus.publish("m-1", {"type": "agent_joined"})
+        await bus.publish("m-2", {"type": "agent_joined"})
+        
+        assert delivered == [("m-1", 1, {"type": "agent_joined", "seq": 1})]
+    
+    @pytest.mark.asyncio
+    async def test_resume_after_last_seq(self, bus: InProcessEventBus):
+        for i in range(4):
+            await bus.publish("m-1", {"type": "new_message", "n": i})
+        
+        replayed = await bus.replay("m-1", 2)
+        
+        assert [seq for seq, _ in replayed] == [3, 4]
+        assert [json.loads(frame)["n"] for _, frame in replayed] == [2, 3]
+    
+    @pytest.mark.asyncio
+    async def test_caught_up_client_gets_empty_replay(self, bus: InProcessEventBus):
+        assert await bus.replay("m-1", 0) == []
+        await bus.publish("m-1", {"type": "new_message"})
+        
+        assert await bus.replay("m-1", 1) == []
+    
+    @pytest.mark.asyncio
+    async def test_gap_older_than_history_needs_a_snapshot(self, bus: InProcessEventBus):
+        for i in range(8):
+            await bus.publish("m-1", {"type": "new_message", "n": i})  # History keeps seq 4..8
+        
+        assert await bus.replay("m-1", 2) is None
+        assert [seq for seq, _ in await bus.replay("m-1", 3)] == [4, 5, 6, 7, 8]
+    
+    @pytest.mark.asyncio
+    async def test_forgotten_meeting_restarts_cleanly(self, bus: InProcessEventBus):
+        await bus.publish("m-1", {"type": "new_message"})
+        bus.forget("m-1")
+        
+        assert await bus.replay("m-1", 0) == []
+        assert await bus.publish("m-1", {"type": "new_message"}) == 1
+    
+    def test_frame_with_seq_splices_into_the_object(self):
+        assert json.loads(frame_with_seq('{"type":"pong"}', 7)) == {"type": "pong", "seq": 7}
+        assert frame_with_seq("{}", 1) == '{"seq":1}'
+
+
+# ============================================
+# tests/unit/test_meeting_archive.py
+# ============================================
+
+import os
+import pytest
+from datetime import datetime
+from types import SimpleNamespace
+import roady_meeting_archive
+from roady_meeting_archive import MeetingArchive, MeetingArchiver
+
+
+ENDED_AT = datetime(2026, 3, 1, 12, 0)
+
+
+def archived_messages(count: int):
+    """Messages 1..count, every fifth one superseded"""
+    return [
+        {"seq": seq, "id": f"msg-{seq}", "content": f"message {seq}", "superseded": seq % 5 == 0}
+        for seq in range(1, count + 1)
+    ]
+
+
+def chunked(messages, size: int):
+    return [messages[i:i + size] for i in range(0, len(messages), size)]
+
+
+class FakeMeetingRepository:
+    """In-memory stand-in for the calls MeetingArchiver makes"""
+    
+    def __init__(self, rows):
+        self.rows = rows
+        self.archived = {}
+    
+    def get_messages(self, meeting_id, after_seq=0, limit=50, include_superseded=False):
+        return [row for row in self.rows if row.seq > after_seq][:limit]
+    
+    def mark_archived(self, meeting_id, index):
+        if meeting_id in self.archived:
+            return False
+        self.archived[meeting_id] = index
+        return True
+
+
+def message_row(seq: int):
+    return SimpleNamespace(
+        seq=seq, message_id=f"msg-{seq}", sender_id="agent-1", sender_type="agent",
+        sender_name="Agent", content=f"message {seq}", created_at=ENDED_AT,
+        tokens=10, cost_usd=0.001, superseded=seq % 5 == 0
+    )
+
+
+@pytest.fixture
+def archive(tmp_path) -> MeetingArchive:
+    return MeetingArchive(str(tmp_path))
+
+
+class TestMeetingArchive:
+    """Tests for chunked archive files and paging"""
+    
+    def test_write_indexes_every_chunk(self, archive: MeetingArchive):
+        index = archive.write("m-1", ENDED_AT, chunked(archived_messages(30), 7))
+        
+        assert index["path"] == "2026/03/m-1.jsonl.zst"
+        assert index["messages"] == 30
+        assert [(c["first_seq"], c["last_seq"]) for c in index["chunks"]] == [
+            (1, 7), (8, 14), (15, 21), (22, 28), (29, 30)
+        ]
+        assert archive.read_chunk(index, index["chunks"][1]) == archived_messages(30)[7:14]
+    
+    @pytest.mark.parametrize("before_seq", [None, 2, 8, 15, 22, 31])
+    @pytest.mark.parametrize("limit", [1, 3, 10, 50])
+    def test_newest_page_matches_get_messages(self, archive: MeetingArchive, before_seq, limit):
+        messages = archived_messages(30)
+        index = archive.write("m-1", ENDED_AT, chunked(messages, 7))
+        
+        expected = [
+            m["seq"] for m in messages
+            if not m["superseded"] and (before_seq is None or m["seq"] < before_seq)
+        ][-limit:]
+        page = archive.read_messages(index, before_seq=before_seq, limit=limit)
+        
+        assert [m["seq"] for m in page] == expected
+    
+    @pytest.mark.parametrize("after_seq", [0, 6, 7, 8, 20, 30])
+    @pytest.mark.parametrize("limit", [1, 3, 10, 50])
+    def test_after_seq_page_crosses_chunks(self, archive: MeetingArchive, after_seq, limit):
+        messages = archived_messages(30)
+        index = archive.write("m-1", ENDED_AT, chunked(messages, 7))
+        
+        expected = [m["seq"] for m in messages if not m["superseded"] and m["seq"] > after_seq][:limit]
+        page = archive.read_messages(index, after_seq=after_seq, limit=limit)
+        
+        assert [m["seq"] for m in page] == expected
+    
+    def test_include_superseded(self, archive: MeetingArchive):
+        index = archive.write("m-1", ENDED_AT, chunked(archived_messages(12), 7))
+        
+        page = archive.read_messages(index, after_seq=3, limit=4, include_superseded=True)
+        
+        assert [m["seq"] for m in page] == [4, 5, 6, 7]
+    
+    def test_failed_write_leaves_no_partial_file(self, archive: MeetingArchive, tmp_path):
+        index = archive.write("m-1", ENDED_AT, chunked(archived_messages(14), 7))
+        
+        def failing_chunks():
+            yield archived_messages(7)
+            raise RuntimeError("database went away")
+        
+        with pytest.raises(RuntimeError):
+            archive.write("m-1", ENDED_AT, failing_chunks())
+        
+        assert os.listdir(tmp_path / "2026" / "03") == ["m-1.jsonl.zst"]
+        assert len(archive.read_messages(index, limit=50)) == 12
+
+
+class TestMeetingArchiver:
+    """Tests for moving a meeting's transcript into the archive"""
+    
+    def test_archive_meeting_round_trip(self, archive: MeetingArchive, monkeypatch):
+        rows = [message_row(seq) for seq in range(1, 11)]
+        monkeypatch.setattr(roady_meeting_archive, "ARCHIVE_CHUNK_MESSAGES", 4)
+        monkeypatch.setattr(roady_meeting_archive, "MeetingRepository", lambda session: FakeMeetingRepository(rows))
+        archiver = MeetingArchiver(None, archive)
+        meeting = SimpleNamespace(meeting_id="m-1", ended_at=ENDED_AT)
+        
+        index = archiver.archive_meeting(meeting)
+        
+        assert archiver.repo.archived["m-1"] == index
+        assert [c["count"] for c in index["chunks"]] == [4, 4, 2]
+        page = archive.read_messages(index, after_seq=3, limit=5, include_superseded=True)
+        assert [m["seq"] for m in page] == [4, 5, 6, 7, 8]
+        assert page[0]["timestamp"] == ENDED_AT.isoformat()
+        assert archiver.archive_meeting(meeting) is None
+
+
+# ============================================
+# tests/unit/test_project_stats.py
+# ============================================
+
+import json
+import pytest
+from decimal import Decimal
+from src.performance import ProjectStatsMaintainer
+
+
+def stats_row(**overrides):
+    row = {
+        "task_count": 3, "completed_tasks": 1, "tasks_by_status": {"todo": 2, "completed": 1},
+        "total_expenses": Decimal("120.50"), "expense_count": 2, "member_count": 4
+    }
+    row.update(overrides)
+    return row
+
+
+class TestProjectStatsDifferences:
+    """Tests for comparing stored project stats with the child tables"""
+    
+    def test_matching_rows(self):
+        assert ProjectStatsMaintainer._differences(stats_row(), stats_row()) == {}
+    
+    def test_missing_stats_row_compares_against_zeros(self):
+        differences = ProjectStatsMaintainer._differences(None, stats_row(member_count=0))
+        
+        assert differences == {
+            "task_count": (0, 3),
+            "completed_tasks": (0, 1),
+            "tasks_by_status": ({}, {"todo": 2, "completed": 1}),
+            "total_expenses": (Decimal("0"), Decimal("120.50")),
+            "expense_count": (0, 2)
+        }
+    
+    def test_missing_row_for_an_empty_project_is_not_drift(self):
+        empty = stats_row(task_count=0, completed_tasks=0, tasks_by_status={}, total_expenses=0,
+                          expense_count=0, member_count=0)
+        
+        assert ProjectStatsMaintainer._differences(None, empty) == {}
+    
+    def test_tasks_by_status_as_json_text(self):
+        stored = stats_row(tasks_by_status='{"completed": 1, "todo": 2}')
+        actual = stats_row(tasks_by_status=json.dumps({"todo": "2", "completed": 1}))
+        
+        assert ProjectStatsMaintainer._differences(stored, actual) == {}
+        
+        stored = stats_row(tasks_by_status='{"todo": 99, "completed": 1}')
+        assert ProjectStatsMaintainer._differences(stored, stats_row()) == {
+            "tasks_by_status": ({"todo": 99, "completed": 1}, {"todo": 2, "completed": 1})
+        }
+    
+    @pytest.mark.parametrize("stored_total, actual_total", [
+        (Decimal("120.50"), Decimal("120.5")),
+        (120.1, Decimal("120.10")),  # 120.1 has no exact binary form
+        (0, Decimal("0.00"))
+    ])
+    def test_decimal_and_float_totals_compare_by_value(self, stored_total, actual_total):
+        stored, actual = stats_row(total_expenses=stored_total), stats_row(total_expenses=actual_total)
+        
+        assert ProjectStatsMaintainer._differences(stored, actual) == {}
+    
+    def test_total_expenses_drift_is_reported(self):
+        differences = ProjectStatsMaintainer._differences(stats_row(total_expenses=125.5), stats_row())
+        
+        assert differences == {"total_expenses": (Decimal("125.5"), Decimal("120.50"))}
+
+
+# ============================================
+# tests/unit/test_speaker_selection.py
+# ============================================
+
+import pytest
+from types import SimpleNamespace
+import roady_meeting_api_backend as backend
+from roady_meeting_api_backend import SpeakerIndex, determine_relevant_agents, ranking_terms
+
+
+class FakeRegistry:
+    is_loaded = True
+    
+    def __init__(self, records: dict):
+        self.records = records
+    
+    def get(self, agent_id: str):
+        return self.records.get(agent_id)
+
+
+REGISTRY = FakeRegistry({
+    "cco": SimpleNamespace(keywords=("design", "visual", "logo", "graphic", "video", "creative"), department="creative_content_studio"),
+    "mkt": SimpleNamespace(keywords=("marketing", "campaign", "seo", "social", "promote", "ads"), department="marketing"),
+    "tech": SimpleNamespace(keywords=("code", "develop", "api", "bug", "fix", "deploy", "database"), department="technology_systems"),
+    "con": SimpleNamespace(keywords=("construction", "build", "renovate", "architect", "permit"), department="construction_real_estate")
+})
+
+PARTICIPANTS = [
+    {"id": "cco", "name": "Chief Creative Officer", "department": "creative_content_studio"},
+    {"id": "mkt", "name": "Marketing Director", "department": "marketing"},
+    {"id": "tech", "name": "Technology Director", "department": "technology_systems"},
+    {"id": "con", "name": "Construction Director", "department": "construction_real_estate"}
+]
+
+
+@pytest.fixture(autouse=True)
+def speaker_index(monkeypatch):
+    monkeypatch.setattr(backend, "get_speaker_index", lambda participants: SpeakerIndex(participants, REGISTRY))
+
+
+async def speakers(message: str, recent_messages=None, **kwargs):
+    return [agent["id"] for agent in await determine_relevant_agents(message, PARTICIPANTS, recent_messages, **kwargs)]
+
+
+class TestSpeakerIndex:
+    """Tests for capability scores"""
+    
+    def test_scores_are_cosine_similarities(self):
+        index = SpeakerIndex(PARTICIPANTS, REGISTRY)
+        
+        scores = index.score(ranking_terms("There is a bug in the API deploy"))
+        
+        assert max(range(4), key=scores.__getitem__) == 2
+        assert all(0.0 <= score <= 1.0 for score in scores)
+        assert scores[0] == scores[3] == 0.0
+    
+    def test_no_terms_score_zero(self):
+        assert SpeakerIndex(PARTICIPANTS, REGISTRY).score(frozenset()) == [0.0] * 4
+    
+    def test_without_registry_uses_department_and_name(self):
+        scores = SpeakerIndex(PARTICIPANTS).score(ranking_terms("marketing plan"))
+        
+        assert scores[1] > 0 and scores[0] == scores[2] == scores[3] == 0.0
+
+
+class TestDetermineRelevantAgents:
+    """Tests for picking who answers a message"""
+    
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("message, expected", [
+        ("We need a new logo and some visuals for the social campaign", ["mkt", "cco"]),
+        ("There is a bug in the API deploy", ["tech"]),
+        ("Need permits to renovate the building", ["con"])
+    ])
+    async def test_selects_matching_agents(self, message, expected):
+        assert await speakers(message) == expected
+    
+    @pytest.mark.asyncio
+    async def test_mentions_win(self):
+        assert await speakers("@technology_director and @marketing_director, logo ideas?") == ["mkt", "tech"]
+    
+    @pytest.mark.asyncio
+    async def test_irrelevant_message_gets_one_voice(self):
+        assert await speakers("hello everyone") == ["cco"]
+        assert await speakers("hello everyone", [{"sender_id": "con"}]) == ["con"]
+    
+    @pytest.mark.asyncio
+    async def test_recent_speaker_bonus(self):
+        message = "Design a logo and promote it with a social campaign, then deploy the API"
+        
+        assert await speakers(message) == ["mkt", "cco"]
+        assert await speakers(message, [{"sender_id": "tech"}]) == ["mkt", "tech"]
+        # Only the last RANK_RECENT_WINDOW messages count
+        older = [{"sender_id": "tech"}] + [{"sender_id": "user"}] * backend.RANK_RECENT_WINDOW
+        assert await speakers(message, older) == ["mkt", "cco"]
+    
+    @pytest.mark.asyncio
+    async def test_top_k(self):
+        message = "Design a logo and promote it with a social campaign, then deploy the API"
+        
+        assert await speakers(message, top_k=3) == ["mkt", "cco", "tech"]
+        assert await speakers(message, top_k=1) == ["mkt"]
+    
+    @pytest.mark.asyncio
+    async def test_weak_second_speaker_is_cut_off(self):
+        index = SpeakerIndex(PARTICIPANTS, REGISTRY)
+        message = "Fix the database bug in the API deploy for the ads campaign"
+        scores = index.score(ranking_terms(message))
+        
+        # Marketing clears the minimum score, but matches far less than technology
+        assert backend.RANK_MIN_SCORE < scores[1] < scores[2] * backend.RANK_RELATIVE_CUTOFF
+        assert await speakers(message) == ["tech"]
+    
+    @pytest.mark.asyncio
+    async def test_second_speaker_below_min_score_is_cut_off(self):
+        message = "We need a new logo and some visuals for the social campaign"
+        
+        assert await speakers(message, min_score=0.3) == ["mkt"]
+        assert await speakers(message, min_score=0.9) == ["mkt"]
+
+
+# ============================================
+# tests/unit/test_meeting_connections.py
+# ============================================
+
+import asyncio
+import json
+import pytest
+from roady_meeting_api_backend import ConnectionManager
+
+
+class StalledSocket:
+    """Legacy WebSocket whose sends block until `release` is set (or fail if `dead`)"""
+    
+    def __init__(self, stalled: bool = True, dead: bool = False):
+        self.scope = {}
+        self.sent: list = []
+        self.closed_with = None
+        self.dead = dead
+        self.release = asyncio.Event()
+        if not stalled:
+            self.release.set()
+    
+    async def accept(self, subprotocol=None):
+        pass
+    
+    async def send_text(self, frame: str):
+        if self.dead:
+            raise ConnectionResetError("socket is gone")
+        await self.release.wait()
+        self.sent.append(json.loads(frame))
+    
+    async def close(self, code: int):
+        self.closed_with = code
+
+
+@pytest.fixture
+def manager():
+    manager = ConnectionManager(snapshot_provider=lambda meeting_id: {"id": meeting_id})
+    manager.MAX_QUEUE_SIZE = 4
+    yield manager
+    for clients in list(manager.active_connections.values()):
+        for client in list(clients.values()):
+            client.writer.cancel()
+
+
+async def broadcast(manager: ConnectionManager, count: int, start: int = 1):
+    for i in range(start, start + count):
+        await manager.broadcast("m-1", {"type": "new_message", "i": i})
+        await asyncio.sleep(0)  # Let the writers take what they can
+
+
+class TestSlowConsumers:
+    """Tests for bounded per-client queues."""
+    
+    @pytest.mark.asyncio
+    async def test_broadcast_never_waits_on_a_stalled_socket(self, manager: ConnectionManager):
+        fast, slow = StalledSocket(stalled=False), StalledSocket()
+        await manager.connect(fast, "m-1")
+        await manager.connect(slow, "m-1")
+        
+        await asyncio.wait_for(broadcast(manager, 20), 1)
+        await asyncio.sleep(0)
+        
+        assert [message["i"] for message in fast.sent] == list(range(1, 21))
+        assert slow.sent == []
+    
+    @pytest.mark.asyncio
+    async def test_overflow_degrades_to_a_snapshot(self, manager: ConnectionManager):
+        slow = StalledSocket()
+        await manager.connect(slow, "m-1")
+        
+        # 1 is being written, 2-5 fill the queue, 6 overflows, then 7 and 8 are queued
+        await broadcast(manager, 8)
+        
+        assert manager.stats["degraded"] == 1
+        client = manager.active_connections["m-1"][slow]
+        assert client.degrades == 1
+        
+        slow.release.set()
+        await asyncio.sleep(0.01)
+        
+        assert [message["type"] for message in slow.sent] == ["new_message", "meeting_snapshot", "new_message", "new_message"]
+        assert slow.sent[1]["meeting"] == {"id": "m-1"}
+        assert [message["i"] for message in slow.sent if "i" in message] == [1, 7, 8]
+        assert client.degrades == 0  # Caught up: earlier lag is forgiven
+    
+    @pytest.mark.asyncio
+    async def test_repeat_offender_is_closed_with_1013(self, manager: ConnectionManager):
+        slow, fast = StalledSocket(), StalledSocket(stalled=False)
+        await manager.connect(slow, "m-1")
+        await manager.connect(fast, "m-1")
+        
+        # Every 5 frames after the first one overflow the queue (after a reset, the snapshot takes a slot)
+        await broadcast(manager, 1 + 5 + 4 * manager.MAX_DEGRADES)
+        await asyncio.sleep(0)
+        
+        assert manager.stats["degraded"] == manager.MAX_DEGRADES
+        assert manager.stats["evicted"] == 1
+        assert slow.closed_with == ConnectionManager.SLOW_CONSUMER_CLOSE_CODE == 1013
+        assert list(manager.active_connections["m-1"]) == [fast]
+        assert fast.closed_with is None
+    
+    @pytest.mark.asyncio
+    async def test_no_snapshot_means_immediate_close(self, manager: ConnectionManager):
+        manager.snapshot_provider = lambda meeting_id: None
+        slow = StalledSocket()
+        await manager.connect(slow, "m-1")
+        
+        await broadcast(manager, 6)
+        await asyncio.sleep(0)
+        
+        assert manager.stats["degraded"] == 0
+        assert slow.closed_with == 1013
+        assert "m-1" not in manager.active_connections
+    
+    @pytest.mark.asyncio
+    async def test_dead_socket_is_removed(self, manager: ConnectionManager):
+        dead, healthy = StalledSocket(dead=True), StalledSocket(stalled=False)
+        await manager.connect(dead, "m-1")
+        await manager.connect(healthy, "m-1")
+        
+        await broadcast(manager, 3)
+        await asyncio.sleep(0)
+        
+        assert list(manager.active_connections["m-1"]) == [healthy]
+        assert len(healthy.sent) == 3
+        
+        manager.disconnect(healthy, "m-1")
+        assert "m-1" not in manager.active_connections
+
+
 # ============================================
 # pytest.ini - Configuration Pytest
 # ============================================
@@ -115,17 +115,21 @@ CREATE TABLE projects (
     budget_spent DECIMAL(15,2) DEFAULT 0,
     progress_percent INT DEFAULT 0,
     manager_id UUID REFERENCES users(id),
+    user_id UUID REFERENCES users(id),  -- Propriétaire
     settings JSONB DEFAULT '{}',
     tags TEXT[] DEFAULT '{}',
     metadata JSONB DEFAULT '{}',
     created_at TIMESTAMPTZ DEFAULT NOW(),
-    updated_at TIMESTAMPTZ DEFAULT NOW()
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    deleted_at TIMESTAMPTZ              -- Suppression logique
 );
 
 CREATE INDEX idx_projects_company ON projects(company_id);
 CREATE INDEX idx_projects_status ON projects(status);
 CREATE INDEX idx_projects_manager ON projects(manager_id);
 CREATE INDEX idx_projects_location ON projects USING GIST(location);
+-- Listings paginées par keyset (updated_at, id), plus récents d'abord
+CREATE INDEX idx_projects_user_updated ON projects(user_id, updated_at DESC, id DESC) WHERE deleted_at IS NULL;
 
 -- Project Members
 CREATE TABLE project_members (